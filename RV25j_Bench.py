@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RV25j_Bench.py — benchmarks for the RV25J cadastre pipeline
+
+memory
+------
+Peak RSS of the in-memory cadastre pipeline for N synthetic markers
+(default 1,000,000 ≈ 125k parcels of 8 markers), each representation in
+a fresh process:
+
+   compact  File / code / MARKER categoricals, idx / EPSG int32, transforms
+            share the input columns (current RV25j_Cadastre)
+   legacy   object strings, int64, one full df.copy() per transform output
+            (the pipeline before the compact representation)
+
+Stages (peak RSS is cumulative, so each figure includes earlier stages):
+   load       parse results → df_ID75
+   transform  df_ID75 → df_LL_W84 + df_W84 (fused pass)
+   parcels    df_W84 → parcel polygons (ParcelBuilder)
+
+scale
+-----
+Wall time and peak RSS of the build stages on synthetic TOML trees
+(default 1k / 10k / 100k deeds of 4–10 markers, EPSG 24047 / 24048 /
+32647 mixed, every fifth deed with a *_MAPL1x.toml as well), one fresh
+process per size. Trees are written once under --root and reused.
+
+   load        MarkerLoader.load_df_id75 (walk + TOML parsing, no store)
+   to_wgs84    CoordinateTransformer.to_wgs84
+   to_w84_utm  CoordinateTransformer.to_w84_utm
+   write_gpkg  GPKGWriter.write_ID75_W84 (bulk layout)
+
+The JSON holds the environment (commit, library / PROJ / GDAL versions)
+next to the runs; --compare prints new / old ratios per stage.
+
+crs
+---
+CRSFactory setup against transform cost, in fresh processes with a
+temporary RV25J_CACHE_DIR:
+
+   cold          no crs_profiles.json: Transformer.from_crs (proj.db
+                 search) for the 9 pairs of EPSG 24047 / 24048 / 32647,
+                 pipelines written to the profile file
+   warm          same file present: Transformer.from_pipeline
+   per thread    a new thread building its own 9 transformers
+   transform     --points EPSG 24047 → WGS84 through one transformer
+
+Usage
+-----
+    python RV25j_Bench.py memory
+    python RV25j_Bench.py memory --markers 1000000 -o bench_memory.json
+    python RV25j_Bench.py scale -o bench_scale.json
+    python RV25j_Bench.py scale --parcels 1000,10000 --compare bench_scale_v1.json
+    python RV25j_Bench.py crs -o bench_crs.json
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import resource  # POSIX
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> float | None:
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+
+# =========================================
+# Synthetic markers
+# =========================================
+
+def synthetic_results(n_markers: int, per_parcel: int = 8, seed: int = 75):
+    """
+    Yield (File, parse_marker_toml-style result) for ~n_markers markers:
+    small polygons around Narathiwat in Indian 1975 / UTM 47N (24047),
+    every tenth parcel already in WGS84 UTM (32647).
+    """
+    rng = np.random.default_rng(seed)
+    n_parcels = max(1, n_markers // per_parcel)
+    ang = np.linspace(0.0, 2 * np.pi, per_parcel, endpoint=False)
+    labels = [chr(ord("A") + k) for k in range(per_parcel)]
+    centers_n = rng.uniform(690000.0, 730000.0, n_parcels)
+    centers_e = rng.uniform(800000.0, 830000.0, n_parcels)
+    code_ids = rng.integers(1, 5000, (n_parcels, per_parcel))
+    for p in range(n_parcels):
+        r = 30.0
+        north = (centers_n[p] + r * np.sin(ang)).tolist()
+        east = (centers_e[p] + r * np.cos(ang)).tolist()
+        epsg = 32647 if p % 10 == 0 else 24047
+        yield f"b{p:07d}", (
+            epsg,
+            list(range(1, per_parcel + 1)),
+            [f"s{c}" for c in code_ids[p]],
+            list(labels),
+            north,
+            east,
+        )
+
+
+# =========================================
+# One measured run (child process)
+# =========================================
+
+def _load_legacy(n_markers):
+    """The former MarkerLoader accumulation: object strings, int64."""
+    import pandas as pd
+
+    cols = {k: [] for k in ("File", "idx", "code", "MARKER", "NORTHING", "EASTING", "EPSG")}
+    for file_prefix, (epsg, idx, code, marker, north, east) in synthetic_results(n_markers):
+        n = len(idx)
+        cols["File"].extend([file_prefix] * n)
+        cols["idx"].extend(idx)
+        cols["code"].extend(code)
+        cols["MARKER"].extend(marker)
+        cols["NORTHING"].extend(north)
+        cols["EASTING"].extend(east)
+        cols["EPSG"].extend([epsg] * n)
+    return pd.DataFrame(cols)
+
+
+def _transform_legacy(transformer, df):
+    """The former to_wgs84_and_w84_utm: one df.copy() per output."""
+    e = df["EASTING"].to_numpy(dtype="float64")
+    n = df["NORTHING"].to_numpy(dtype="float64")
+    epsg = df["EPSG"].to_numpy(dtype="int64")
+    lon, lat = transformer._to_wgs84_arrays(e, n, epsg)
+    x, y, epsg_out = transformer._to_w84_utm_arrays(e, n, epsg, lon, lat)
+    df_LL_W84 = df.copy()
+    df_LL_W84["LON"] = lon
+    df_LL_W84["LAT"] = lat
+    df_W84 = df.copy()
+    df_W84["EASTING"] = x
+    df_W84["NORTHING"] = y
+    df_W84["EPSG"] = epsg_out
+    return df_LL_W84, df_W84
+
+
+def _memory_run(mode: str, n_markers: int, towgs84, queue):
+    from pyproj import CRS
+
+    from RV25j_Cadastre import CoordinateTransformer, CRSFactory, ParcelBuilder
+    from RV25j_ParcelStore import MarkerColumns
+
+    stages = {"baseline": {"peak_rss_mb": peak_rss_mb()}}
+
+    t0 = time.perf_counter()
+    if mode == "compact":
+        acc = MarkerColumns()
+        for file_prefix, res in synthetic_results(n_markers):
+            acc.add(file_prefix, res)
+        df_ID75 = acc.to_frame()
+        del acc
+    else:
+        df_ID75 = _load_legacy(n_markers)
+    stages["load"] = {
+        "seconds": time.perf_counter() - t0,
+        "peak_rss_mb": peak_rss_mb(),
+        "frame_mb": df_ID75.memory_usage(deep=True).sum() / 2**20,
+    }
+
+    t0 = time.perf_counter()
+    transformer = CoordinateTransformer(CRSFactory(towgs84))
+    if mode == "compact":
+        df_LL_W84, df_W84 = transformer.to_wgs84_and_w84_utm(df_ID75)
+    else:
+        df_LL_W84, df_W84 = _transform_legacy(transformer, df_ID75)
+    stages["transform"] = {
+        "seconds": time.perf_counter() - t0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    t0 = time.perf_counter()
+    gdf_parcel = ParcelBuilder.parcels(df_W84, CRS.from_epsg(32647))
+    stages["parcels"] = {
+        "seconds": time.perf_counter() - t0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    queue.put(
+        {
+            "mode": mode,
+            "markers": len(df_ID75),
+            "parcels": len(gdf_parcel),
+            "stages": stages,
+        }
+    )
+
+
+def bench_memory(n_markers: int, modes, towgs84):
+    ctx = mp.get_context("spawn")  # fresh interpreter → clean peak RSS
+    results = []
+    for mode in modes:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_memory_run, args=(mode, n_markers, towgs84, queue))
+        proc.start()
+        res = queue.get()
+        proc.join()
+        results.append(res)
+
+        st = res["stages"]
+        print(
+            f"[MEM] {mode:8s} {res['markers']} markers / {res['parcels']} parcels: "
+            f"df_ID75 {st['load']['frame_mb']:.0f} MB; peak RSS "
+            + ", ".join(
+                f"{k} {v['peak_rss_mb']:.0f} MB" for k, v in st.items()
+            )
+        )
+    return results
+
+
+# =========================================
+# Synthetic TOML trees (scale benchmark)
+# =========================================
+
+TOWGS84_DEFAULT = "204.5,837.9,294.8"
+
+
+def _tree_epsg(lon: np.ndarray, rng) -> np.ndarray:
+    """Indian 1975 UTM zone by longitude (47 / 48); 10 % of zone 47 in 32647."""
+    epsg = np.where(lon < 102.0, 24047, 24048)
+    epsg[(epsg == 24047) & (rng.random(len(lon)) < 0.1)] = 32647
+    return epsg
+
+
+def _toml_text(epsg: int, north, east, codes) -> str:
+    """One *_MAPL1(x).toml in the format RV25j_Process writes."""
+    crs_line = f'crs = "{epsg}"' if epsg >= 32600 else f"EPSG = {epsg}"
+    rows = "\n".join(
+        f'  [{k + 1}, "{chr(ord("A") + k)}", "s{c}", {n:.3f}, {e:.3f}],'
+        for k, (n, e, c) in enumerate(zip(north, east, codes))
+    )
+    return (
+        "[META]\n"
+        'DOL_Office = "Narathivas"\n\n'
+        "[Deed]\n"
+        'Survey_Type = "MAP-L1"\n'
+        f"{crs_line}\n"
+        'unit = "meter"\n'
+        "polygon_closed = true\n"
+        f"marker = [\n{rows}\n]\n"
+    )
+
+
+def write_synthetic_tree(root: Path, n_parcels: int, towgs84, seed: int = 75):
+    """
+    Write CONFIG.toml + n_parcels deeds under root (g<k>/<File>/<File>_MAPL1.toml,
+    1000 deeds per group folder): 4–10 markers each around Narathiwat
+    (lon 101.4–102.4), mixed EPSG 24047 / 24048 / 32647; every fifth deed
+    also has a *_MAPL1x.toml (shifted 0.5 m) that the loader must prefer.
+    A finished tree is marked with .complete and reused.
+    """
+    from RV25j_Cadastre import CRSFactory
+
+    done = root / ".complete"
+    if done.is_file():
+        return root
+    t0 = time.perf_counter()
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "CONFIG.toml").write_text(
+        "[META]\n"
+        'DOL_Office = "Narathivas"\n'
+        f"towgs84 = [{','.join(str(v) for v in towgs84)}]\n\n"
+        "[Deed]\n"
+        'Survey_Type = "MAP-L1"\n'
+        "EPSG = 24047\n",
+        encoding="utf-8",
+    )
+
+    rng = np.random.default_rng(seed)
+    lon = rng.uniform(101.4, 102.4, n_parcels)
+    lat = rng.uniform(5.8, 6.6, n_parcels)
+    epsg = _tree_epsg(lon, rng)
+    east = np.empty(n_parcels)
+    north = np.empty(n_parcels)
+    factory = CRSFactory(towgs84)
+    for code in np.unique(epsg):
+        m = epsg == code
+        east[m], north[m] = factory.get_transformer(4326, int(code)).transform(lon[m], lat[m])
+
+    n_vertex = rng.integers(4, 11, n_parcels)
+    radius = rng.uniform(10.0, 60.0, n_parcels)
+    for p in range(n_parcels):
+        ang = np.sort(rng.uniform(0.0, 2 * np.pi, n_vertex[p]))
+        n = north[p] + radius[p] * np.sin(ang)
+        e = east[p] + radius[p] * np.cos(ang)
+        codes = rng.integers(1, 5000, n_vertex[p])
+        name = f"b{p:07d}"
+        folder = root / f"g{p // 1000:04d}" / name
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"{name}_MAPL1.toml").write_text(
+            _toml_text(int(epsg[p]), n, e, codes), encoding="utf-8"
+        )
+        if p % 5 == 0:
+            (folder / f"{name}_MAPL1x.toml").write_text(
+                _toml_text(int(epsg[p]), n + 0.5, e + 0.5, codes), encoding="utf-8"
+            )
+    done.write_text(json.dumps({"parcels": n_parcels, "seed": seed}), encoding="utf-8")
+    print(f"[TREE] {n_parcels} deeds → {root} ({time.perf_counter() - t0:.1f} s)")
+    return root
+
+
+# =========================================
+# One measured scale run (child process)
+# =========================================
+
+def _scale_run(tree: str, workers, queue):
+    import shutil
+    import tempfile
+
+    from RV25j_Cadastre import (
+        CoordinateTransformer,
+        CRSFactory,
+        GPKGWriter,
+        MarkerLoader,
+        RV25JConfig,
+    )
+
+    tree = Path(tree)
+    config = RV25JConfig.from_toml(tree / "CONFIG.toml")
+    stages = {"baseline": {"seconds": 0.0, "peak_rss_mb": peak_rss_mb()}}
+
+    def stage(name, fn):
+        t0 = time.perf_counter()
+        out = fn()
+        stages[name] = {"seconds": time.perf_counter() - t0, "peak_rss_mb": peak_rss_mb()}
+        return out
+
+    loader = MarkerLoader(tree, config, workers=workers, use_store=False)
+    df_ID75 = stage("load", loader.load_df_id75)
+    transformer = CoordinateTransformer(CRSFactory(config.towgs84))
+    stage("to_wgs84", lambda: transformer.to_wgs84(df_ID75))
+    df_W84 = stage("to_w84_utm", lambda: transformer.to_w84_utm(df_ID75))
+
+    out_dir = Path(tempfile.mkdtemp(prefix="rv25j_bench_", dir=tree))
+    try:
+        writer = GPKGWriter(out_dir, transformer.crs_factory, bulk=True)
+        stage("write_gpkg", lambda: writer.write_ID75_W84(df_ID75, df_W84, "bench"))
+        gpkg_mb = sum(p.stat().st_size for p in out_dir.glob("*.gpkg")) / 2**20
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    queue.put(
+        {
+            "parcels": int(df_ID75["File"].nunique()),
+            "markers": len(df_ID75),
+            "epsg": {str(k): int(v) for k, v in df_ID75["EPSG"].value_counts().sort_index().items()},
+            "gpkg_mb": gpkg_mb,
+            "stages": stages,
+        }
+    )
+
+
+def environment() -> dict:
+    import platform
+    import subprocess
+
+    import pandas as pd
+    import pyogrio
+    import pyproj
+    import shapely
+
+    try:
+        commit = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "pyproj": pyproj.__version__,
+        "proj": pyproj.proj_version_str,
+        "shapely": shapely.__version__,
+        "pyogrio": pyogrio.__version__,
+        "gdal": pyogrio.__gdal_version_string__,
+    }
+
+
+# =========================================
+# CRS / transformer setup vs transform (child process)
+# =========================================
+
+CRS_PAIRS_EPSG = (24047, 24048, 32647)
+
+
+def _crs_run(cache_dir: str, towgs84, n_points: int, threads: int, queue):
+    os.environ["RV25J_CACHE_DIR"] = cache_dir  # read when RV25j_Cadastre is imported
+    import threading
+
+    from RV25j_Cadastre import CRSFactory
+
+    def setup(factory):
+        t0 = time.perf_counter()
+        for epsg in CRS_PAIRS_EPSG:
+            factory.get_transformer_to_wgs84(epsg)
+            factory.get_transformer_to_w84_utm(epsg)
+            factory.get_transformer_wgs84_to_w84_utm(epsg)
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    factory = CRSFactory(towgs84)
+    first = time.perf_counter() - t0 + setup(factory)
+    per_thread = [0.0] * threads
+
+    def in_thread(i):  # a new thread builds its own transformers
+        per_thread[i] = setup(factory)
+
+    workers = [threading.Thread(target=in_thread, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    rng = np.random.default_rng(75)
+    e = rng.uniform(600_000.0, 700_000.0, n_points)
+    n = rng.uniform(640_000.0, 730_000.0, n_points)
+    tr = factory.get_transformer_to_wgs84(24047)
+    t0 = time.perf_counter()
+    tr.transform(e, n)
+    dt = time.perf_counter() - t0
+
+    queue.put(
+        {
+            "transformers": 3 * len(CRS_PAIRS_EPSG),
+            "setup_ms": 1000 * first,
+            "per_thread_setup_ms": 1000 * float(np.median(per_thread)),
+            "transform_points": n_points,
+            "transform_ms": 1000 * dt,
+            "points_per_s": n_points / dt if dt > 0 else None,
+        }
+    )
+
+
+def bench_crs(towgs84, n_points: int, threads: int, repeat: int):
+    """
+    Cold (no profile file) then warm (file written by the cold run) setup,
+    each in a fresh process, `repeat` times with a new cache directory.
+    """
+    ctx = mp.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="rv25j_crs_") as cache_dir:
+            for cache in ("cold", "warm"):
+                queue = ctx.Queue()
+                proc = ctx.Process(
+                    target=_crs_run, args=(cache_dir, towgs84, n_points, threads, queue)
+                )
+                proc.start()
+                res = dict(cache=cache, **queue.get())
+                proc.join()
+                runs.append(res)
+                print(
+                    f"[CRS] {cache}: setup {res['setup_ms']:.1f} ms "
+                    f"({res['transformers']} transformers), per thread "
+                    f"{res['per_thread_setup_ms']:.1f} ms, transform {res['transform_points']} pts "
+                    f"{res['transform_ms']:.1f} ms ({res['points_per_s']:.0f} pts/s)"
+                )
+    return {"benchmark": "crs", "environment": environment(), "runs": runs}
+
+
+def bench_scale(sizes, root: Path, towgs84, workers=None):
+    ctx = mp.get_context("spawn")  # fresh interpreter per size → clean peak RSS
+    runs = []
+    for n in sizes:
+        tree = write_synthetic_tree(root / f"tree_{n}", n, towgs84)
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_scale_run, args=(str(tree), workers, queue))
+        proc.start()
+        res = queue.get()
+        proc.join()
+        runs.append(res)
+
+        st = res["stages"]
+        print(
+            f"[SCALE] {res['parcels']} parcels / {res['markers']} markers: "
+            + ", ".join(
+                f"{k} {v['seconds']:.2f} s" for k, v in st.items() if k != "baseline"
+            )
+            + f" | peak RSS {max(v['peak_rss_mb'] for v in st.values()):.0f} MB"
+        )
+    return {"benchmark": "scale", "environment": environment(), "runs": runs}
+
+
+def compare(result: dict, base_path: Path):
+    """Print per-stage time / peak-RSS ratios against an earlier scale JSON."""
+    with open(base_path, encoding="utf-8") as f:
+        base = {r["parcels"]: r for r in json.load(f)["runs"]}
+    print(f"[COMPARE] vs {base_path} (ratio new / old; < 1 is better)")
+    for run in result["runs"]:
+        old = base.get(run["parcels"])
+        if old is None:
+            continue
+        cells = []
+        for name, st in run["stages"].items():
+            o = old["stages"].get(name)
+            if name == "baseline" or not o or not o["seconds"]:
+                continue
+            cells.append(f"{name} {st['seconds'] / o['seconds']:.2f}x")
+        peak = max(v["peak_rss_mb"] for v in run["stages"].values())
+        old_peak = max(v["peak_rss_mb"] for v in old["stages"].values())
+        print(f"  {run['parcels']:>7} parcels: " + ", ".join(cells) + f", peak RSS {peak / old_peak:.2f}x")
+
+
+# =========================================
+# main()
+# =========================================
+
+def main():
+    parser = argparse.ArgumentParser(description="RV25J cadastre benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_mem = sub.add_parser("memory", help="Peak RSS of load / transform / parcels.")
+    p_mem.add_argument("--markers", type=int, default=1_000_000)
+    p_mem.add_argument(
+        "--mode",
+        choices=("compact", "legacy", "both"),
+        default="both",
+        help="Representation(s) to measure (default: both).",
+    )
+    p_mem.add_argument(
+        "--towgs84",
+        default=TOWGS84_DEFAULT,
+        help="Indian 1975 → WGS84 shift dx,dy,dz (default: Narathivas CONFIG).",
+    )
+    p_mem.add_argument("-o", "--out", default=None, help="Write results as JSON.")
+
+    p_scale = sub.add_parser("scale", help="Load / transform / GPKG timings on synthetic TOML trees.")
+    p_scale.add_argument(
+        "--parcels",
+        default="1000,10000,100000",
+        help="Comma list of tree sizes in deeds (default: 1000,10000,100000).",
+    )
+    p_scale.add_argument(
+        "--root",
+        default=str(Path(tempfile.gettempdir()) / "rv25j_bench"),
+        help="Where synthetic trees are written / reused (default: <tmp>/rv25j_bench).",
+    )
+    p_scale.add_argument(
+        "--towgs84",
+        default=TOWGS84_DEFAULT,
+        help="towgs84 written to the trees' CONFIG.toml (default: Narathivas).",
+    )
+    p_scale.add_argument("-j", "--workers", type=int, default=None, help="TOML parsing threads.")
+    p_scale.add_argument("-o", "--out", default=None, help="Write results as JSON.")
+    p_scale.add_argument("--compare", default=None, metavar="BASE.json", help="Earlier scale JSON.")
+
+    p_crs = sub.add_parser("crs", help="CRS / transformer setup (cold / warm cache) vs transform.")
+    p_crs.add_argument(
+        "--towgs84",
+        default=TOWGS84_DEFAULT,
+        help="Indian 1975 → WGS84 shift dx,dy,dz (default: Narathivas CONFIG).",
+    )
+    p_crs.add_argument("--points", type=int, default=100_000, help="Points transformed (default: 100000).")
+    p_crs.add_argument("--threads", type=int, default=4, help="Threads building their own transformers.")
+    p_crs.add_argument("--repeat", type=int, default=3, help="Cold / warm pairs (default: 3).")
+    p_crs.add_argument("-o", "--out", default=None, help="Write results as JSON.")
+
+    args = parser.parse_args()
+
+    if args.command == "memory":
+        modes = ("compact", "legacy") if args.mode == "both" else (args.mode,)
+        towgs84 = [float(v) for v in args.towgs84.split(",")]
+        results = bench_memory(args.markers, modes, towgs84)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=1)
+            print(f"[OK] Wrote {args.out}")
+
+    if args.command == "scale":
+        sizes = [int(v) for v in args.parcels.split(",") if v.strip()]
+        towgs84 = [float(v) for v in args.towgs84.split(",")]
+        result = bench_scale(sizes, Path(args.root), towgs84, args.workers)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=1)
+            print(f"[OK] Wrote {args.out}")
+        if args.compare:
+            compare(result, Path(args.compare))
+
+    if args.command == "crs":
+        towgs84 = [float(v) for v in args.towgs84.split(",")]
+        result = bench_crs(towgs84, args.points, args.threads, args.repeat)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=1)
+            print(f"[OK] Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
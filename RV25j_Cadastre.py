@@ -41,26 +41,124 @@ Assumptions
    - อ่าน markers ทุกไฟล์ → df_ID75
    - ใช้ towgs84 (เฉพาะกรณี EPSG 24047/24048) + CRSFactory แปลงเป็น
        df_LL_W84 (EPSG:4326) และ df_W84 (WGS84 UTM 32647/32648)
+     PROJ pipeline ของแต่ละคู่ EPSG + towgs84 ถูก cache ไว้ที่
+       $RV25J_CACHE_DIR/crs_profiles.json (default ~/.cache/rv25j)
+     รอบถัดไปสร้าง transformer ด้วย from_pipeline ไม่ต้องค้น proj.db
    - เขียน GPKG สามไฟล์:
        <gpkg_prefix>_ID.gpkg, <gpkg_prefix>_WGS84.gpkg, <gpkg_prefix>_W84UTM.gpkg
+   - --bulk: เขียน layer เดียว "marker" และ "parcel" (มี attribute File)
+     แทน marker:<File>/parcel:<File> ทีละ parcel; I75UTM/W84UTM เขียนพร้อมกัน
+   - --incremental: เก็บ fingerprint (size, mtime, hash) ของแต่ละ TOML ใน
+     <gpkg_prefix>_state.json แล้วประมวลผลเฉพาะไฟล์ที่เพิ่ม/แก้ไข
+     (ลบตาม File + append ใน bulk GPKG) และลบ parcel ของไฟล์ที่หายไป
+   - --chunk N: อ่าน/แปลง/เขียนทีละ N parcel (append ลง bulk GPKG, export,
+     CSV) แสดงความคืบหน้า + parcels/s; หน่วยความจำขึ้นกับ N ไม่ใช่ทั้ง archive
+   - --export parquet,fgb,csv: เขียน marker/parcel แบบ streaming ทีละ batch
+       <gpkg_prefix>_<I75UTM|W84UTM>_<marker|parcel>.<parquet|fgb|csv>
+     (GeoParquet WKB, FlatGeobuf พร้อม packed spatial index, CSV + WKT)
+   - --conflate TOL: รวม marker ที่อยู่ห่างกันไม่เกิน TOL เมตร (KD-tree, WGS84
+     UTM) เป็น marker เดียว → <gpkg_prefix>_markers_conflated.csv,
+     _marker_refs.csv (File → MARKER_ID), _marker_conflicts.csv
+   - --metrics: คำนวณ parcel metrics แบบ vectorized (area/perimeter ใน source
+     CRS และ WGS84 UTM, area บน ellipsoid, CW/CCW, misclosure, จำนวนหมุด)
+     → <gpkg_prefix>_parcel_metrics.csv และเป็น attribute ของ layer parcel
+   - --qa: ตรวจ topology ระหว่าง parcel ข้างเคียง (overlap / gap / invalid)
+     → <gpkg_prefix>_QA.gpkg (layer topology_qa) + _topology_qa.csv (เรียงตาม area)
+     ถ้าไม่พบปัญหา _QA.gpkg ของรอบก่อนจะถูกลบ (CSV ว่าง)
+   - --db TARGET: bulk load marker/parcel (WGS84 UTM) ลง SpatiaLite (.sqlite/.db,
+     GDAL SQLite + Arrow stream) หรือ PostGIS (postgresql://..., COPY ผ่าน psycopg)
+     ทีละ batch สร้าง spatial index หลังโหลดเสร็จ; --db-upsert ลบตาม File แล้ว
+     append แทนการแทนที่ทั้งตาราง (--incremental upsert ให้อัตโนมัติ)
+   - --incremental --changes: เขียน change set ต่อรอบ (NDJSON) ของ parcel/marker
+     ที่เพิ่ม/แก้ไข/ลบ พร้อมพิกัดเก่า-ใหม่ → <gpkg_prefix>_changes/<seq>.ndjson
+     (seq เก็บใน _state.json; รอบแรก/ไม่มี state = "full" snapshot)
+     เมื่อมีโฟลเดอร์ _changes/ แล้ว ทุกรอบ --incremental เขียน change set เสมอ;
+     รอบที่หยุดกลางคัน (state "pending") → รอบถัดไป build ใหม่ทั้งหมด + "full"
    - option: บันทึก df_ID75 เป็น CSV
+   - --store: อ่าน marker จาก <folder>/_parcel_store (RV25j_ParcelStore;
+     .npy แบบ memory-map) แทนการ parse TOML ทุกไฟล์; สร้าง/อัปเดตเฉพาะ TOML
+     ที่เปลี่ยน; ต้องสั่ง --store เอง (ไม่ใช้อัตโนมัติ) เมื่อมี store แล้ว
+     RV25j_Process จะอัปเดตให้ด้วย EPSG เดียวกับที่ store ถูกสร้าง
+   - GPKG เขียนแบบ atomic (temp + rename) ภายใต้ lock ของ RV25j_SafeIO
+     (.rv25j_locks/<gpkg>.lock); --incremental แก้ไขบนสำเนาแล้ว rename เช่นกัน
+     จึงรันพร้อมกับ RV25j_Process / RV25j_Center บนโฟลเดอร์เดียวกันได้
+
+4) Subcommands (default = build)
+   - build : workflow ข้อ 3
+   - query : หา parcel ที่มีจุด / ตัดกับ bbox จาก CSV (STRtree บน LON/LAT)
+       points CSV: id,x,y              boxes CSV: id,minx,miny,maxx,maxy
+       พิกัดใน --crs (4326 = lon/lat, 32647/32648, 24047/24048)
+   - tiles : vector tiles (MVT, gzip) ของ layer parcel + marker จาก df_LL_W84
+       → .pmtiles (PMTiles v3) หรือ .mbtiles ตามนามสกุลของ -o สำหรับ web viewer
+       parcel simplify ~1 pixel ต่อ zoom (ยกเว้น maxzoom), marker ตั้งแต่
+       --marker-minzoom; encode tile แบบขนานด้วย process pool (--tile-workers)
+   - render : ภาพรวม parcel + marker ทั้งหมด → <folder>/Cadastre_All.png (WGS84 UTM)
+       วาดเป็น collection เดียว (matplotlib) หรือ rasterise ด้วย PIL เมื่อมี
+       parcel จำนวนมาก; สีตาม --color source (MAPL1/MAPL1x) | qa | none,
+       --labels, --grid 2x2 แบ่งเป็นภาพย่อย _r<row>_c<col>.png
+   - serve : HTTP server (GeoJSON) โหลด parcel ครั้งเดียว + STRtree ในหน่วยความจำ
+       GET /collections/parcels/items?bbox=...&bbox-crs=32647&crs=32647
+           &File=p08&limit=1000&offset=0   (markers ใช้ /collections/markers/items)
+       ส่งผลแบบ streaming (chunked) แบ่งหน้าด้วย limit/offset
 
 Usage
 -----
     python RV25j_Cadastre.py Narativas
     python RV25j_Cadastre.py Narativas -o markers_ID.csv
     python RV25j_Cadastre.py Narativas --gpkg-prefix p08_p15
+    python RV25j_Cadastre.py Narativas --bulk
+    python RV25j_Cadastre.py Narativas --incremental
+    python RV25j_Cadastre.py Narativas --incremental --changes
+    python RV25j_Cadastre.py Narativas --chunk 20000 --export parquet
+    python RV25j_Cadastre.py Narativas --export parquet,fgb,csv
+    python RV25j_Cadastre.py Narativas --conflate 0.05
+    python RV25j_Cadastre.py Narativas --qa --qa-min-area 1.0 --qa-gap 0.5
+    python RV25j_Cadastre.py Narativas --bulk --metrics
+    python RV25j_Cadastre.py Narativas --bulk --db cadastre.sqlite
+    python RV25j_Cadastre.py Narativas --incremental --db postgresql://gis@localhost/cadastre
+    python RV25j_Cadastre.py query Narativas --points gps.csv --crs 4326 -o hits.csv
+    python RV25j_Cadastre.py tiles Narativas -o cadastre.pmtiles --minzoom 10 --maxzoom 17
+    python RV25j_Cadastre.py render Narativas --color qa --labels -o Cadastre_All.png
+    python RV25j_Cadastre.py serve Narativas --port 8075 --metrics
 """
 
 import argparse
+import gzip
+import io
+import json
+import os
+import queue
+import sqlite3
+import struct
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import chain, islice
 from pathlib import Path
 from typing import Dict, List
 
+import numpy as np
 import pandas as pd
 import geopandas as gpd
+import shapely
 from shapely.geometry import Point, LineString, Polygon
-from pyproj import CRS, Transformer
+from pyproj import CRS, Geod, Transformer
+
+from RV25j_SafeIO import atomic_path, atomic_write_text, file_lock
+from RV25j_ParcelStore import (
+    MarkerColumns,
+    ParcelStore,
+    choose,
+    discover,
+    extract_epsg,
+    extract_markers,
+    file_prefix,
+    fingerprint,
+    parse_marker_toml,
+)
 
 # --- TOML loader ---
 try:
@@ -126,17 +224,47 @@ class CRSFactory:
     """
     Build CRS for Indian 1975 UTM (EPSG 24047 / 24048) with towgs84 if provided,
     or fallback to standard EPSG (e.g. 32647).
+
+    - CRS objects are memoised per process, keyed on EPSG (+ towgs84 for
+      24047 / 24048), and shared by every factory.
+    - Transformer.from_crs() searches proj.db for the operation. The
+      resulting PROJ pipeline is cached in PROFILE_PATH (JSON, keyed on
+      "src>dst" + towgs84, invalidated by a PROJ / pyproj upgrade). Later
+      runs build the transformer with Transformer.from_pipeline().
+    - Transformer instances are per thread (pyproj transformers must not
+      be shared between threads), so one factory can serve a thread pool.
     """
 
-    def __init__(self, towgs84: List[float] | None):
+    PROFILE_VERSION = 1
+    PROFILE_PATH = Path(
+        os.environ.get("RV25J_CACHE_DIR", Path.home() / ".cache" / "rv25j")
+    ) / "crs_profiles.json"
+    ID75 = (24047, 24048)
+
+    _lock = threading.Lock()
+    _crs_memo: Dict[tuple, CRS] = {}
+    _profiles: Dict[str, str] | None = None  # key → pipeline, loaded once per process
+
+    def __init__(self, towgs84: List[float] | None, persist: bool = True):
         self.towgs84 = towgs84
-        self._crs_cache: Dict[int, CRS] = {}
-        self._transformer_cache: Dict[int, Transformer] = {}
-        self._crs_wgs84 = CRS.from_epsg(4326)
+        self.persist = persist
+        self._local = threading.local()
+        self._crs_wgs84 = self.get_src_crs(4326)
+
+    @staticmethod
+    def w84_utm_epsg(epsg_src: int) -> int:
+        """24047/32647 -> 32647, 24048/32648 -> 32648, others unchanged."""
+        if epsg_src in (24047, 32647):
+            return 32647
+        if epsg_src in (24048, 32648):
+            return 32648
+        return epsg_src
 
-        # cache for WGS84 UTM (output) CRSs and transformers
-        self._crs_w84_utm_cache: Dict[int, CRS] = {}
-        self._transformer_w84_utm_cache: Dict[int, Transformer] = {}
+    def _towgs84_key(self, *epsgs) -> tuple | None:
+        """towgs84 as part of a cache key, only where an ID75 CRS is involved."""
+        if self.towgs84 and len(self.towgs84) >= 3 and any(e in self.ID75 for e in epsgs):
+            return tuple(float(v) for v in self.towgs84)
+        return None
 
     def _build_proj4_id75(self, epsg: int) -> CRS:
         """
@@ -165,17 +293,81 @@ class CRSFactory:
 
     def get_src_crs(self, epsg: int) -> CRS:
         """Return CRS for given EPSG (ID75 w/ towgs84 or normal EPSG)."""
-        if epsg not in self._crs_cache:
-            self._crs_cache[epsg] = self._build_proj4_id75(epsg)
-        return self._crs_cache[epsg]
+        key = (epsg, self._towgs84_key(epsg))
+        crs = self._crs_memo.get(key)
+        if crs is None:
+            crs = self._crs_memo.setdefault(key, self._build_proj4_id75(epsg))
+        return crs
 
-    def get_transformer_to_wgs84(self, epsg: int) -> Transformer:
-        if epsg not in self._transformer_cache:
-            crs_src = self.get_src_crs(epsg)
-            self._transformer_cache[epsg] = Transformer.from_crs(
-                crs_src, self._crs_wgs84, always_xy=True
+    # ---- persisted pipelines ----
+    @staticmethod
+    def _profile_stamp() -> dict:
+        import pyproj
+
+        return {"version": CRSFactory.PROFILE_VERSION, "proj": pyproj.proj_version_str, "pyproj": pyproj.__version__}
+
+    @classmethod
+    def _load_profiles(cls) -> Dict[str, str]:
+        """Pipelines from PROFILE_PATH (empty when missing / stale); call under _lock."""
+        if cls._profiles is None:
+            cls._profiles = {}
+            try:
+                data = json.loads(cls.PROFILE_PATH.read_text(encoding="utf-8"))
+                if data.get("stamp") == cls._profile_stamp():
+                    cls._profiles = dict(data.get("pipelines", {}))
+            except (OSError, ValueError):
+                pass
+        return cls._profiles
+
+    def _save_profiles(self):
+        if not self.persist:
+            return
+        stamp = self._profile_stamp()
+        try:
+            self.PROFILE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with file_lock(self.PROFILE_PATH):
+                # keep what other processes added since this one loaded the file
+                try:
+                    data = json.loads(self.PROFILE_PATH.read_text(encoding="utf-8"))
+                    disk = data["pipelines"] if data.get("stamp") == stamp else {}
+                except (OSError, ValueError, KeyError):
+                    disk = {}
+                data = {"stamp": stamp, "pipelines": {**disk, **self._profiles}}
+                atomic_write_text(self.PROFILE_PATH, json.dumps(data, indent=1))
+        except OSError as e:  # read-only home etc.: the in-process cache still works
+            print(f"[WARN] CRS profile cache not saved ({self.PROFILE_PATH}): {e}")
+
+    def get_transformer(self, src: int, dst: int) -> Transformer:
+        """
+        always_xy Transformer src → dst EPSG (24047 / 24048 with towgs84),
+        private to the calling thread.
+        """
+        cache = self._local.__dict__.setdefault("transformers", {})
+        if (src, dst) in cache:
+            return cache[(src, dst)]
+
+        tw = self._towgs84_key(src, dst)
+        key = f"{src}>{dst}" + ("|" + ",".join(repr(v) for v in tw) if tw else "")
+        with self._lock:
+            pipeline = self._load_profiles().get(key)
+        transformer = None
+        if pipeline is not None:
+            try:
+                transformer = Transformer.from_pipeline(pipeline)
+            except Exception:  # pyproj.exceptions.ProjError: rebuild below
+                transformer = None
+        if transformer is None:
+            transformer = Transformer.from_crs(
+                self.get_src_crs(src), self.get_src_crs(dst), always_xy=True
             )
-        return self._transformer_cache[epsg]
+            with self._lock:
+                self._load_profiles()[key] = transformer.definition
+                self._save_profiles()
+        cache[(src, dst)] = transformer
+        return transformer
+
+    def get_transformer_to_wgs84(self, epsg: int) -> Transformer:
+        return self.get_transformer(epsg, 4326)
 
     def get_w84_utm_crs(self, epsg_src: int) -> CRS:
         """
@@ -184,31 +376,20 @@ class CRSFactory:
         24048,32648 -> EPSG:32648
         others     -> keep same EPSG as fallback.
         """
-        if epsg_src in self._crs_w84_utm_cache:
-            return self._crs_w84_utm_cache[epsg_src]
-
-        if epsg_src in (24047, 32647):
-            epsg_dst = 32647
-        elif epsg_src in (24048, 32648):
-            epsg_dst = 32648
-        else:
-            epsg_dst = epsg_src
-
-        crs = CRS.from_epsg(epsg_dst)
-        self._crs_w84_utm_cache[epsg_src] = crs
-        return crs
+        return self.get_src_crs(self.w84_utm_epsg(epsg_src))
 
     def get_transformer_to_w84_utm(self, epsg_src: int) -> Transformer:
         """
         Transformer from source CRS (ID75 / existing EPSG) to WGS84 UTM.
         """
-        if epsg_src not in self._transformer_w84_utm_cache:
-            crs_src = self.get_src_crs(epsg_src)
-            crs_dst = self.get_w84_utm_crs(epsg_src)
-            self._transformer_w84_utm_cache[epsg_src] = Transformer.from_crs(
-                crs_src, crs_dst, always_xy=True
-            )
-        return self._transformer_w84_utm_cache[epsg_src]
+        return self.get_transformer(epsg_src, self.w84_utm_epsg(epsg_src))
+
+    def get_transformer_wgs84_to_w84_utm(self, epsg_src: int) -> Transformer:
+        """
+        Transformer from geographic WGS84 to the WGS84 UTM zone of epsg_src.
+        Used to derive UTM from already-computed LON/LAT (no second datum shift).
+        """
+        return self.get_transformer(4326, self.w84_utm_epsg(epsg_src))
 
     @property
     def crs_wgs84(self) -> CRS:
@@ -221,7 +402,8 @@ class CRSFactory:
 
 class MarkerLoader:
     """
-    - Recursively find *_MAPL1.toml and *_MAPL1x.toml under the given folder.
+    - Find *_MAPL1.toml and *_MAPL1x.toml under the given folder in one
+      recursive walk; parse them in a thread (or process) pool.
     - For each prefix (e.g., p08, p09), prefer *_MAPL1x.toml over *_MAPL1.toml.
     - Read [Deed].marker as:
 
@@ -236,175 +418,429 @@ class MarkerLoader:
 
     - Build df_ID75 with columns:
         File, idx, code, MARKER, NORTHING, EASTING, EPSG
+      File / code / MARKER are categoricals, idx / EPSG int32.
     """
 
-    def __init__(self, folder: Path, config: RV25JConfig):
+    def __init__(
+        self,
+        folder: Path,
+        config: RV25JConfig,
+        workers: int | None = None,
+        processes: bool = False,
+        use_store: bool = False,
+    ):
         self.folder = folder
         self.config = config
+        self.processes = processes
+        # opt-in (--store): load from <folder>/_parcel_store
+        self.use_store = use_store
+        cpus = os.cpu_count() or 1
+        self.workers = workers or (cpus if processes else min(32, cpus * 4))
 
-    @staticmethod
-    def _file_prefix_from_path(path: Path) -> str:
+    # TOML helpers are shared with RV25j_Process (RV25j_ParcelStore)
+    _file_prefix_from_path = staticmethod(file_prefix)
+    _extract_epsg_from_toml = staticmethod(extract_epsg)
+    _extract_markers_from_deed = staticmethod(extract_markers)
+    _load_marker_toml = staticmethod(parse_marker_toml)
+
+    def discover(self) -> Dict[str, Dict[str, Path]]:
+        """prefix_map[prefix] = {"x"|"base": Path} from one walk of the folder."""
+        return discover(self.folder)
+
+    def choose(self, prefix_map: Dict[str, Dict[str, Path]]):
+        """Sorted [(File, Path)], preferring *_MAPL1x.toml per prefix."""
+        return choose(prefix_map)
+
+    def load_files(self, chosen, allow_empty: bool = False, verbose: bool = True) -> pd.DataFrame:
         """
-        'p08_MAPL1x.toml' -> 'p08'
-        'p09_MAPL1.toml'  -> 'p09'
+        Parse the chosen [(File, Path)] into df_ID75. TOML parsing runs in
+        a thread pool (I/O bound on network storage) or, with
+        processes=True, a process pool (CPU bound on local disks). Rows go
+        straight into compact columns (see MarkerColumns).
         """
-        stem = path.stem  # e.g. "p08_MAPL1x"
-        for suf in ("_MAPL1x", "_MAPL1"):
-            if stem.endswith(suf):
-                return stem[:-len(suf)]
-        return stem
+        t0 = time.perf_counter()
+        pool_cls = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+        with pool_cls(max_workers=self.workers) as pool:
+            results = list(
+                pool.map(
+                    self._load_marker_toml,
+                    [p for _, p in chosen],
+                    [self.config.default_epsg] * len(chosen),
+                    chunksize=64 if self.processes else 1,
+                )
+            )
+        t1 = time.perf_counter()
 
-    @staticmethod
-    def _extract_epsg_from_toml(toml_data: dict, default_epsg: int) -> int:
-        """Look for EPSG or crs inside [Deed] section."""
-        deed = toml_data.get("Deed") or toml_data.get("deed")
-        if not isinstance(deed, dict):
-            return default_epsg
+        acc = MarkerColumns()
+        for (file_prefix, _), res in zip(chosen, results):
+            if isinstance(res, str):
+                print(res)
+                continue
+            acc.add(file_prefix, res)
+        del results
 
-        epsg = deed.get("EPSG") or deed.get("epsg")
-        if epsg is None:
-            crs_val = deed.get("crs") or deed.get("CRS")
-            if crs_val is not None:
-                try:
-                    epsg = int(crs_val)
-                except ValueError:
-                    epsg = None
-        if epsg is None:
-            return default_epsg
-        return int(epsg)
+        if not len(acc) and not allow_empty:
+            raise RuntimeError(
+                "No marker data found in any TOML file (even though some TOMLs were found)."
+            )
 
-    @staticmethod
-    def _extract_markers_from_deed(toml_data: dict):
+        df_ID75 = acc.to_frame()
+        t2 = time.perf_counter()
+        if verbose:
+            print(
+                f"[LOAD] {len(chosen)} TOMLs, {len(df_ID75)} markers: "
+                f"parse {t1 - t0:.2f} s "
+                f"({'processes' if self.processes else 'threads'} x{self.workers}), "
+                f"build {t2 - t1:.2f} s"
+            )
+        return df_ID75
+
+    def load_df_id75(self) -> pd.DataFrame:
+        """
+        Return df_ID75 with columns:
+        File, idx, code, MARKER, NORTHING, EASTING, EPSG
         """
-        For this project we assume only one format:
+        if self.store_enabled:
+            return self.load_store(ParcelStore(self.folder))
 
-            [Deed]
-            marker = [
-              [1, "A", "s24", 711494.218, 810313.001],
-              [2, "B", "s18", 711510.841, 810323.391],
-              ...
-            ]
+        t0 = time.perf_counter()
+        chosen = self.choose(self.discover())
+        print(f"[LOAD] discover: {len(chosen)} parcels in {time.perf_counter() - t0:.2f} s")
+        return self.load_files(chosen)
 
-        Interpreted as:
-            [idx, MARKER, code, NORTHING, EASTING]
+    @property
+    def store_enabled(self) -> bool:
+        return bool(self.use_store)
 
-        Returns: list of dicts with keys:
-          "idx", "code", "MARKER", "NORTHING", "EASTING"
+    def iter_chunks(self, chunk_parcels: int):
+        """
+        Yield (n_total, df_ID75 chunk) for `chunk_parcels` parcels at a time:
+        memory-mapped slices of the parcel store when it is in use,
+        otherwise that many TOMLs parsed per chunk. n_total counts parcels
+        (store) or TOMLs (no store).
         """
-        rows = []
+        store = ParcelStore(self.folder)
+        if self.store_enabled:
+            store.update(self.config.default_epsg, self.workers)
+            n_total = store.n_parcels
+            for lo in range(0, n_total, chunk_parcels):
+                yield n_total, store.to_frame(lo, lo + chunk_parcels)
+            return
 
-        deed = toml_data.get("Deed") or toml_data.get("deed")
-        if not isinstance(deed, dict):
-            return rows
+        chosen = self.choose(self.discover())
+        for lo in range(0, len(chosen), chunk_parcels):
+            yield len(chosen), self.load_files(
+                chosen[lo:lo + chunk_parcels], allow_empty=True, verbose=False
+            )
 
-        marker_arr = deed.get("marker")
-        if not isinstance(marker_arr, list):
-            return rows
+    def load_store(self, store: ParcelStore) -> pd.DataFrame:
+        """df_ID75 from the memory-mapped parcel store (updated first)."""
+        store.update(self.config.default_epsg, self.workers)
+        t0 = time.perf_counter()
+        df_ID75 = store.to_frame()
+        if df_ID75.empty:
+            raise RuntimeError(
+                "No marker data found in any TOML file (even though some TOMLs were found)."
+            )
+        print(
+            f"[LOAD] parcel store: {store.n_parcels} parcels, {len(df_ID75)} markers "
+            f"in {time.perf_counter() - t0:.2f} s"
+        )
+        return df_ID75
 
-        for entry in marker_arr:
-            if not isinstance(entry, (list, tuple)) or len(entry) < 5:
-                continue
 
-            idx_raw, marker_raw, code_raw, n_raw, e_raw = entry[:5]
+# =========================================
+# BuildState: per-deed fingerprints of the last build
+# =========================================
 
-            try:
-                n_val = float(n_raw)
-                e_val = float(e_raw)
-            except Exception:
-                continue
+class BuildState:
+    """
+    <folder>/<gpkg_prefix>_state.json
 
-            rows.append(
-                {
-                    "idx": idx_raw,
-                    "code": code_raw,
-                    "MARKER": marker_raw,
-                    "NORTHING": n_val,
-                    "EASTING": e_val,
-                }
-            )
+        {"version": 1,
+         "config": {"default_epsg": 24047, "towgs84": [...]},
+         "files": {File: {"path": ..., "size": ..., "mtime_ns": ..., "hash": ...}},
+         "changes_seq": 7,
+         "pending": false}
 
-        return rows
+    A deed is unchanged when size + mtime_ns match (no read); otherwise
+    its content hash decides (a touched but identical TOML is unchanged).
+    A change of default_epsg / towgs84 invalidates the whole state.
+    changes_seq is the last ChangeFeed set written for this state.
+    pending is true while the GPKGs / database are being updated: a run
+    that stopped half-way leaves it set and the next run rebuilds in full.
+    """
 
-    def load_df_id75(self) -> pd.DataFrame:
+    VERSION = 1
+
+    def __init__(
+        self,
+        path: Path,
+        config: dict,
+        files: Dict[str, dict] | None = None,
+        changes_seq: int = 0,
+        pending: bool = False,
+    ):
+        self.path = path
+        self.config = config
+        self.files = files or {}
+        self.changes_seq = changes_seq
+        self.pending = pending
+
+    @staticmethod
+    def config_key(config: RV25JConfig) -> dict:
+        return {"default_epsg": config.default_epsg, "towgs84": config.towgs84}
+
+    @classmethod
+    def load(cls, path: Path, config: RV25JConfig) -> "BuildState | None":
+        """None when missing, unreadable or built with another config."""
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != cls.VERSION or data.get("config") != cls.config_key(config):
+            return None
+        return cls(
+            path,
+            data["config"],
+            data.get("files", {}),
+            data.get("changes_seq", 0),
+            bool(data.get("pending", False)),
+        )
+
+    def save(self):
+        data = {
+            "version": self.VERSION,
+            "config": self.config,
+            "files": self.files,
+            "changes_seq": self.changes_seq,
+            "pending": self.pending,
+        }
+        atomic_write_text(self.path, json.dumps(data, indent=1, ensure_ascii=False))
+
+    fingerprint = staticmethod(fingerprint)
+
+    def diff(self, chosen):
         """
-        Return df_ID75 with columns:
-        File, idx, code, MARKER, NORTHING, EASTING, EPSG
+        Compare [(File, Path)] with the stored fingerprints.
+        Returns (added, modified, removed, files) where added/modified are
+        [(File, Path)], removed is [File] and files the new fingerprints.
         """
-        if not self.folder.is_dir():
-            raise NotADirectoryError(f"Folder not found: {self.folder}")
+        added, modified, files = [], [], {}
+        for file_prefix, path in chosen:
+            old = self.files.get(file_prefix)
+            fp = self.fingerprint(path, old)
+            files[file_prefix] = fp
+            if old is None:
+                added.append((file_prefix, path))
+            elif fp["hash"] != old["hash"]:
+                modified.append((file_prefix, path))
+        removed = sorted(set(self.files) - set(files))
+        return added, modified, removed, files
 
-        # Recursive search
-        toml_files = list(self.folder.rglob("*_MAPL1.toml")) + \
-                     list(self.folder.rglob("*_MAPL1x.toml"))
 
-        if not toml_files:
-            raise FileNotFoundError(
-                f"No *_MAPL1.toml or *_MAPL1x.toml found under {self.folder}"
-            )
+# =========================================
+# Change feed for downstream sync
+# =========================================
 
-        # prefix_map[prefix] = {"x": Path, "base": Path}
-        prefix_map: Dict[str, Dict[str, Path]] = {}
+class ChangeFeed:
+    """
+    One NDJSON change set per incremental run that changed anything:
 
-        for path in toml_files:
-            stem = path.stem  # e.g. "p08_MAPL1x"
-            if stem.endswith("_MAPL1x"):
-                prefix = stem[:-7]  # remove "_MAPL1x"
-                key = "x"
-            elif stem.endswith("_MAPL1"):
-                prefix = stem[:-6]  # remove "_MAPL1"
-                key = "base"
-            else:
-                continue
+        <folder>/<gpkg_prefix>_changes/<seq:06d>.ndjson
 
-            entry = prefix_map.setdefault(prefix, {})
-            # prefer x over base
-            if key == "x" or "x" not in entry:
-                entry[key] = path
+    line 1   {"type": "changeset", "seq": 7, "prev_seq": 6, "full": false,
+              "time": ..., "coords": [...], "counts": {...}}
+    parcels  {"type": "parcel", "op": "added|modified|removed", "File": ...,
+              "n_old": 8, "n_new": 9}
+    markers  {"type": "marker", "op": "added|modified|removed", "File": ...,
+              "idx": 3, "code": "s21", "MARKER": "C", "old": [...], "new": [...]}
 
-        if not prefix_map:
-            raise RuntimeError(
-                f"Found TOML files but no valid *_MAPL1(.toml)/*_MAPL1x(.toml) pattern under {self.folder}"
-            )
+    old / new follow header["coords"] (source E, N, EPSG + WGS84 UTM
+    E, N, EPSG) and are null for added / removed markers. Markers are
+    keyed on (File, idx); unchanged markers of a modified parcel are
+    left out. Old values come from the bulk GPKGs of the previous run,
+    read before they are updated. A consumer applies sets in seq order;
+    "full": true (no usable previous state) means "reload from this set".
+    """
 
-        all_rows = []
+    COORDS = ["EASTING", "NORTHING", "EPSG", "EASTING_W84", "NORTHING_W84", "EPSG_W84"]
+    DTYPES = {"File": object, "idx": "int64", "code": object, "MARKER": object} | {
+        c: "int64" if c.startswith("EPSG") else "float64" for c in COORDS
+    }
+    KEY = ["File", "idx", "dup"]
+    WHERE_FILES = 500  # Files per "File IN (...)" query
 
-        for prefix in sorted(prefix_map.keys()):
-            entry = prefix_map[prefix]
-            chosen = entry.get("x") or entry.get("base")
-            if chosen is None:
-                continue
+    def __init__(self, folder: Path, prefix: str):
+        self.dir = folder / f"{prefix}_changes"
 
-            file_prefix = self._file_prefix_from_path(chosen)
+    def path(self, seq: int) -> Path:
+        return self.dir / f"{seq:06d}.ndjson"
 
-            try:
-                with chosen.open("rb") as fp:
-                    data = tomllib.load(fp)
-            except Exception as e:
-                print(f"[ERROR] reading {chosen}: {e}")
-                continue
+    def last_seq(self) -> int:
+        """Highest change set number on disk (0 when there is none)."""
+        seqs = [int(p.stem) for p in self.dir.glob("*.ndjson") if p.stem.isdigit()]
+        return max(seqs, default=0)
 
-            epsg = self._extract_epsg_from_toml(data, self.config.default_epsg)
-            marker_rows = self._extract_markers_from_deed(data)
+    def next_seq(self, state: "BuildState") -> int:
+        """Never reuse a number, even one written by a run that did not finish."""
+        return max(state.changes_seq, self.last_seq()) + 1
 
-            if not marker_rows:
-                print(f"[INFO] No marker data found in: {chosen}")
-                continue
+    @classmethod
+    def empty(cls) -> pd.DataFrame:
+        return cls._keyed(pd.DataFrame({c: pd.Series(dtype=t) for c, t in cls.DTYPES.items()}))
 
-            for r in marker_rows:
-                r["File"] = file_prefix
-                r["EPSG"] = epsg
-                all_rows.append(r)
+    @classmethod
+    def _keyed(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """Add the repeat counter of (File, idx) so the key is always unique."""
+        df = df.assign(File=df["File"].astype(str))
+        return df.assign(dup=df.groupby(["File", "idx"], sort=False).cumcount())
 
-        if not all_rows:
-            raise RuntimeError(
-                "No marker data found in any TOML file (even though some TOMLs were found)."
+    @classmethod
+    def frame(cls, df_ID75: pd.DataFrame, df_W84: pd.DataFrame) -> pd.DataFrame:
+        """File, idx, code, MARKER + COORDS from the two frames (same row order)."""
+        return cls._keyed(
+            pd.DataFrame(
+                {
+                    "File": df_ID75["File"].astype(str).to_numpy(dtype=object),
+                    "idx": df_ID75["idx"].to_numpy(dtype="int64"),
+                    "code": df_ID75["code"].astype(str).to_numpy(dtype=object),
+                    "MARKER": df_ID75["MARKER"].astype(str).to_numpy(dtype=object),
+                    "EASTING": df_ID75["EASTING"].to_numpy(dtype="float64"),
+                    "NORTHING": df_ID75["NORTHING"].to_numpy(dtype="float64"),
+                    "EPSG": df_ID75["EPSG"].to_numpy(dtype="int64"),
+                    "EASTING_W84": df_W84["EASTING"].to_numpy(dtype="float64"),
+                    "NORTHING_W84": df_W84["NORTHING"].to_numpy(dtype="float64"),
+                    "EPSG_W84": df_W84["EPSG"].to_numpy(dtype="int64"),
+                }
             )
+        )
+
+    @classmethod
+    def read_old(cls, gpkg_paths, files) -> pd.DataFrame:
+        """Markers of `files` from the previous run's bulk (I75UTM, W84UTM) GPKGs."""
+        import pyogrio
 
-        df_ID75 = pd.DataFrame(
-            all_rows,
-            columns=["File", "idx", "code", "MARKER", "NORTHING", "EASTING", "EPSG"],
+        files = sorted(files)
+        parts = {}
+        for tag, path in zip(("src", "w84"), gpkg_paths):
+            chunks = []
+            for i in range(0, len(files), cls.WHERE_FILES):
+                names = ", ".join(
+                    "'" + f.replace("'", "''") + "'" for f in files[i : i + cls.WHERE_FILES]
+                )
+                chunks.append(
+                    pyogrio.read_dataframe(
+                        path, layer="marker", read_geometry=False, where=f"File IN ({names})"
+                    )
+                )
+            parts[tag] = cls._keyed(pd.concat(chunks, ignore_index=True)) if chunks else None
+        if parts["src"] is None:
+            return cls.empty()
+        w84 = parts["w84"][cls.KEY + ["EASTING", "NORTHING", "EPSG"]].rename(
+            columns={"EASTING": "EASTING_W84", "NORTHING": "NORTHING_W84", "EPSG": "EPSG_W84"}
         )
-        return df_ID75
+        return parts["src"].merge(w84, on=cls.KEY, how="left")
+
+    @classmethod
+    def diff(cls, old: pd.DataFrame, new: pd.DataFrame, added, modified, removed):
+        """
+        Parcel records + marker change frame. added / modified / removed
+        are File names; old holds the markers of modified + removed,
+        new those of added + modified.
+        """
+        m = old.merge(new, on=cls.KEY, how="outer", suffixes=("_old", "_new"), indicator=True)
+        both = (m["_merge"] == "both").to_numpy()
+        changed = np.zeros(len(m), dtype=bool)
+        for col in ["code", "MARKER", "EASTING", "NORTHING", "EPSG"]:
+            changed |= m[f"{col}_old"].to_numpy() != m[f"{col}_new"].to_numpy()
+        op = np.select(
+            [(m["_merge"] == "right_only").to_numpy(), (m["_merge"] == "left_only").to_numpy()],
+            ["added", "removed"],
+            "modified",
+        )
+        keep = ~both | changed
+        markers = m.loc[keep].assign(op=op[keep]).sort_values(cls.KEY, kind="stable")
+        # a re-saved deed with identical markers is not a change
+        modified = set(modified) & set(markers["File"].unique().tolist())
+
+        n_old = old["File"].value_counts().to_dict()
+        n_new = new["File"].value_counts().to_dict()
+        parcels = []
+        for op_name, names in (("added", added), ("modified", modified), ("removed", removed)):
+            for f in sorted(names):
+                parcels.append(
+                    {
+                        "type": "parcel",
+                        "op": op_name,
+                        "File": f,
+                        "n_old": n_old.get(f, 0),
+                        "n_new": n_new.get(f, 0),
+                    }
+                )
+        return parcels, markers
+
+    @classmethod
+    def _coords(cls, markers: pd.DataFrame, suffix: str):
+        """Per-row JSON '[E,N,EPSG,E84,N84,EPSG84]' ('null' for a missing side)."""
+        v = markers[[f"{c}_{suffix}" for c in cls.COORDS]].to_numpy(dtype="float64")
+        return [
+            "null" if na else f"[{e!r},{n!r},{epsg:.0f},{e84!r},{n84!r},{epsg84:.0f}]"
+            for na, (e, n, epsg, e84, n84, epsg84) in zip(np.isnan(v[:, 0]).tolist(), v.tolist())
+        ]
+
+    @staticmethod
+    def _json_strings(values):
+        """JSON-quote a column of strings, once per distinct value."""
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        quoted = np.array([json.dumps(str(u), ensure_ascii=False) for u in uniques], dtype=object)
+        return quoted[codes].tolist()
+
+    def write(self, seq: int, parcels, markers: pd.DataFrame, full: bool = False) -> Path:
+        t0 = time.perf_counter()
+        markers_ops = markers["op"].value_counts()
+        head = {
+            "type": "changeset",
+            "seq": seq,
+            "prev_seq": seq - 1,
+            "full": full,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "coords": self.COORDS,
+            "counts": {
+                "parcels": {
+                    op: sum(p["op"] == op for p in parcels) for op in ("added", "modified", "removed")
+                },
+                "markers": {op: int(markers_ops.get(op, 0)) for op in ("added", "modified", "removed")},
+            },
+        }
+        def dumps(obj):
+            return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+        lines = [dumps(head)] + [dumps(p) for p in parcels]
+        # marker lines are formatted directly: json.dumps per row is the
+        # bottleneck of a full snapshot (hundreds of thousands of markers)
+        lines += [
+            f'{{"type":"marker","op":"{op}","File":{f},"idx":{i},"code":{c},'
+            f'"MARKER":{lb},"old":{o},"new":{n}}}'
+            for op, f, i, c, lb, o, n in zip(
+                markers["op"].tolist(),
+                self._json_strings(markers["File"]),
+                markers["idx"].astype("int64").tolist(),
+                self._json_strings(markers["code_new"].fillna(markers["code_old"])),
+                self._json_strings(markers["MARKER_new"].fillna(markers["MARKER_old"])),
+                self._coords(markers, "old"),
+                self._coords(markers, "new"),
+            )
+        ]
+        self.dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(seq)
+        with file_lock(path):
+            atomic_write_text(path, "\n".join(lines) + "\n")
+        print(
+            f"[CHANGES] seq {seq}{' (full)' if full else ''}: {len(parcels)} parcels, "
+            f"{len(markers)} markers → {path} ({time.perf_counter() - t0:.2f} s)"
+        )
+        return path
 
 
 # =========================================
@@ -412,62 +848,271 @@ class MarkerLoader:
 # =========================================
 
 class CoordinateTransformer:
-    """Use CRSFactory to transform coordinates."""
+    """
+    Use CRSFactory to transform coordinates.
+
+    Rows are grouped by EPSG and each group is transformed as whole NumPy
+    arrays in one pyproj call (no per-point Python loop).
+
+    Outputs never copy the input frame: they share its untouched columns
+    and only add (or replace) the transformed ones.
+    """
 
     def __init__(self, crs_factory: CRSFactory):
         self.crs_factory = crs_factory
 
+    @staticmethod
+    def _with_columns(df: pd.DataFrame, **cols) -> pd.DataFrame:
+        """New frame over df's columns (not copied) with `cols` added / replaced."""
+        data = {c: cols.pop(c) if c in cols else df[c] for c in df.columns}
+        data.update(cols)
+        return pd.DataFrame(data, index=df.index, copy=False)
+
+    @staticmethod
+    def _epsg_groups(epsg: np.ndarray):
+        """Yield (epsg_src, row mask) for every distinct EPSG."""
+        for epsg_src in np.unique(epsg):
+            yield int(epsg_src), epsg == epsg_src
+
+    def _to_wgs84_arrays(self, e, n, epsg):
+        lon = np.empty_like(e)
+        lat = np.empty_like(n)
+        for epsg_src, m in self._epsg_groups(epsg):
+            transformer = self.crs_factory.get_transformer_to_wgs84(epsg_src)
+            lon[m], lat[m] = transformer.transform(e[m], n[m])
+        return lon, lat
+
+    def _to_w84_utm_arrays(self, e, n, epsg, lon=None, lat=None):
+        """
+        If lon/lat are given (fused pass), project them to WGS84 UTM instead
+        of running the datum shift from the source CRS a second time.
+        """
+        x = np.empty_like(e)
+        y = np.empty_like(n)
+        epsg_out = np.empty_like(epsg)
+        for epsg_src, m in self._epsg_groups(epsg):
+            if lon is None:
+                transformer = self.crs_factory.get_transformer_to_w84_utm(epsg_src)
+                x[m], y[m] = transformer.transform(e[m], n[m])
+            else:
+                transformer = self.crs_factory.get_transformer_wgs84_to_w84_utm(epsg_src)
+                x[m], y[m] = transformer.transform(lon[m], lat[m])
+            epsg_out[m] = CRSFactory.w84_utm_epsg(epsg_src)
+        return x, y, epsg_out
+
+    @staticmethod
+    def _source_arrays(df_id75: pd.DataFrame):
+        return (
+            df_id75["EASTING"].to_numpy(dtype="float64"),
+            df_id75["NORTHING"].to_numpy(dtype="float64"),
+            df_id75["EPSG"].to_numpy(),
+        )
+
     def to_wgs84(self, df_id75: pd.DataFrame) -> pd.DataFrame:
         """Indian 1975 (or other EPSG) → geographic WGS84 (EPSG:4326)."""
-        lons = []
-        lats = []
-        for e, n, epsg in zip(
-            df_id75["EASTING"], df_id75["NORTHING"], df_id75["EPSG"]
-        ):
-            transformer = self.crs_factory.get_transformer_to_wgs84(int(epsg))
-            lon, lat = transformer.transform(e, n)
-            lons.append(lon)
-            lats.append(lat)
-
-        df_LL_W84 = df_id75.copy()
-        df_LL_W84["LON"] = lons
-        df_LL_W84["LAT"] = lats
-        return df_LL_W84
+        e, n, epsg = self._source_arrays(df_id75)
+        lon, lat = self._to_wgs84_arrays(e, n, epsg)
+        return self._with_columns(df_id75, LON=lon, LAT=lat)
 
     def to_w84_utm(self, df_id75: pd.DataFrame) -> pd.DataFrame:
         """
         Indian 1975 UTM (24047/24048) → WGS84 UTM (32647/32648).
 
-        Output df_W84 keeps original columns and adds:
+        Output df_W84 keeps original columns and replaces:
             EASTING, NORTHING, EPSG
         """
-        xs = []
-        ys = []
-        epsg_out = []
+        e, n, epsg = self._source_arrays(df_id75)
+        x, y, epsg_out = self._to_w84_utm_arrays(e, n, epsg)
+        return self._with_columns(df_id75, EASTING=x, NORTHING=y, EPSG=epsg_out)
 
-        for e, n, epsg in zip(
-            df_id75["EASTING"], df_id75["NORTHING"], df_id75["EPSG"]
-        ):
-            epsg_src = int(epsg)
-            transformer = self.crs_factory.get_transformer_to_w84_utm(epsg_src)
-            x, y = transformer.transform(e, n)
-
-            if epsg_src in (24047, 32647):
-                epsg_dst = 32647
-            elif epsg_src in (24048, 32648):
-                epsg_dst = 32648
-            else:
-                epsg_dst = epsg_src  # fallback
+    def to_wgs84_and_w84_utm(self, df_id75: pd.DataFrame):
+        """
+        Fused pass: one datum shift per EPSG group to LON/LAT, then a plain
+        projection of those to WGS84 UTM. Returns (df_LL_W84, df_W84).
+        """
+        e, n, epsg = self._source_arrays(df_id75)
+        lon, lat = self._to_wgs84_arrays(e, n, epsg)
+        x, y, epsg_out = self._to_w84_utm_arrays(e, n, epsg, lon, lat)
+        return (
+            self._with_columns(df_id75, LON=lon, LAT=lat),
+            self._with_columns(df_id75, EASTING=x, NORTHING=y, EPSG=epsg_out),
+        )
+
+    def to_epsg(self, df: pd.DataFrame, epsg_dst: int) -> pd.DataFrame:
+        """
+        Reproject the rows of every other EPSG group into epsg_dst, so the
+        frame can be written under one layer CRS. Returns df itself when all
+        rows already are in epsg_dst.
+        """
+        e, n, epsg = self._source_arrays(df)
+        if (epsg == epsg_dst).all():
+            return df
+        x = e.copy()
+        y = n.copy()
+        for epsg_src, m in self._epsg_groups(epsg):
+            if epsg_src != epsg_dst:
+                transformer = self.crs_factory.get_transformer(epsg_src, epsg_dst)
+                x[m], y[m] = transformer.transform(e[m], n[m])
+        return self._with_columns(
+            df, EASTING=x, NORTHING=y, EPSG=np.full_like(epsg, epsg_dst)
+        )
+
+
+# =========================================
+# Vectorized marker / parcel geometry
+# =========================================
+
+class ParcelBuilder:
+    """
+    Build all marker points and parcel polygons of a marker table in bulk
+    (shapely 2 array functions, no per-parcel Python loop).
+
+    Parcels follow the order of df["File"] (sorted), vertices keep their
+    row order inside each File; rings are closed automatically.
+    """
+
+    @staticmethod
+    def markers(df: pd.DataFrame, crs) -> gpd.GeoDataFrame:
+        geom = gpd.points_from_xy(df["EASTING"], df["NORTHING"])
+        return gpd.GeoDataFrame(df, geometry=geom, crs=crs)
+
+    @staticmethod
+    def parcels(
+        df: pd.DataFrame, crs, x: str = "EASTING", y: str = "NORTHING"
+    ) -> gpd.GeoDataFrame:
+        codes, files = pd.factorize(df["File"], sort=True)
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        xy = np.column_stack(
+            [
+                df[x].to_numpy(dtype="float64")[order],
+                df[y].to_numpy(dtype="float64")[order],
+            ]
+        )
+
+        # drop parcels that cannot form a ring (< 3 vertices)
+        counts = np.bincount(codes, minlength=len(files))
+        bad = counts < 3
+        if bad.any():
+            print(f"[WARN] Skip parcels with < 3 markers: {list(files[bad])}")
+            keep = ~bad[codes]
+            xy, codes = xy[keep], codes[keep]
+            files = files[~bad]
+            codes = np.cumsum(~bad)[codes] - 1  # renumber 0..n-1
+
+        rings = shapely.linearrings(xy, indices=codes)
+        polys = shapely.polygons(rings)
+        return gpd.GeoDataFrame(
+            {"File": np.asarray(files, dtype=object)}, geometry=polys, crs=crs
+        )
 
-            xs.append(x)
-            ys.append(y)
-            epsg_out.append(epsg_dst)
 
-        df_W84 = df_id75.copy()
-        df_W84["EASTING"] = xs
-        df_W84["NORTHING"] = ys
-        df_W84["EPSG"] = epsg_out
-        return df_W84
+# =========================================
+# Parcel metrics (area / perimeter / misclosure)
+# =========================================
+
+class ParcelMetrics:
+    """
+    Per-parcel attribute table computed in bulk (bincount over the marker
+    rows, no per-parcel loop):
+
+    - n_vertex                  distinct boundary markers
+    - area_src / perimeter_src  planar, source CRS (Indian 1975 UTM or 326xx)
+    - area_w84 / perimeter_w84  planar, WGS84 UTM
+    - area_ellps                WGS84 ellipsoidal area, geodesic edges
+                                (pyproj Geod; the only per-parcel call)
+    - orientation               CW / CCW order of the markers (E, N axes)
+    - closing_dist              length of the closing side last → first marker
+    - misclosure                closing_dist when the deed repeats its first
+                                marker (same code) at the end, else 0.0
+    """
+
+    COLUMNS = [
+        "File",
+        "n_vertex",
+        "EPSG_src",
+        "area_src",
+        "perimeter_src",
+        "EPSG_w84",
+        "area_w84",
+        "perimeter_w84",
+        "area_ellps",
+        "orientation",
+        "closing_dist",
+        "misclosure",
+    ]
+    GEOD = Geod(ellps="WGS84")
+
+    @staticmethod
+    def _ring(x, y, codes, n_parcels, start, nxt):
+        """Signed shoelace area and perimeter per parcel (ring closed implicitly)."""
+        # shift each parcel to its first vertex: keeps the cross products small
+        x = x - x[start][codes]
+        y = y - y[start][codes]
+        cross = x * y[nxt] - x[nxt] * y
+        seg = np.hypot(x[nxt] - x, y[nxt] - y)
+        area = np.bincount(codes, weights=cross, minlength=n_parcels) / 2
+        perimeter = np.bincount(codes, weights=seg, minlength=n_parcels)
+        return area, perimeter, seg
+
+    @classmethod
+    def compute(cls, df_ID75: pd.DataFrame, df_LL_W84: pd.DataFrame, df_W84: pd.DataFrame):
+        """The three frames must share row order (CoordinateTransformer output)."""
+        codes, files = pd.factorize(df_ID75["File"], sort=True)
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        n = np.bincount(codes, minlength=len(files))
+        start = np.cumsum(n) - n
+        last = start + n - 1
+        nxt = np.arange(len(codes)) + 1
+        nxt[last] = start
+
+        def col(df, name):
+            return df[name].to_numpy(dtype="float64")[order]
+
+        area_src, perim_src, seg_src = cls._ring(
+            col(df_ID75, "EASTING"), col(df_ID75, "NORTHING"), codes, len(files), start, nxt
+        )
+        area_w84, perim_w84, _ = cls._ring(
+            col(df_W84, "EASTING"), col(df_W84, "NORTHING"), codes, len(files), start, nxt
+        )
+        cuts = start[1:]
+        area_ellps = np.fromiter(
+            (
+                cls.GEOD.polygon_area_perimeter(lon, lat)[0]
+                for lon, lat in zip(
+                    np.split(col(df_LL_W84, "LON"), cuts), np.split(col(df_LL_W84, "LAT"), cuts)
+                )
+            ),
+            dtype="float64",
+            count=len(files),
+        )
+
+        code = pd.factorize(df_ID75["code"])[0][order]
+        repeated = (n > 1) & (code[start] == code[last])
+        closing = seg_src[last]
+
+        return pd.DataFrame(
+            {
+                "File": np.asarray(files, dtype=object),
+                "n_vertex": (n - repeated).astype("int32"),
+                "EPSG_src": df_ID75["EPSG"].to_numpy()[order][start],
+                "area_src": np.abs(area_src),
+                "perimeter_src": perim_src,
+                "EPSG_w84": df_W84["EPSG"].to_numpy()[order][start],
+                "area_w84": np.abs(area_w84),
+                "perimeter_w84": perim_w84,
+                "area_ellps": np.abs(area_ellps),
+                "orientation": np.where(area_src >= 0, "CCW", "CW"),
+                "closing_dist": closing,
+                "misclosure": np.where(repeated, closing, 0.0),
+            },
+            columns=cls.COLUMNS,
+        )
+
+    @staticmethod
+    def csv_path(folder: Path, prefix: str) -> Path:
+        return folder / f"{prefix}_parcel_metrics.csv"
 
 
 # =========================================
@@ -475,11 +1120,40 @@ class CoordinateTransformer:
 # =========================================
 
 class GPKGWriter:
-    """Write three GPKG files: source CRS, geographic WGS84, WGS84 UTM."""
+    """
+    Write three GPKG files: source CRS, geographic WGS84, WGS84 UTM.
+
+    bulk=False : one marker:<File> and parcel:<File> layer per parcel
+    bulk=True  : all markers in layer "marker", all parcels in layer
+                 "parcel" (File attribute); one write per layer, GDAL builds
+                 the R-tree once at the end; both GPKGs written concurrently.
 
-    def __init__(self, folder: Path, crs_factory: CRSFactory):
+    update_ID75_W84() upserts / deletes parcels by File in existing bulk
+    GPKGs (incremental build).
+
+    metrics: optional ParcelMetrics table joined onto the parcel layer(s).
+    """
+
+    LAYERS = ("marker", "parcel")
+
+    def __init__(
+        self,
+        folder: Path,
+        crs_factory: CRSFactory,
+        bulk: bool = False,
+        metrics: pd.DataFrame | None = None,
+    ):
         self.folder = folder
         self.crs_factory = crs_factory
+        self.bulk = bulk
+        self.metrics = metrics
+
+    @staticmethod
+    def with_metrics(gdf_parcel: gpd.GeoDataFrame, metrics: pd.DataFrame | None):
+        """Join ParcelMetrics columns onto parcel polygons by File."""
+        if metrics is None:
+            return gdf_parcel
+        return gdf_parcel.merge(metrics, on="File", how="left")
 
     def write_ID75_W84(
         self,
@@ -494,61 +1168,2256 @@ class GPKGWriter:
         epsg_mode_w84utm = int(df_W84["EPSG"].mode()[0])
         crs_w84utm = CRS.from_epsg(epsg_mode_w84utm)
 
-        gpkg_i75utm_path = self.folder / f"{prefix}_I75UTM.gpkg"
-        gpkg_w84utm_path = self.folder / f"{prefix}_W84UTM.gpkg"
+        gpkg_i75utm_path, gpkg_w84utm_path = self.gpkg_paths(prefix)
 
-        self.write_gpkg( df_I75, gpkg_i75utm_path, crs_i75utm )
-        self.write_gpkg( df_W84, gpkg_w84utm_path, crs_w84utm )
+        if not self.bulk:
+            self.write_gpkg( df_I75, gpkg_i75utm_path, crs_i75utm )
+            self.write_gpkg( df_W84, gpkg_w84utm_path, crs_w84utm )
+            return
 
-    def write_gpkg(self, df: pd.DataFrame, gpkg_path, crs):
-        for i, row in df.groupby('File'):
-            print(f'Writing group {i} ...')
-            # ---- marker points ----
-            gdf_marker = gpd.GeoDataFrame(
-                row.copy(),
-                geometry=[Point(xy) for xy in zip(row["EASTING"], row["NORTHING"])],
-                crs=crs,
-            )
-            gdf_marker.to_file(gpkg_path, layer=f"marker:{i}", driver="GPKG")
-            # ---- polygon boundary ----
-            coords = list(zip(row["EASTING"], row["NORTHING"]))
-            # ensure closed ring
-            if len(coords) > 1 and coords[0] != coords[-1]:
-                coords.append(coords[0])
-            # create Polygon instead of LineString
-            boundary_geom = Polygon(coords)
-            gdf_boundary = gpd.GeoDataFrame(
-                {"File": [i]},
-                geometry=[boundary_geom],
-                crs=crs
-                )
-            gdf_boundary.to_file(gpkg_path, layer=f"parcel:{i}", driver="GPKG")
-        print(f"[OK] Wrote GPKG → {gpkg_path}")
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            jobs = [
+                pool.submit(self.write_gpkg_bulk, df_I75, gpkg_i75utm_path, crs_i75utm),
+                pool.submit(self.write_gpkg_bulk, df_W84, gpkg_w84utm_path, crs_w84utm),
+            ]
+            for job in jobs:
+                job.result()
+        print(f"[TIME] bulk GPKG write: {time.perf_counter() - t0:.2f} s")
 
+    def gpkg_paths(self, prefix: str):
+        return (
+            self.folder / f"{prefix}_I75UTM.gpkg",
+            self.folder / f"{prefix}_W84UTM.gpkg",
+        )
 
-# =========================================
-# High-level Processor
-# =========================================
+    @classmethod
+    def is_bulk_gpkg(cls, gpkg_path: Path) -> bool:
+        import pyogrio
 
-class MarkerProcessor:
-    """
-    Orchestrates the whole flow:
-    - Load CONFIG.toml
-    - Load df_ID75 from folder
-    - Transform to df_LL_W84 and df_W84
-    - Optional CSV (df_ID75)
-    - Write GPKG (ID, WGS84, W84UTM)
-    """
+        if not gpkg_path.is_file():
+            return False
+        layers = {name for name, _ in pyogrio.list_layers(gpkg_path)}
+        return set(cls.LAYERS) <= layers
 
-    def __init__(
+    @classmethod
+    def _index_file_column(cls, gpkg_path: Path):
+        """Attribute index on File so per-parcel deletes are not table scans."""
+        con = sqlite3.connect(gpkg_path)
+        try:
+            with con:
+                for layer in cls.LAYERS:
+                    con.execute(
+                        f'CREATE INDEX IF NOT EXISTS "idx_{layer}_File" ON "{layer}" (File)'
+                    )
+        finally:
+            con.close()
+
+    def update_ID75_W84(
         self,
-        folder: Path,
-        config_path: Path,
-        gpkg_prefix: str,
+        df_I75: pd.DataFrame,
+        df_W84: pd.DataFrame,
+        prefix: str,
+        delete_files,
     ):
-        self.folder = folder
-        self.config_path = config_path
+        t0 = time.perf_counter()
+        for df, gpkg_path in zip((df_I75, df_W84), self.gpkg_paths(prefix)):
+            self.update_gpkg_bulk(df, gpkg_path, delete_files)
+        print(f"[TIME] incremental GPKG update: {time.perf_counter() - t0:.2f} s")
+
+    def update_gpkg_bulk(self, df: pd.DataFrame, gpkg_path: Path, delete_files):
+        """
+        Delete every feature whose File is in delete_files, then append df.
+        The edit goes to a copy of the GPKG that replaces it at the end
+        (like the full write), so readers never see a half-updated file.
+        Re-running the same update is harmless (delete + append by File),
+        so a crash before the state file is saved just redoes the work.
+        """
+        import shutil
+
+        import pyogrio
+
+        # keep the CRS the layer was created with
+        crs = pyogrio.read_info(gpkg_path, layer="parcel")["crs"]
+        delete_files = sorted(delete_files)
+
+        with file_lock(gpkg_path), atomic_path(gpkg_path) as tmp_path:
+            shutil.copyfile(gpkg_path, tmp_path)
+            con = sqlite3.connect(tmp_path)
+            try:
+                with con:
+                    for layer in self.LAYERS:
+                        con.executemany(
+                            f'DELETE FROM "{layer}" WHERE File = ?',
+                            [(f,) for f in delete_files],
+                        )
+            finally:
+                con.close()
+
+            n_marker = n_parcel = 0
+            if len(df):
+                gdf_marker = ParcelBuilder.markers(df, crs)
+                gdf_parcel = ParcelBuilder.parcels(df, crs)
+                n_marker, n_parcel = len(gdf_marker), len(gdf_parcel)
+                for gdf, layer in ((gdf_marker, "marker"), (gdf_parcel, "parcel")):
+                    gdf.to_file(
+                        tmp_path,
+                        layer=layer,
+                        driver="GPKG",
+                        engine="pyogrio",
+                        use_arrow=True,
+                        append=True,
+                    )
+        print(
+            f"[OK] Updated GPKG → {gpkg_path} "
+            f"(-{len(delete_files)} files, +{n_marker} markers, +{n_parcel} parcels)"
+        )
+
+    @classmethod
+    def append_gpkg_bulk(
+        cls, df: pd.DataFrame, gpkg_path: Path, crs, create: bool, metrics=None
+    ):
+        """
+        Write one chunk into the "marker" / "parcel" layers of gpkg_path
+        (created with the first chunk); used by the chunked build, which
+        owns the lock and the temp path.
+        """
+        gdf_marker = ParcelBuilder.markers(df, crs)
+        gdf_parcel = cls.with_metrics(ParcelBuilder.parcels(df, crs), metrics)
+        for gdf, layer in ((gdf_marker, "marker"), (gdf_parcel, "parcel")):
+            gdf.to_file(
+                gpkg_path,
+                layer=layer,
+                driver="GPKG",
+                engine="pyogrio",
+                use_arrow=True,
+                append=not create,
+                SPATIAL_INDEX="YES",
+            )
+        return len(gdf_marker), len(gdf_parcel)
+
+    def write_gpkg_bulk(self, df: pd.DataFrame, gpkg_path, crs):
+        gdf_marker = ParcelBuilder.markers(df, crs)
+        gdf_parcel = self.with_metrics(ParcelBuilder.parcels(df, crs), self.metrics)
+
+        with file_lock(gpkg_path), atomic_path(gpkg_path) as tmp_path:
+            for gdf, layer in ((gdf_marker, "marker"), (gdf_parcel, "parcel")):
+                gdf.to_file(
+                    tmp_path,
+                    layer=layer,
+                    driver="GPKG",
+                    engine="pyogrio",
+                    use_arrow=True,
+                    SPATIAL_INDEX="YES",
+                )
+            self._index_file_column(tmp_path)
+        print(
+            f"[OK] Wrote GPKG → {gpkg_path} "
+            f"({len(gdf_marker)} markers, {len(gdf_parcel)} parcels)"
+        )
+
+    def write_gpkg(self, df: pd.DataFrame, gpkg_path, crs):
+        # build into a temp GPKG, then swap it in (readers never see a half file)
+        with file_lock(gpkg_path), atomic_path(gpkg_path) as tmp_path:
+            for i, row in df.groupby('File', observed=True):
+                print(f'Writing group {i} ...')
+                # ---- marker points ----
+                gdf_marker = gpd.GeoDataFrame(
+                    row.copy(),
+                    geometry=[Point(xy) for xy in zip(row["EASTING"], row["NORTHING"])],
+                    crs=crs,
+                )
+                gdf_marker.to_file(tmp_path, layer=f"marker:{i}", driver="GPKG")
+                # ---- polygon boundary ----
+                coords = list(zip(row["EASTING"], row["NORTHING"]))
+                # ensure closed ring
+                if len(coords) > 1 and coords[0] != coords[-1]:
+                    coords.append(coords[0])
+                # create Polygon instead of LineString
+                boundary_geom = Polygon(coords)
+                gdf_boundary = gpd.GeoDataFrame(
+                    {"File": [i]},
+                    geometry=[boundary_geom],
+                    crs=crs
+                    )
+                gdf_boundary = self.with_metrics(gdf_boundary, self.metrics)
+                gdf_boundary.to_file(tmp_path, layer=f"parcel:{i}", driver="GPKG")
+        print(f"[OK] Wrote GPKG → {gpkg_path}")
+
+
+# =========================================
+# Streaming columnar exports (GeoParquet / FlatGeobuf / CSV)
+# =========================================
+
+class _ParquetSink:
+    """GeoParquet 1.0 (WKB geometry column + 'geo' metadata), one row group per batch."""
+
+    def __init__(self, path: Path, crs, geometry_type: str):
+        self.path = path
+        self.crs = crs
+        self.geometry_type = geometry_type
+        self.writer = None
+
+    def write(self, table):
+        import pyarrow.parquet as pq
+
+        if self.writer is None:
+            geo = {
+                "version": "1.0.0",
+                "primary_column": "geometry",
+                "columns": {
+                    "geometry": {
+                        "encoding": "WKB",
+                        "geometry_types": [self.geometry_type],
+                        "crs": self.crs.to_json_dict(),
+                    }
+                },
+            }
+            schema = table.schema.with_metadata({b"geo": json.dumps(geo).encode()})
+            self.writer = pq.ParquetWriter(self.path, schema, compression="zstd")
+        self.writer.write_table(table.replace_schema_metadata(self.writer.schema.metadata))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class _FlatGeobufSink:
+    """
+    FlatGeobuf with packed Hilbert R-tree. pyogrio.write_arrow consumes a
+    RecordBatchReader fed through a small bounded queue from a worker
+    thread, so batches are streamed instead of collected.
+    """
+
+    _END = object()
+
+    def __init__(self, path: Path, crs, geometry_type: str, layer: str):
+        self.path = path
+        self.crs = crs
+        self.geometry_type = geometry_type
+        self.layer = layer
+        self.queue = queue.Queue(maxsize=2)
+        self.thread = None
+        self.error = None
+
+    def _run(self, schema):
+        import pyarrow as pa
+        import pyogrio
+
+        def batches():
+            while (item := self.queue.get()) is not self._END:
+                yield from item.to_batches()
+
+        try:
+            pyogrio.write_arrow(
+                pa.RecordBatchReader.from_batches(schema, batches()),
+                self.path,
+                driver="FlatGeobuf",
+                layer=self.layer,
+                geometry_name="geometry",
+                geometry_type=self.geometry_type,
+                crs=self.crs.to_wkt(),
+                SPATIAL_INDEX="YES",
+            )
+        except Exception as e:  # surfaced in close()
+            self.error = e
+            while self.queue.get() is not self._END:  # drain so write() never blocks
+                pass
+
+    def write(self, table):
+        if self.thread is None:
+            self.schema = table.schema
+            self.thread = threading.Thread(target=self._run, args=(table.schema,), daemon=True)
+            self.thread.start()
+        self.queue.put(table.cast(self.schema))
+
+    def close(self):
+        if self.thread is None:
+            return
+        self.queue.put(self._END)
+        self.thread.join()
+        self.thread = None
+        if self.error is not None:
+            raise self.error
+
+
+class _CSVSink:
+    """CSV; point columns as-is, polygons as WKT in column 'geometry'."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.header = True
+
+    def write(self, table):
+        import pyarrow.csv as pacsv
+
+        with open(self.path, "ab") as fp:
+            pacsv.write_csv(
+                table, fp, pacsv.WriteOptions(include_header=self.header)
+            )
+        self.header = False
+
+    def close(self):
+        pass
+
+
+class ColumnarExporter:
+    """
+    Stream markers and parcels to GeoParquet / FlatGeobuf / CSV in batches
+    of `batch_parcels` parcels. Each batch is turned into Arrow tables
+    (WKB geometry) and handed to every sink, so no single GeoDataFrame of
+    the whole cadastre is ever built. Outputs appear atomically.
+    """
+
+    FORMATS = ("parquet", "fgb", "csv")
+    SUFFIX = {"parquet": ".parquet", "fgb": ".fgb", "csv": ".csv"}
+
+    def __init__(self, folder: Path, prefix: str, formats, batch_parcels: int = 5000):
+        self.folder = folder
+        self.prefix = prefix
+        self.formats = list(formats)
+        self.batch_parcels = max(1, int(batch_parcels))
+        bad = set(self.formats) - set(self.FORMATS)
+        if bad:
+            raise ValueError(f"Unknown export format(s): {sorted(bad)}")
+
+    def iter_batches(self, df: pd.DataFrame):
+        """Yield df slices holding `batch_parcels` whole parcels each."""
+        codes, _ = pd.factorize(df["File"], sort=True)
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        n_files = int(sorted_codes[-1]) + 1 if len(sorted_codes) else 0
+        for start in range(0, n_files, self.batch_parcels):
+            lo, hi = np.searchsorted(
+                sorted_codes, [start, start + self.batch_parcels]
+            )
+            yield df.iloc[order[lo:hi]]
+
+    @staticmethod
+    def _marker_table(batch: pd.DataFrame, wkt: bool):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(batch, preserve_index=False)
+        # categoricals → plain strings (dictionaries differ between chunks)
+        table = table.cast(
+            pa.schema(
+                [
+                    pa.field(f.name, f.type.value_type) if pa.types.is_dictionary(f.type) else f
+                    for f in table.schema
+                ]
+            )
+        )
+        if wkt:
+            return table
+        pts = shapely.points(
+            batch["EASTING"].to_numpy(dtype="float64"),
+            batch["NORTHING"].to_numpy(dtype="float64"),
+        )
+        return table.append_column("geometry", pa.array(shapely.to_wkb(pts), pa.binary()))
+
+    @staticmethod
+    def _parcel_table(batch: pd.DataFrame, crs, wkt: bool):
+        import pyarrow as pa
+
+        gdf = ParcelBuilder.parcels(batch, crs)
+        geom = (
+            pa.array(shapely.to_wkt(gdf.geometry.values, rounding_precision=-1), pa.string())
+            if wkt
+            else pa.array(shapely.to_wkb(gdf.geometry.values), pa.binary())
+        )
+        return pa.table({"File": pa.array(gdf["File"].astype(str)), "geometry": geom})
+
+    def _make_sink(self, fmt: str, path: Path, crs, geometry_type: str, layer: str):
+        if fmt == "parquet":
+            return _ParquetSink(path, crs, geometry_type)
+        if fmt == "fgb":
+            return _FlatGeobufSink(path, crs, geometry_type, layer)
+        return _CSVSink(path)
+
+    def open_sinks(self, stack: ExitStack, tag: str, crs):
+        """Lock + temp path + sink per format and kind: [(fmt, kind, sink)]."""
+        sinks = []
+        for fmt in self.formats:
+            for kind, gtype in (("marker", "Point"), ("parcel", "Polygon")):
+                path = self.folder / f"{self.prefix}_{tag}_{kind}{self.SUFFIX[fmt]}"
+                stack.enter_context(file_lock(path))
+                tmp = stack.enter_context(atomic_path(path))
+                sink = self._make_sink(fmt, tmp, crs, gtype, kind)
+                # error path: stop writer threads before the temp file goes
+                stack.callback(self._discard, sink)
+                sinks.append((fmt, kind, sink))
+        return sinks
+
+    @staticmethod
+    def _discard(sink):
+        """Close a sink, ignoring its errors (no-op after close_sinks)."""
+        try:
+            sink.close()
+        except Exception:
+            pass
+
+    def write(self, sinks, df: pd.DataFrame, crs) -> int:
+        """Write df to the open sinks in batches; returns the batch count."""
+        n_batches = 0
+        for batch in self.iter_batches(df):
+            cache = {}
+            for fmt, kind, sink in sinks:
+                wkt = fmt == "csv"
+                key = (kind, wkt)
+                if key not in cache:
+                    cache[key] = (
+                        self._marker_table(batch, wkt)
+                        if kind == "marker"
+                        else self._parcel_table(batch, crs, wkt)
+                    )
+                sink.write(cache[key])
+            n_batches += 1
+        return n_batches
+
+    @staticmethod
+    def close_sinks(sinks):
+        for _, _, sink in sinks:
+            sink.close()
+
+    def export(self, df: pd.DataFrame, tag: str, crs):
+        t0 = time.perf_counter()
+        with ExitStack() as stack:
+            sinks = self.open_sinks(stack, tag, crs)
+            n_batches = self.write(sinks, df, crs)
+            self.close_sinks(sinks)
+
+        print(
+            f"[OK] Export {tag} ({', '.join(self.formats)}): {n_batches} batches, "
+            f"{len(df)} markers in {time.perf_counter() - t0:.2f} s"
+        )
+
+
+# =========================================
+# Spatial database bulk load (SpatiaLite / PostGIS)
+# =========================================
+
+class SpatialDBWriter:
+    """
+    GPKGWriter's sibling for spatial databases: the bulk layout (tables
+    "marker" and "parcel" with a File attribute, WGS84 UTM, optional
+    ParcelMetrics columns on parcel) loaded through each engine's fast path.
+
+    - SpatiaLite (<file>.sqlite / .db): one Arrow stream per table into
+      the GDAL SQLite driver (pyogrio.write_arrow); GDAL creates the
+      R-tree once the rows are in. A full load (or an upsert, on a copy)
+      goes to a temp file that replaces the target under its lock
+      (RV25j_SafeIO).
+    - PostGIS (postgresql://user@host/db): COPY ... FROM STDIN (CSV, hex
+      EWKB) through psycopg 3; the GiST / File indexes and ANALYZE come
+      after the COPY, and the whole replace is one transaction.
+
+    Rows go in ColumnarExporter batches of `batch_parcels` parcels.
+    upsert() deletes by File and appends (tables / indexes created when
+    missing), so it serves incremental builds and partial reloads.
+    """
+
+    LAYERS = ("marker", "parcel")
+    GEOMETRY = {"marker": "Point", "parcel": "Polygon"}
+    SPATIALITE_SUFFIXES = (".sqlite", ".db", ".spatialite")
+    SQLITE_CACHE_MB = 256
+
+    def __init__(self, target: str, batch_parcels: int = 5000, metrics: pd.DataFrame | None = None):
+        self.target = str(target)
+        self.postgis = self.is_postgis(self.target)
+        if not self.postgis and Path(self.target).suffix.lower() not in self.SPATIALITE_SUFFIXES:
+            raise ValueError(
+                f"SpatialDBWriter target must be a postgresql:// URL or a "
+                f"{'/'.join(self.SPATIALITE_SUFFIXES)} file (got {self.target!r})"
+            )
+        self.batch_parcels = max(1, int(batch_parcels))
+        self.metrics = metrics
+
+    @staticmethod
+    def is_postgis(target: str) -> bool:
+        return str(target).startswith(("postgresql://", "postgres://"))
+
+    def describe(self) -> str:
+        if not self.postgis:
+            return f"SpatiaLite {self.target}"
+        # never print the password of the URL
+        from urllib.parse import urlsplit
+
+        url = urlsplit(self.target)
+        return f"PostGIS {url.hostname or 'localhost'}{url.path}"
+
+    # ---- batches ----
+    def _tables(self, df: pd.DataFrame, kind: str, crs):
+        """Arrow tables of one layer, `batch_parcels` parcels per table."""
+        import pyarrow as pa
+
+        batches = ColumnarExporter(Path(), "", (), self.batch_parcels).iter_batches(df)
+        for batch in batches:
+            if kind == "marker":
+                yield ColumnarExporter._marker_table(batch, wkt=False)
+                continue
+            table = ColumnarExporter._parcel_table(batch, crs, wkt=False)
+            if self.metrics is not None:
+                m = self.metrics.set_index("File").reindex(table.column("File").to_pandas())
+                for name in m.columns:
+                    table = table.append_column(name, pa.array(m[name].to_numpy()))
+            yield table
+
+    @staticmethod
+    def _report(kind: str, n: int, dt: float):
+        print(f"[DB] {kind}: {n} rows in {dt:.2f} s ({n / dt if dt > 0 else 0:.0f} rows/s)")
+
+    # ---- SpatiaLite ----
+    def _spatialite_layer(self, path: Path, kind: str, df: pd.DataFrame, crs, append: bool) -> int:
+        import pyarrow as pa
+        import pyogrio
+
+        t0 = time.perf_counter()
+        tables = self._tables(df, kind, crs)
+        first = next(tables, None)
+        if first is None:
+            return 0
+        n = 0
+
+        def batches():
+            nonlocal n
+            for table in chain([first], tables):
+                n += table.num_rows
+                yield from table.cast(first.schema).to_batches()
+
+        options = {}
+        if not append:
+            options = dict(
+                layer_options={"SPATIAL_INDEX": "YES", "LAUNDER": "NO", "GEOMETRY_NAME": "geom"}
+            )
+            if not path.exists():
+                options["dataset_options"] = {"SPATIALITE": "YES"}
+        # the R-tree dominates large loads: give SQLite a bigger page cache;
+        # loads always go to a temp file (fsync'ed by atomic_path), so they
+        # can also skip SQLite's own fsyncs. GDAL config options are process
+        # wide: put back whatever was set before.
+        config = {"OGR_SQLITE_CACHE": self.SQLITE_CACHE_MB, "OGR_SQLITE_SYNCHRONOUS": "OFF"}
+        previous = {key: pyogrio.get_gdal_config_option(key) for key in config}
+        pyogrio.set_gdal_config_options(config)
+        try:
+            pyogrio.write_arrow(
+                pa.RecordBatchReader.from_batches(first.schema, batches()),
+                path,
+                layer=kind,
+                driver="SQLite",
+                geometry_name="geometry",
+                geometry_type=self.GEOMETRY[kind],
+                crs=crs.to_wkt(),
+                append=append,
+                **options,
+            )
+        finally:
+            pyogrio.set_gdal_config_options(previous)
+        self._report(kind, n, time.perf_counter() - t0)
+        return n
+
+    def _spatialite_has_tables(self, path: Path) -> bool:
+        import pyogrio
+
+        if not path.is_file():
+            return False
+        return set(self.LAYERS) <= {name for name, _ in pyogrio.list_layers(path)}
+
+    # ---- PostGIS ----
+    def _connect(self):
+        try:
+            import psycopg
+        except ImportError:
+            raise SystemExit("[FATAL] --db postgresql:// needs psycopg 3 (pip install 'psycopg[binary]')")
+        return psycopg.connect(self.target)
+
+    @staticmethod
+    def _pg_type(t) -> str:
+        import pyarrow as pa
+
+        if pa.types.is_boolean(t):
+            return "boolean"
+        if pa.types.is_integer(t):
+            return "integer" if t.bit_width <= 16 or t == pa.int32() else "bigint"
+        if pa.types.is_floating(t):
+            return "double precision"
+        return "text"
+
+    def _pg_create(self, con, kind: str, schema, srid: int):
+        cols = ", ".join(
+            f"geom geometry({self.GEOMETRY[kind]}, {srid})"
+            if f.name == "geometry"
+            else f'"{f.name}" {self._pg_type(f.type)}'
+            for f in schema
+        )
+        con.execute(f'CREATE TABLE "{kind}" (fid bigserial PRIMARY KEY, {cols})')
+
+    @staticmethod
+    def _pg_index(con, kind: str):
+        con.execute(f'CREATE INDEX IF NOT EXISTS "{kind}_geom_idx" ON "{kind}" USING GIST (geom)')
+        con.execute(f'CREATE INDEX IF NOT EXISTS "{kind}_File_idx" ON "{kind}" ("File")')
+
+    @staticmethod
+    def _copy_csv(table, srid: int) -> bytes:
+        """CSV rows for COPY; geometry as hex EWKB (SRID included)."""
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+
+        geoms = shapely.from_wkb(table.column("geometry").to_numpy(zero_copy_only=False))
+        ewkb = shapely.to_wkb(shapely.set_srid(geoms, srid), hex=True, include_srid=True)
+        i = table.schema.get_field_index("geometry")
+        table = table.set_column(i, "geometry", pa.array(ewkb, pa.string()))
+        buf = io.BytesIO()
+        pacsv.write_csv(table, buf, pacsv.WriteOptions(include_header=False))
+        return buf.getvalue()
+
+    def _pg_layer(self, con, kind: str, df: pd.DataFrame, crs, create: bool) -> int:
+        t0 = time.perf_counter()
+        srid = crs.to_epsg()
+        tables = self._tables(df, kind, crs)
+        first = next(tables, None)
+        if first is None:
+            return 0
+        if create:
+            con.execute(f'DROP TABLE IF EXISTS "{kind}"')
+            self._pg_create(con, kind, first.schema, srid)
+        cols = ", ".join("geom" if name == "geometry" else f'"{name}"' for name in first.schema.names)
+        n = 0
+        with con.cursor().copy(f'COPY "{kind}" ({cols}) FROM STDIN WITH (FORMAT csv)') as copy:
+            for table in chain([first], tables):
+                copy.write(self._copy_csv(table.cast(first.schema), srid))
+                n += table.num_rows
+        self._report(kind, n, time.perf_counter() - t0)
+        return n
+
+    @staticmethod
+    def _pg_has_table(con, kind: str) -> bool:
+        return con.execute("SELECT to_regclass(%s)", (f'"{kind}"',)).fetchone()[0] is not None
+
+    # ---- public ----
+    def exists(self) -> bool:
+        """True when both tables are already there (incremental builds need them)."""
+        if not self.postgis:
+            return self._spatialite_has_tables(Path(self.target))
+        with self._connect() as con:
+            return all(self._pg_has_table(con, kind) for kind in self.LAYERS)
+
+    def write(self, df_W84: pd.DataFrame, crs):
+        """Replace both tables with df_W84 (WGS84 UTM markers), crs = table CRS."""
+        t0 = time.perf_counter()
+        counts = {}
+        if self.postgis:
+            with self._connect() as con:  # one transaction: readers never see half a load
+                for kind in self.LAYERS:
+                    counts[kind] = self._pg_layer(con, kind, df_W84, crs, create=True)
+                t1 = time.perf_counter()
+                for kind in self.LAYERS:
+                    self._pg_index(con, kind)
+                    con.execute(f'ANALYZE "{kind}"')
+                print(f"[DB] GiST / File indexes + ANALYZE: {time.perf_counter() - t1:.2f} s")
+        else:
+            path = Path(self.target)
+            with file_lock(path), atomic_path(path) as tmp:
+                for kind in self.LAYERS:
+                    counts[kind] = self._spatialite_layer(tmp, kind, df_W84, crs, append=False)
+                GPKGWriter._index_file_column(tmp)
+        dt = time.perf_counter() - t0
+        print(
+            f"[OK] Loaded {self.describe()} ({counts['marker']} markers, "
+            f"{counts['parcel']} parcels) in {dt:.2f} s, "
+            f"{sum(counts.values()) / dt if dt > 0 else 0:.0f} rows/s"
+        )
+
+    def upsert(self, df_W84: pd.DataFrame, crs, delete_files=()):
+        """
+        Delete every row whose File is in df_W84 or delete_files, then
+        append df_W84. Missing tables are created (with indexes) first.
+        """
+        t0 = time.perf_counter()
+        files = sorted(set(df_W84["File"].astype(str)) | {str(f) for f in delete_files})
+        counts = {kind: 0 for kind in self.LAYERS}
+        if self.postgis:
+            with self._connect() as con:
+                if self._pg_has_table(con, "parcel"):  # keep the SRID the tables have
+                    srid = con.execute(
+                        "SELECT Find_SRID(current_schema()::text, 'parcel', 'geom')"
+                    ).fetchone()[0]
+                    crs = CRS.from_epsg(srid)
+                for kind in self.LAYERS:
+                    create = not self._pg_has_table(con, kind)
+                    if not create:
+                        con.execute(f'DELETE FROM "{kind}" WHERE "File" = ANY(%s)', (files,))
+                    counts[kind] = self._pg_layer(con, kind, df_W84, crs, create=create)
+                    if create and counts[kind]:
+                        self._pg_index(con, kind)
+        else:
+            path = Path(self.target)
+            if not self._spatialite_has_tables(path):
+                return self.write(df_W84, crs)
+            import shutil
+
+            import pyogrio
+
+            # keep the CRS the tables were created with; like
+            # GPKGWriter.update_gpkg_bulk, edit a copy that replaces the file
+            crs = CRS.from_user_input(pyogrio.read_info(path, layer="parcel")["crs"])
+            with file_lock(path), atomic_path(path) as tmp:
+                shutil.copyfile(path, tmp)
+                con = sqlite3.connect(tmp)
+                try:
+                    with con:  # the R-tree delete triggers are plain SQL
+                        for kind in self.LAYERS:
+                            con.executemany(
+                                f'DELETE FROM "{kind}" WHERE File = ?', [(f,) for f in files]
+                            )
+                finally:
+                    con.close()
+                for kind in self.LAYERS:
+                    counts[kind] = self._spatialite_layer(tmp, kind, df_W84, crs, append=True)
+        print(
+            f"[OK] Upserted {self.describe()} (-{len(files)} files, "
+            f"+{counts['marker']} markers, +{counts['parcel']} parcels) "
+            f"in {time.perf_counter() - t0:.2f} s"
+        )
+
+
+# =========================================
+# Spatial index + batch point / bbox queries
+# =========================================
+
+class ParcelIndex:
+    """
+    STRtree over parcel polygons in geographic WGS84 (LON/LAT), so parcels
+    from both UTM zones live in one index. Query coordinates in any CRS
+    are transformed to LON/LAT in one vectorized call first.
+    """
+
+    def __init__(self, gdf_parcel: gpd.GeoDataFrame, crs_factory: CRSFactory):
+        self.gdf = gdf_parcel.reset_index(drop=True)
+        self.files = self.gdf["File"].to_numpy(dtype=object)
+        self.crs_factory = crs_factory
+        self.tree = shapely.STRtree(self.gdf.geometry.values)
+
+    @classmethod
+    def from_markers(cls, df_LL_W84: pd.DataFrame, crs_factory: CRSFactory):
+        gdf = ParcelBuilder.parcels(
+            df_LL_W84, crs_factory.crs_wgs84, x="LON", y="LAT"
+        )
+        return cls(gdf, crs_factory)
+
+    def to_lonlat(self, x, y, epsg: int):
+        x = np.asarray(x, dtype="float64")
+        y = np.asarray(y, dtype="float64")
+        if epsg == 4326:
+            return x, y
+        transformer = self.crs_factory.get_transformer_to_wgs84(epsg)
+        return transformer.transform(x, y)
+
+    def query_points(self, x, y, epsg: int = 4326):
+        """Return (query position, File) arrays for every containing parcel."""
+        lon, lat = self.to_lonlat(x, y, epsg)
+        q, p = self.tree.query(shapely.points(lon, lat), predicate="intersects")
+        return q, self.files[p]
+
+    def query_boxes(self, minx, miny, maxx, maxy, epsg: int = 4326):
+        """Return (query position, File) arrays for every intersecting parcel."""
+        minx, miny, maxx, maxy = (np.asarray(v, dtype="float64") for v in (minx, miny, maxx, maxy))
+        # transform all four corners, take the envelope in LON/LAT
+        cx = np.concatenate([minx, maxx, maxx, minx])
+        cy = np.concatenate([miny, miny, maxy, maxy])
+        lon, lat = (v.reshape(4, -1) for v in self.to_lonlat(cx, cy, epsg))
+        boxes = shapely.box(lon.min(0), lat.min(0), lon.max(0), lat.max(0))
+        q, p = self.tree.query(boxes, predicate="intersects")
+        return q, self.files[p]
+
+
+class ParcelQuery:
+    """Batch queries from a CSV of points (id,x,y) or boxes (id,minx,miny,maxx,maxy)."""
+
+    def __init__(self, index: ParcelIndex):
+        self.index = index
+
+    def run(self, csv_path: Path, kind: str, epsg: int, out_path: Path | None):
+        qdf = pd.read_csv(csv_path)
+        ids = qdf["id"].to_numpy() if "id" in qdf.columns else np.arange(len(qdf))
+
+        t0 = time.perf_counter()
+        if kind == "points":
+            q, files = self.index.query_points(qdf["x"], qdf["y"], epsg)
+        else:
+            q, files = self.index.query_boxes(
+                qdf["minx"], qdf["miny"], qdf["maxx"], qdf["maxy"], epsg
+            )
+        dt = time.perf_counter() - t0
+
+        hits = pd.DataFrame({"id": ids[q], "File": files})
+        # keep queries without a hit as File = "" (one row each)
+        missed = np.setdiff1d(np.arange(len(qdf)), q)
+        if len(missed):
+            hits = pd.concat(
+                [hits, pd.DataFrame({"id": ids[missed], "File": ""})],
+                ignore_index=True,
+            )
+
+        rate = len(qdf) / dt if dt > 0 else float("inf")
+        print(
+            f"[QUERY] {len(qdf)} {kind} → {len(q)} hits, {len(missed)} without parcel; "
+            f"{dt * 1000:.1f} ms ({rate:,.0f} queries/s)"
+        )
+        if out_path is None:
+            print(hits.to_string(index=False))
+        else:
+            atomic_write_text(out_path, hits.to_csv(index=False))
+            print(f"[OK] Query result → {out_path}")
+        return hits
+
+
+# =========================================
+# Local GeoJSON feature server
+# =========================================
+
+class FeatureServer:
+    """
+    Read-only GeoJSON feature server over the in-memory cadastre (OGC API
+    Features style paths, stdlib http.server, one thread per request):
+
+      GET /                                   service description
+      GET /collections                        parcels, markers
+      GET /collections/<name>/items?...       FeatureCollection (streamed)
+
+    Query parameters:
+      bbox=minx,miny,maxx,maxy   viewport; parcels via the ParcelIndex
+                                 STRtree, markers via a LON/LAT mask
+      bbox-crs=EPSG              CRS of bbox (default 4326 lon/lat)
+      crs=EPSG                   output CRS: 4326, 32647/32648, 24047/24048
+      limit / offset             pagination (numberMatched + "next" link)
+      <property>=value           attribute filter, e.g. File=p08, EPSG=24047
+                                 (comma list = any of)
+
+    Everything is loaded once at start-up; a request only queries the
+    tree, transforms the page's coordinates and runs shapely.to_geojson on
+    that page. pyproj transformers are per thread (CRSFactory.get_transformer).
+    """
+
+    DEFAULT_LIMIT = 1000
+    MAX_LIMIT = 10000
+    CHUNK_FEATURES = 500
+
+    def __init__(
+        self,
+        index: ParcelIndex,
+        df_LL_W84: pd.DataFrame,
+        crs_factory: CRSFactory,
+        metrics: pd.DataFrame | None = None,
+    ):
+        self.crs_factory = crs_factory
+
+        gdf = index.gdf
+        if metrics is not None:
+            gdf = GPKGWriter.with_metrics(gdf, metrics)
+        self.index = index
+        self.collections = {
+            "parcels": {
+                "props": pd.DataFrame(gdf.drop(columns=gdf.geometry.name)),
+                "geoms": np.asarray(gdf.geometry.values),
+            },
+            "markers": {
+                "props": pd.DataFrame(
+                    {
+                        "File": df_LL_W84["File"].astype(str).to_numpy(dtype=object),
+                        "idx": df_LL_W84["idx"].to_numpy(dtype="int64"),
+                        "code": df_LL_W84["code"].astype(str).to_numpy(dtype=object),
+                        "MARKER": df_LL_W84["MARKER"].astype(str).to_numpy(dtype=object),
+                        "EPSG": df_LL_W84["EPSG"].to_numpy(dtype="int64"),
+                    }
+                ),
+                "lon": df_LL_W84["LON"].to_numpy(dtype="float64"),
+                "lat": df_LL_W84["LAT"].to_numpy(dtype="float64"),
+            },
+        }
+
+    # ---- helpers ----
+    def _transformer(self, src: int, dst: int) -> Transformer:
+        return self.crs_factory.get_transformer(src, dst)
+
+    @staticmethod
+    def _epsg(value: str | None, default: int = 4326) -> int:
+        """'32647', 'EPSG:32647' or an OGC CRS URI → int ('CRS84' = 4326)."""
+        if not value:
+            return default
+        value = value.strip().rstrip("/")
+        if value.upper().endswith("CRS84"):
+            return 4326
+        tail = value.replace(":", "/").split("/")[-1]
+        try:
+            return int(tail)
+        except ValueError:
+            raise ValueError(f"unknown CRS: {value!r}")
+
+    def _bbox_lonlat(self, bbox: str, epsg: int):
+        try:
+            minx, miny, maxx, maxy = (float(v) for v in bbox.split(","))
+        except ValueError:
+            raise ValueError("bbox must be minx,miny,maxx,maxy")
+        if epsg == 4326:
+            return minx, miny, maxx, maxy
+        # envelope of the four transformed corners
+        lon, lat = self._transformer(epsg, 4326).transform(
+            [minx, maxx, maxx, minx], [miny, miny, maxy, maxy]
+        )
+        return min(lon), min(lat), max(lon), max(lat)
+
+    def search(self, name: str, params: dict):
+        """Matching row positions (ascending) of a collection."""
+        coll = self.collections[name]
+        if "bbox" in params:
+            minx, miny, maxx, maxy = self._bbox_lonlat(
+                params["bbox"], self._epsg(params.get("bbox-crs"))
+            )
+            if name == "parcels":
+                idx = np.sort(
+                    self.index.tree.query(
+                        shapely.box(minx, miny, maxx, maxy), predicate="intersects"
+                    )
+                )
+            else:
+                lon, lat = coll["lon"], coll["lat"]
+                idx = np.flatnonzero(
+                    (lon >= minx) & (lon <= maxx) & (lat >= miny) & (lat <= maxy)
+                )
+        else:
+            idx = np.arange(len(coll["props"]))
+
+        props = coll["props"]
+        for key, value in params.items():
+            if key in props.columns:
+                col = props[key].to_numpy()[idx]
+                wanted = value.split(",")
+                idx = idx[np.isin(col.astype(str), wanted)]
+            elif key not in ("bbox", "bbox-crs", "crs", "limit", "offset", "f"):
+                raise ValueError(f"unknown parameter or property: {key!r}")
+        return idx
+
+    def features(self, name: str, idx: np.ndarray, epsg: int):
+        """Yield GeoJSON Feature strings for rows idx in output CRS epsg."""
+        coll = self.collections[name]
+        if name == "parcels":
+            geoms = coll["geoms"][idx]
+            if epsg != 4326:
+                tr = self._transformer(4326, epsg)
+                geoms = shapely.transform(
+                    geoms, lambda xy: np.column_stack(tr.transform(xy[:, 0], xy[:, 1]))
+                )
+            gj = shapely.to_geojson(geoms)
+        else:
+            x, y = coll["lon"][idx], coll["lat"][idx]
+            if epsg != 4326:
+                x, y = self._transformer(4326, epsg).transform(x, y)
+            gj = [
+                f'{{"type":"Point","coordinates":[{a!r},{b!r}]}}'
+                for a, b in zip(x.tolist(), y.tolist())
+            ]
+        props = coll["props"].iloc[idx].to_dict("records")
+        for i, g, p in zip(idx.tolist(), gj, props):
+            p = json.dumps(p, ensure_ascii=False)
+            yield f'{{"type":"Feature","id":{i},"geometry":{g},"properties":{p}}}'
+
+    # ---- HTTP ----
+    def make_handler(self):
+        from http.server import BaseHTTPRequestHandler
+        from urllib.parse import parse_qsl, urlencode, urlsplit
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_request(self, code="-", size="-"):  # [QUERY] lines instead
+                pass
+
+            def log_message(self, fmt, *args):
+                print(f"[HTTP] {self.address_string()} {fmt % args}")
+
+            def _send_json(self, status: int, obj):
+                body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _chunk(self, text: str):
+                data = text.encode("utf-8")
+                if data:
+                    self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                parts = [p for p in url.path.split("/") if p]
+                params = dict(parse_qsl(url.query))
+                base = f"http://{self.headers.get('Host', 'localhost')}"
+
+                if not parts:
+                    return self._send_json(
+                        200,
+                        {
+                            "title": "RV25J cadastre feature server",
+                            "links": [{"rel": "data", "href": f"{base}/collections"}],
+                        },
+                    )
+                if parts == ["collections"]:
+                    return self._send_json(
+                        200,
+                        {
+                            "collections": [
+                                {
+                                    "id": name,
+                                    "itemCount": len(c["props"]),
+                                    "properties": list(c["props"].columns),
+                                    "links": [
+                                        {"rel": "items", "href": f"{base}/collections/{name}/items"}
+                                    ],
+                                }
+                                for name, c in server.collections.items()
+                            ]
+                        },
+                    )
+                if len(parts) != 3 or parts[0] != "collections" or parts[2] != "items":
+                    return self._send_json(404, {"error": f"not found: {url.path}"})
+                name = parts[1]
+                if name not in server.collections:
+                    return self._send_json(404, {"error": f"unknown collection: {name}"})
+
+                t0 = time.perf_counter()
+                try:
+                    epsg = server._epsg(params.get("crs"))
+                    limit = int(params.get("limit", server.DEFAULT_LIMIT))
+                    offset = int(params.get("offset", 0))
+                    if not 1 <= limit or offset < 0:
+                        raise ValueError("limit must be >= 1 and offset >= 0")
+                    limit = min(limit, server.MAX_LIMIT)
+                    idx = server.search(name, params)
+                    page = idx[offset : offset + limit]
+                    feats = server.features(name, page, epsg)
+                    first = next(feats, None)
+                except (ValueError, KeyError) as e:
+                    msg = e.args[0] if e.args else str(e)
+                    return self._send_json(400, {"error": str(msg)})
+                except Exception as e:  # pyproj errors for unsupported CRS etc.
+                    return self._send_json(400, {"error": f"{type(e).__name__}: {e}"})
+
+                links = [{"rel": "self", "href": f"{base}{self.path}"}]
+                if offset + limit < len(idx):
+                    nxt = dict(params, offset=str(offset + limit), limit=str(limit))
+                    links.append(
+                        {"rel": "next", "href": f"{base}{url.path}?{urlencode(nxt)}"}
+                    )
+                head = {
+                    "type": "FeatureCollection",
+                    "numberMatched": int(len(idx)),
+                    "numberReturned": int(len(page)),
+                    "crs": {"type": "name", "properties": {"name": f"EPSG:{epsg}"}},
+                    "links": links,
+                }
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/geo+json; charset=utf-8")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                self._chunk(json.dumps(head)[:-1] + ',"features":[')
+                batch = [first] if first is not None else []
+                sep = ""
+                for f in feats:
+                    batch.append(f)
+                    if len(batch) >= server.CHUNK_FEATURES:
+                        self._chunk(sep + ",".join(batch))
+                        batch, sep = [], ","
+                self._chunk((sep if batch else "") + ",".join(batch) + "]}")
+                self.wfile.write(b"0\r\n\r\n")
+                print(
+                    f"[QUERY] {name}: {len(idx)} matched, {len(page)} returned "
+                    f"(EPSG:{epsg}) in {1000 * (time.perf_counter() - t0):.1f} ms"
+                )
+
+        return Handler
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8075):
+        from http.server import ThreadingHTTPServer
+
+        httpd = ThreadingHTTPServer((host, port), self.make_handler())
+        httpd.daemon_threads = True
+        print(
+            f"[SERVE] {len(self.collections['parcels']['props'])} parcels, "
+            f"{len(self.collections['markers']['props'])} markers → "
+            f"http://{host}:{httpd.server_address[1]}/collections (Ctrl+C to stop)"
+        )
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n[INFO] Server stopped.")
+        finally:
+            httpd.server_close()
+
+
+# =========================================
+# KD-tree conflation of shared boundary markers
+# =========================================
+
+class MarkerConflator:
+    """
+    Snap markers of neighbouring parcels that lie within `tolerance` metres
+    of each other (WGS84 UTM) into one canonical marker.
+
+    - cKDTree.query_pairs + connected components → O(n log n), no pairwise
+      all-vs-all comparison; done per UTM zone.
+    - Conflicts reported:
+        code_mismatch    one canonical marker, different codes ("s20"/"520")
+        coord_mismatch   same code, different parcels, farther apart than
+                         `tolerance` but within `conflict_radius`
+                         (same physical marker, inconsistent coordinates)
+    """
+
+    def __init__(self, tolerance: float = 0.05, conflict_radius: float = 1.0):
+        self.tolerance = float(tolerance)
+        self.conflict_radius = max(float(conflict_radius), self.tolerance)
+
+    @staticmethod
+    def _norm_code(codes: pd.Series) -> np.ndarray:
+        return codes.astype(str).str.strip().str.lower().to_numpy(dtype=object)
+
+    def conflate(self, df_W84: pd.DataFrame):
+        """Return (df_canon, df_refs, df_conflicts)."""
+        try:
+            from scipy.sparse import coo_matrix
+            from scipy.sparse.csgraph import connected_components
+            from scipy.spatial import cKDTree
+        except ImportError:
+            raise SystemExit("[FATAL] --conflate needs scipy (pip install scipy)")
+
+        xy_all = df_W84[["EASTING", "NORTHING"]].to_numpy(dtype="float64")
+        epsg_all = df_W84["EPSG"].to_numpy()
+        code_all = self._norm_code(df_W84["code"])
+        file_all = df_W84["File"].to_numpy(dtype=object)
+
+        marker_id = np.empty(len(df_W84), dtype="int64")
+        conflicts = []
+        next_id = 0
+
+        for epsg in np.unique(epsg_all):
+            rows = np.flatnonzero(epsg_all == epsg)
+            xy = xy_all[rows]
+            tree = cKDTree(xy)
+
+            pairs = tree.query_pairs(self.tolerance, output_type="ndarray")
+            graph = coo_matrix(
+                (np.ones(len(pairs), dtype=bool), (pairs[:, 0], pairs[:, 1])),
+                shape=(len(rows), len(rows)),
+            )
+            n_comp, labels = connected_components(graph, directed=False)
+            marker_id[rows] = labels + next_id
+            next_id += n_comp
+
+            # same code, different parcel, near but not snapped
+            near = tree.query_pairs(self.conflict_radius, output_type="ndarray")
+            a, b = rows[near[:, 0]], rows[near[:, 1]]
+            keep = (
+                (code_all[a] == code_all[b])
+                & (file_all[a] != file_all[b])
+                & (marker_id[a] != marker_id[b])
+            )
+            a, b = a[keep], b[keep]
+            codes_raw = df_W84["code"].to_numpy(dtype=object)
+            dist = np.hypot(*(xy_all[a] - xy_all[b]).T)
+            for i, j, d in zip(a, b, dist):
+                conflicts.append(
+                    {
+                        "type": "coord_mismatch",
+                        "code": codes_raw[i],
+                        "Files": f"{file_all[i]};{file_all[j]}",
+                        "distance": float(d),
+                        "MARKER_ID": f"{marker_id[i]};{marker_id[j]}",
+                    }
+                )
+
+        work = pd.DataFrame(
+            {
+                "MARKER_ID": marker_id,
+                "EASTING": xy_all[:, 0],
+                "NORTHING": xy_all[:, 1],
+                "EPSG": epsg_all,
+                "code": df_W84["code"].astype(str).to_numpy(),
+                "code_norm": code_all,
+                "File": file_all,
+            }
+        )
+        grp = work.groupby("MARKER_ID", sort=True)
+        df_canon = grp.agg(
+            EASTING=("EASTING", "mean"),
+            NORTHING=("NORTHING", "mean"),
+            EPSG=("EPSG", "first"),
+            n_refs=("File", "size"),
+            n_parcels=("File", "nunique"),
+        )
+        # most frequent code per marker
+        top_code = (
+            work.groupby(["MARKER_ID", "code"], sort=True).size().rename("n").reset_index()
+            .sort_values(["MARKER_ID", "n", "code"], ascending=[True, False, True])
+            .drop_duplicates("MARKER_ID")
+        )
+        df_canon["code"] = top_code.set_index("MARKER_ID")["code"]
+
+        de = work["EASTING"].to_numpy() - df_canon["EASTING"].to_numpy()[marker_id]
+        dn = work["NORTHING"].to_numpy() - df_canon["NORTHING"].to_numpy()[marker_id]
+        work["spread"] = np.hypot(de, dn)
+        df_canon["spread"] = work.groupby("MARKER_ID")["spread"].max()
+
+        # join file / code lists only for markers that need them
+        def joined(col, ids):
+            sub = work.loc[work["MARKER_ID"].isin(ids), ["MARKER_ID", col]]
+            sub = sub.drop_duplicates().sort_values(["MARKER_ID", col])
+            if sub.empty:  # no shared marker in the whole archive
+                return pd.Series([], index=pd.Index([], dtype="int64"), dtype=object)
+            mids = sub["MARKER_ID"].to_numpy()
+            vals = sub[col].astype(str).tolist()
+            starts = np.flatnonzero(np.r_[True, mids[1:] != mids[:-1]])
+            ends = np.r_[starts[1:], len(mids)]
+            return pd.Series(
+                [";".join(vals[s:e]) for s, e in zip(starts, ends)], index=mids[starts]
+            )
+
+        shared_ids = df_canon.index[df_canon["n_parcels"] > 1]
+        df_canon["Files"] = work.groupby("MARKER_ID")["File"].first()
+        df_canon.loc[shared_ids, "Files"] = joined("File", shared_ids)
+        df_canon = df_canon.reset_index()[
+            ["MARKER_ID", "EASTING", "NORTHING", "EPSG", "code",
+             "n_refs", "n_parcels", "Files", "spread"]
+        ]
+
+        # one canonical marker, several codes
+        n_codes = grp["code_norm"].nunique()
+        bad_ids = n_codes.index[n_codes > 1]
+        if len(bad_ids):
+            mism = pd.DataFrame(
+                {
+                    "type": "code_mismatch",
+                    "code": joined("code", bad_ids),
+                    "Files": joined("File", bad_ids),
+                    "distance": df_canon["spread"].to_numpy()[bad_ids],
+                    "MARKER_ID": bad_ids.astype(str),
+                }
+            )
+            conflicts.extend(mism.to_dict("records"))
+
+        df_refs = pd.DataFrame(
+            {
+                "File": file_all,
+                "idx": df_W84["idx"].to_numpy(),
+                "code": df_W84["code"].to_numpy(),
+                "MARKER": df_W84["MARKER"].to_numpy(),
+                "MARKER_ID": marker_id,
+                "dE": de,
+                "dN": dn,
+            }
+        )
+        df_conflicts = pd.DataFrame(
+            conflicts, columns=["type", "code", "Files", "distance", "MARKER_ID"]
+        ).sort_values("distance", ascending=False, ignore_index=True)
+        return df_canon, df_refs, df_conflicts
+
+    def run(self, df_W84: pd.DataFrame, folder: Path, prefix: str):
+        t0 = time.perf_counter()
+        df_canon, df_refs, df_conflicts = self.conflate(df_W84)
+        shared = int((df_canon["n_parcels"] > 1).sum())
+        print(
+            f"[CONFLATE] {len(df_W84)} markers → {len(df_canon)} canonical "
+            f"({shared} shared by >1 parcel), {len(df_conflicts)} conflicts; "
+            f"tol={self.tolerance} m, {time.perf_counter() - t0:.2f} s"
+        )
+        for name, df in (
+            ("markers_conflated", df_canon),
+            ("marker_refs", df_refs),
+            ("marker_conflicts", df_conflicts),
+        ):
+            path = folder / f"{prefix}_{name}.csv"
+            atomic_write_text(path, df.to_csv(index=False))
+            print(f"[OK] Wrote CSV → {path}")
+        return df_canon, df_refs, df_conflicts
+
+
+# =========================================
+# Topology QA: overlaps and gaps between neighbouring parcels
+# =========================================
+
+class TopologyQA:
+    """
+    Find overlaps and slivers between neighbouring parcels (WGS84 UTM).
+
+    - Candidate pairs: STRtree query with predicate "dwithin" (gap_width),
+      so only neighbours are ever compared.
+    - overlap : area(A ∩ B) > min_area
+    - gap     : closing(A ∪ B, gap_width) − (A ∪ B), keeping only pieces
+                touching both A and B, area > min_area
+    - invalid : parcel ring is not a valid polygon (self-intersection from
+                bad OCR coordinates); repaired with make_valid for the
+                overlap/gap computation
+    All geometry operations run as vectorized shapely calls over pairs.
+    """
+
+    COLUMNS = ["type", "File_a", "File_b", "area", "EPSG"]
+
+    def __init__(self, min_area: float = 1.0, gap_width: float = 0.5):
+        self.min_area = float(min_area)
+        self.gap_width = float(gap_width)
+
+    def _check_zone(self, gdf: gpd.GeoDataFrame, epsg: int):
+        geoms = gdf.geometry.values
+        files = gdf["File"].to_numpy(dtype=object)
+        out = []
+
+        invalid = ~shapely.is_valid(geoms)
+        if invalid.any():
+            out.append(
+                gpd.GeoDataFrame(
+                    {
+                        "type": "invalid",
+                        "File_a": files[invalid],
+                        "File_b": "",
+                        "area": shapely.area(geoms[invalid]),
+                        "EPSG": epsg,
+                    },
+                    geometry=geoms[invalid],
+                )
+            )
+            geoms = shapely.make_valid(geoms)
+
+        tree = shapely.STRtree(geoms)
+        a, b = tree.query(geoms, predicate="dwithin", distance=self.gap_width)
+        keep = a < b
+        a, b = a[keep], b[keep]
+        if not len(a):
+            return out
+
+        # ---- overlaps ----
+        inter = shapely.intersection(geoms[a], geoms[b])
+        inter_area = shapely.area(inter)
+        m = inter_area > self.min_area
+        out.append(
+            gpd.GeoDataFrame(
+                {
+                    "type": "overlap",
+                    "File_a": files[a[m]],
+                    "File_b": files[b[m]],
+                    "area": inter_area[m],
+                    "EPSG": epsg,
+                },
+                geometry=inter[m],
+            )
+        )
+
+        # ---- gaps (slivers narrower than gap_width) ----
+        half = self.gap_width / 2
+        union = shapely.union(geoms[a], geoms[b])
+        closed = shapely.buffer(
+            shapely.buffer(union, half, join_style="mitre"), -half, join_style="mitre"
+        )
+        gap = shapely.difference(closed, union)
+        parts, pair_idx = shapely.get_parts(gap, return_index=True)
+        eps = 1e-6 + half
+        touches_both = shapely.dwithin(parts, geoms[a[pair_idx]], eps) & shapely.dwithin(
+            parts, geoms[b[pair_idx]], eps
+        )
+        parts, pair_idx = parts[touches_both], pair_idx[touches_both]
+        if len(parts):
+            gaps = gpd.GeoDataFrame({"pair": pair_idx}, geometry=parts)
+            gaps = gaps.dissolve(by="pair")
+            gap_area = shapely.area(gaps.geometry.values)
+            m = gap_area > self.min_area
+            pair = gaps.index.to_numpy()[m]
+            out.append(
+                gpd.GeoDataFrame(
+                    {
+                        "type": "gap",
+                        "File_a": files[a[pair]],
+                        "File_b": files[b[pair]],
+                        "area": gap_area[m],
+                        "EPSG": epsg,
+                    },
+                    geometry=gaps.geometry.values[m],
+                )
+            )
+        return out
+
+    def check(self, df_W84: pd.DataFrame) -> gpd.GeoDataFrame:
+        frames = []
+        for epsg, df_zone in df_W84.groupby("EPSG"):
+            gdf = ParcelBuilder.parcels(df_zone, CRS.from_epsg(int(epsg)))
+            frames += self._check_zone(gdf, int(epsg))
+
+        frames = [f for f in frames if len(f)]
+        if not frames:
+            return gpd.GeoDataFrame(columns=self.COLUMNS, geometry=[])
+        qa = pd.concat(frames, ignore_index=True)
+        return qa.sort_values("area", ascending=False, ignore_index=True)
+
+    def run(self, df_W84: pd.DataFrame, folder: Path, prefix: str):
+        t0 = time.perf_counter()
+        qa = self.check(df_W84)
+        counts = qa["type"].value_counts().to_dict() if len(qa) else {}
+        print(
+            f"[QA] {df_W84['File'].nunique()} parcels → {len(qa)} issues {counts} "
+            f"(min_area={self.min_area} m², gap<{self.gap_width} m) "
+            f"in {time.perf_counter() - t0:.2f} s"
+        )
+
+        csv_path = folder / f"{prefix}_topology_qa.csv"
+        atomic_write_text(csv_path, pd.DataFrame(qa[self.COLUMNS]).to_csv(index=False))
+        print(f"[OK] QA report → {csv_path}")
+
+        gpkg_path = folder / f"{prefix}_QA.gpkg"
+        if not len(qa):
+            # no issues: drop the previous run's layer, it would contradict the CSV
+            with file_lock(gpkg_path):
+                if gpkg_path.exists():
+                    gpkg_path.unlink()
+                    print(f"[OK] No QA issues → removed stale {gpkg_path}")
+        else:
+            epsg_mode = int(df_W84["EPSG"].mode()[0])
+            qa = qa.set_crs(epsg_mode, allow_override=True)
+            with file_lock(gpkg_path), atomic_path(gpkg_path) as tmp_path:
+                qa.to_file(tmp_path, layer="topology_qa", driver="GPKG", engine="pyogrio")
+            print(f"[OK] QA layer → {gpkg_path}")
+        return qa
+
+
+# =========================================
+# Vector tiles (MVT → MBTiles / PMTiles)
+# =========================================
+
+WEB_MERCATOR_HALF = 20037508.342789244  # half the EPSG:3857 world width (m)
+
+
+def _varint(v: int) -> bytes:
+    out = bytearray()
+    while v > 0x7F:
+        out.append((v & 0x7F) | 0x80)
+        v >>= 7
+    out.append(v)
+    return bytes(out)
+
+
+def _varints(values):
+    """Vectorized protobuf varints: (concatenated bytes, bytes per value)."""
+    v = np.asarray(values, dtype="uint64")
+    nbytes = np.ones(len(v), dtype="int64")
+    for k in range(1, 10):
+        nbytes += v >= np.uint64(1 << (7 * k))
+    pos = np.arange(nbytes.sum()) - np.repeat(np.cumsum(nbytes) - nbytes, nbytes)
+    b = (np.repeat(v, nbytes) >> (7 * pos).astype("uint64")) & np.uint64(0x7F)
+    more = pos < np.repeat(nbytes, nbytes) - 1
+    return (b | (more.astype("uint64") << np.uint64(7))).astype("uint8").tobytes(), nbytes
+
+
+def _zigzag(v):
+    return (v << 1) ^ (v >> 63)
+
+
+class MVTEncoder:
+    """
+    Minimal Mapbox Vector Tile 2.1 protobuf encoder: POINT / POLYGON
+    features with string / number attributes — what the cadastre needs,
+    without a protobuf dependency. Coordinates are integer tile pixels
+    (0..EXTENT, y down); geometry command streams are built for all
+    features of a tile at once (NumPy), only the feature records loop.
+    """
+
+    EXTENT = 4096
+    POINT, POLYGON = 1, 3
+    MOVE_TO, LINE_TO, CLOSE_PATH = 1, 2, 7
+
+    @staticmethod
+    def _bytes_field(num: int, payload: bytes) -> bytes:
+        return _varint((num << 3) | 2) + _varint(len(payload)) + payload
+
+    @staticmethod
+    def _uint_field(num: int, v: int) -> bytes:
+        return _varint(num << 3) + _varint(v)
+
+    @classmethod
+    def _value(cls, v) -> bytes:
+        if isinstance(v, str):
+            return cls._bytes_field(1, v.encode("utf-8"))
+        if isinstance(v, (bool, np.bool_)):
+            return cls._uint_field(7, int(v))
+        if isinstance(v, (int, np.integer)):
+            v = int(v)
+            return cls._uint_field(5, v) if v >= 0 else cls._uint_field(6, _zigzag(v))
+        return _varint((3 << 3) | 1) + struct.pack("<d", float(v))
+
+    @staticmethod
+    def _split(cmds: np.ndarray, counts: np.ndarray):
+        """Varint-encode one command stream, cut it into per-feature byte strings."""
+        data, nbytes = _varints(cmds)
+        ends = np.cumsum(np.add.reduceat(nbytes, np.cumsum(counts) - counts)) if len(counts) else []
+        starts = np.concatenate([[0], ends[:-1]]) if len(counts) else []
+        return [data[a:b] for a, b in zip(starts, ends)]
+
+    @classmethod
+    def point_geometries(cls, px: np.ndarray, py: np.ndarray):
+        """One MoveTo per point → list of packed geometry byte strings."""
+        cmds = np.column_stack(
+            [np.full(len(px), (1 << 3) | cls.MOVE_TO), _zigzag(px), _zigzag(py)]
+        ).ravel()
+        return cls._split(cmds, np.full(len(px), 3))
+
+    @classmethod
+    def polygon_geometries(cls, px: np.ndarray, ring: np.ndarray, ring_feat: np.ndarray):
+        """
+        px: (n, 2) int64 open ring vertices (no closing point), grouped by
+        ring id `ring` (0..R-1, ascending), already oriented; ring_feat:
+        feature of each ring (ascending). Returns one packed byte string
+        per feature (a multi-ring POLYGON each).
+        """
+        n_rings = len(ring_feat)
+        m = np.bincount(ring, minlength=n_rings)
+        first = np.cumsum(m) - m
+        pos = np.arange(len(px)) - first[ring]
+
+        # cursor deltas; the cursor restarts at (0, 0) for every feature
+        d = np.diff(px, axis=0, prepend=np.zeros((1, 2), dtype="int64"))
+        feat_pt = ring_feat[ring]
+        feat_start = np.ones(len(px), dtype=bool)
+        feat_start[1:] = feat_pt[1:] != feat_pt[:-1]
+        d[feat_start] = px[feat_start]
+        d = _zigzag(d)
+
+        # per ring: MoveTo dx dy, LineTo(m-1), 2(m-1) deltas, ClosePath
+        size = 2 * m + 3
+        r0 = np.cumsum(size) - size
+        cmds = np.empty(size.sum(), dtype="int64")
+        cmds[r0] = (1 << 3) | cls.MOVE_TO
+        cmds[r0 + 3] = ((m - 1) << 3) | cls.LINE_TO
+        cmds[r0 + size - 1] = (1 << 3) | cls.CLOSE_PATH
+        dest = r0[ring] + 2 + 2 * pos - (pos == 0)
+        cmds[dest] = d[:, 0]
+        cmds[dest + 1] = d[:, 1]
+
+        counts = np.bincount(ring_feat, weights=size).astype("int64")
+        return cls._split(cmds, counts[counts > 0])
+
+    @classmethod
+    def layer(cls, name: str, features) -> bytes:
+        """features: iterable of (geom_type, packed geometry bytes, properties dict)."""
+        keys, values = {}, {}
+        body = bytearray()
+        for geom_type, geometry, props in features:
+            tags = bytearray()
+            for k, v in props.items():
+                tags += _varint(keys.setdefault(k, len(keys)))
+                tags += _varint(values.setdefault((type(v), v), len(values)))
+            feature = (
+                cls._bytes_field(2, bytes(tags))
+                + cls._uint_field(3, geom_type)
+                + cls._bytes_field(4, geometry)
+            )
+            body += cls._bytes_field(2, feature)
+        out = cls._uint_field(15, 2) + cls._bytes_field(1, name.encode("utf-8")) + body
+        out += b"".join(cls._bytes_field(3, k.encode("utf-8")) for k in keys)
+        out += b"".join(cls._bytes_field(4, cls._value(v)) for _, v in values)
+        out += cls._uint_field(5, cls.EXTENT)
+        return cls._bytes_field(3, out)  # Tile.layers
+
+
+def _tile_rings(geoms, minx, maxy, scale):
+    """
+    (Multi)polygons in EPSG:3857 → tile-pixel rings for MVTEncoder:
+    (px, ring id, feature of each ring). Consecutive duplicate pixels are
+    removed, rings that collapse (< 3 vertices / zero area) dropped — with
+    their holes when it is the exterior — and rings oriented exterior
+    clockwise / holes counter-clockwise (y down).
+    """
+    parts, part_feat = shapely.get_parts(geoms, return_index=True)
+    poly = shapely.get_type_id(parts) == 3
+    parts, part_feat = parts[poly], part_feat[poly]
+    rings, ring_part = shapely.get_rings(parts, return_index=True)
+    xy, ring = shapely.get_coordinates(rings, return_index=True)
+
+    px = np.empty(xy.shape, dtype="int64")
+    px[:, 0] = np.rint((xy[:, 0] - minx) * scale)
+    px[:, 1] = np.rint((maxy - xy[:, 1]) * scale)
+    keep = np.ones(len(px), dtype=bool)
+    keep[1:] = (ring[1:] != ring[:-1]) | np.any(px[1:] != px[:-1], axis=1)
+    px, ring = px[keep], ring[keep]
+
+    n = np.bincount(ring, minlength=len(rings))
+    same = ring[1:] == ring[:-1]
+    cross = px[:-1, 0] * px[1:, 1] - px[1:, 0] * px[:-1, 1]
+    area2 = np.bincount(ring[:-1][same], weights=cross[same], minlength=len(rings))
+    exterior = np.ones(len(rings), dtype=bool)
+    exterior[1:] = ring_part[1:] != ring_part[:-1]
+    ok = (n >= 4) & (area2 != 0)
+    ok &= ~np.isin(ring_part, ring_part[exterior & ~ok])
+    flip = (area2 > 0) != exterior
+
+    # keep ok rings, drop each closing vertex, reverse flipped rings
+    last = np.ones(len(ring), dtype=bool)
+    last[:-1] = ring[1:] != ring[:-1]
+    sel = ok[ring] & ~last
+    px, ring = px[sel], ring[sel]
+    m = np.bincount(ring, minlength=len(rings))
+    first = np.cumsum(m) - m
+    pos = np.arange(len(ring)) - first[ring]
+    order = np.where(flip[ring], first[ring] + m[ring] - 1 - pos, np.arange(len(ring)))
+    px = px[order]
+
+    kept = np.flatnonzero(ok)
+    ring = np.searchsorted(kept, ring)  # renumber 0..R-1
+    return px, ring, part_feat[ring_part[kept]]
+
+
+def _render_tile(job):
+    """
+    Worker: clip the parcels / markers assigned to one tile, encode the
+    "parcel" and "marker" layers and gzip them. Returns (z, x, y, bytes)
+    or None for an empty tile.
+    """
+    z, x, y, buffer, parcel_geoms, parcel_files, marker_xy, marker_props = job
+    size = 2 * WEB_MERCATOR_HALF / 2**z
+    minx = -WEB_MERCATOR_HALF + x * size
+    maxy = WEB_MERCATOR_HALF - y * size
+    scale = MVTEncoder.EXTENT / size
+    buf = buffer / scale
+
+    data = b""
+    if len(parcel_geoms):
+        clipped = shapely.clip_by_rect(
+            parcel_geoms, minx - buf, maxy - size - buf, minx + size + buf, maxy + buf
+        )
+        px, ring, ring_feat = _tile_rings(clipped, minx, maxy, scale)
+        if len(ring_feat):
+            feats = np.unique(ring_feat)
+            geometries = MVTEncoder.polygon_geometries(px, ring, ring_feat)
+            data += MVTEncoder.layer(
+                "parcel",
+                (
+                    (MVTEncoder.POLYGON, g, {"File": parcel_files[f]})
+                    for f, g in zip(feats.tolist(), geometries)
+                ),
+            )
+
+    if len(marker_xy):
+        px = np.rint((marker_xy[:, 0] - minx) * scale).astype("int64")
+        py = np.rint((maxy - marker_xy[:, 1]) * scale).astype("int64")
+        geometries = MVTEncoder.point_geometries(px, py)
+        data += MVTEncoder.layer(
+            "marker",
+            ((MVTEncoder.POINT, g, p) for g, p in zip(geometries, marker_props)),
+        )
+
+    if not data:
+        return None
+    return z, x, y, gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _render_tiles(jobs):
+    return [r for r in map(_render_tile, jobs) if r is not None]
+
+
+class _MBTilesSink:
+    """MBTiles 1.3 (sqlite, TMS rows, gzipped MVT tiles)."""
+
+    def __init__(self, path: Path):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(
+            "CREATE TABLE metadata (name TEXT, value TEXT);"
+            "CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, "
+            "tile_row INTEGER, tile_data BLOB);"
+        )
+        self.pending = []
+
+    def add(self, z: int, x: int, y: int, data: bytes):
+        self.pending.append((z, x, (1 << z) - 1 - y, data))
+        if len(self.pending) >= 1000:
+            self.conn.executemany("INSERT INTO tiles VALUES (?, ?, ?, ?)", self.pending)
+            self.pending = []
+
+    def close(self, meta: dict):
+        self.conn.executemany("INSERT INTO tiles VALUES (?, ?, ?, ?)", self.pending)
+        self.conn.execute(
+            "CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)"
+        )
+        (w, s, e, n), (clon, clat) = meta["bounds"], meta["center"]
+        rows = {
+            "name": meta["name"],
+            "format": "pbf",
+            "type": "overlay",
+            "version": "1",
+            "description": meta["description"],
+            "minzoom": str(meta["minzoom"]),
+            "maxzoom": str(meta["maxzoom"]),
+            "bounds": f"{w:.7f},{s:.7f},{e:.7f},{n:.7f}",
+            "center": f"{clon:.7f},{clat:.7f},{meta['minzoom']}",
+            "json": json.dumps({"vector_layers": meta["vector_layers"]}),
+        }
+        self.conn.executemany("INSERT INTO metadata VALUES (?, ?)", rows.items())
+        self.conn.commit()
+        self.conn.close()
+
+
+class _PMTilesSink:
+    """
+    PMTiles v3: tile data appended to a spool file, then header + gzipped
+    root / leaf directories + metadata + tile data (clustered, TileID order).
+    """
+
+    HEADER_LEN = 127
+    ROOT_MAX = 16384 - HEADER_LEN
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.spool = open(f"{path}.tiles", "w+b")
+        self.entries = []  # (tile_id, spool offset, length)
+        self.offset = 0
+
+    @staticmethod
+    def tile_id(z: int, x: int, y: int) -> int:
+        """Hilbert-curve TileID (PMTiles v3)."""
+        acc = ((1 << (2 * z)) - 1) // 3  # tiles in zooms 0..z-1
+        n = 1 << z
+        d = 0
+        s = n >> 1
+        while s > 0:
+            rx = 1 if x & s else 0
+            ry = 1 if y & s else 0
+            d += s * s * ((3 * rx) ^ ry)
+            if ry == 0:
+                if rx == 1:
+                    x, y = n - 1 - x, n - 1 - y
+                x, y = y, x
+            s >>= 1
+        return acc + d
+
+    def add(self, z: int, x: int, y: int, data: bytes):
+        self.spool.write(data)
+        self.entries.append((self.tile_id(z, x, y), self.offset, len(data)))
+        self.offset += len(data)
+
+    @staticmethod
+    def _directory(entries) -> bytes:
+        """entries: (tile_id, offset, length, run_length) sorted by tile_id."""
+        out = bytearray(_varint(len(entries)))
+        last = 0
+        for e in entries:
+            out += _varint(e[0] - last)
+            last = e[0]
+        for e in entries:
+            out += _varint(e[3])
+        for e in entries:
+            out += _varint(e[2])
+        for i, e in enumerate(entries):
+            prev = entries[i - 1] if i else None
+            out += _varint(0 if prev and e[1] == prev[1] + prev[2] else e[1] + 1)
+        return gzip.compress(bytes(out), mtime=0)
+
+    def _directories(self, entries):
+        root = self._directory(entries)
+        if len(root) <= self.ROOT_MAX:
+            return root, b""
+        leaf_size = 4096
+        while True:
+            leaves = bytearray()
+            root_entries = []
+            for i in range(0, len(entries), leaf_size):
+                leaf = self._directory(entries[i : i + leaf_size])
+                root_entries.append((entries[i][0], len(leaves), len(leaf), 0))
+                leaves += leaf
+            root = self._directory(root_entries)
+            if len(root) <= self.ROOT_MAX:
+                return root, bytes(leaves)
+            leaf_size *= 2
+
+    def close(self, meta: dict):
+        # rewrite the tile data clustered in TileID order
+        self.entries.sort()
+        entries = []
+        offset = 0
+        for tid, _, length in self.entries:
+            entries.append((tid, offset, length, 1))
+            offset += length
+        root, leaves = self._directories(entries)
+        metadata = gzip.compress(
+            json.dumps(
+                {
+                    "name": meta["name"],
+                    "description": meta["description"],
+                    "vector_layers": meta["vector_layers"],
+                }
+            ).encode("utf-8"),
+            mtime=0,
+        )
+
+        root_off = self.HEADER_LEN
+        meta_off = root_off + len(root)
+        leaf_off = meta_off + len(metadata)
+        data_off = leaf_off + len(leaves)
+        (w, s, e, n), (clon, clat) = meta["bounds"], meta["center"]
+        e7 = lambda v: int(round(v * 1e7))  # noqa: E731
+        header = struct.pack(
+            "<7sBQQQQQQQQQQQBBBBBBiiiiBii",
+            b"PMTiles", 3,
+            root_off, len(root), meta_off, len(metadata),
+            leaf_off, len(leaves), data_off, offset,
+            len(entries), len(entries), len(entries),
+            1,  # clustered
+            2, 2,  # internal / tile compression: gzip
+            1,  # tile type: MVT
+            meta["minzoom"], meta["maxzoom"],
+            e7(w), e7(s), e7(e), e7(n),
+            meta["minzoom"], e7(clon), e7(clat),
+        )
+        with open(self.path, "wb") as f:
+            f.write(header + root + metadata + leaves)
+            for tid, off, length in self.entries:
+                self.spool.seek(off)
+                f.write(self.spool.read(length))
+        self.spool.close()
+        os.remove(self.spool.name)
+
+
+class VectorTiler:
+    """
+    Parcels + markers of df_LL_W84 → gzipped Mapbox Vector Tiles in one
+    local archive (.mbtiles or .pmtiles, chosen by suffix) for web viewers.
+
+    - layer "parcel" (File) at every zoom, simplified to ~1 tile pixel below
+      maxzoom so low zooms stay small; layer "marker" (File, MARKER, code,
+      idx) from marker_minzoom up
+    - features are assigned to tiles from their EPSG:3857 bounds (+buffer)
+      vectorially; each tile is clipped / encoded in a process pool
+    """
+
+    SINKS = {".mbtiles": _MBTilesSink, ".pmtiles": _PMTilesSink}
+
+    def __init__(
+        self,
+        minzoom: int = 10,
+        maxzoom: int = 16,
+        marker_minzoom: int = 15,
+        workers: int | None = None,
+        buffer: int = 64,
+    ):
+        self.minzoom = minzoom
+        self.maxzoom = maxzoom
+        self.marker_minzoom = marker_minzoom
+        self.workers = workers or os.cpu_count() or 1
+        self.buffer = buffer
+
+    @staticmethod
+    def _tile_pairs(bounds: np.ndarray, z: int, buf: float):
+        """(feature index, tile key x * 2^z + y) for every tile a box touches."""
+        n = 1 << z
+        size = 2 * WEB_MERCATOR_HALF / n
+        clip = lambda v: np.clip(np.floor(v).astype("int64"), 0, n - 1)  # noqa: E731
+        x0 = clip((bounds[:, 0] - buf + WEB_MERCATOR_HALF) / size)
+        x1 = clip((bounds[:, 2] + buf + WEB_MERCATOR_HALF) / size)
+        y0 = clip((WEB_MERCATOR_HALF - bounds[:, 3] - buf) / size)
+        y1 = clip((WEB_MERCATOR_HALF - bounds[:, 1] + buf) / size)
+        nx, ny = x1 - x0 + 1, y1 - y0 + 1
+        counts = nx * ny
+        feat = np.repeat(np.arange(len(bounds)), counts)
+        k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        tx = x0[feat] + k % nx[feat]
+        ty = y0[feat] + k // nx[feat]
+        key = tx * n + ty
+        order = np.argsort(key, kind="stable")
+        return feat[order], key[order]
+
+    def _jobs(self, z, geoms, files, marker_xy, marker_props):
+        n = 1 << z
+        size = 2 * WEB_MERCATOR_HALF / n
+        buf = self.buffer * size / MVTEncoder.EXTENT
+        if z < self.maxzoom:
+            geoms = shapely.simplify(geoms, size / MVTEncoder.EXTENT, preserve_topology=True)
+        p_feat, p_key = self._tile_pairs(shapely.bounds(geoms), z, buf)
+        if z >= self.marker_minzoom:
+            m_feat, m_key = self._tile_pairs(np.hstack([marker_xy, marker_xy]), z, buf)
+        else:
+            m_feat = m_key = np.empty(0, dtype="int64")
+
+        keys = np.union1d(p_key, m_key)
+        p_lo, p_hi = np.searchsorted(p_key, keys), np.searchsorted(p_key, keys, "right")
+        m_lo, m_hi = np.searchsorted(m_key, keys), np.searchsorted(m_key, keys, "right")
+        for key, a, b, c, d in zip(keys.tolist(), p_lo, p_hi, m_lo, m_hi):
+            pf, mf = p_feat[a:b], m_feat[c:d]
+            yield (
+                z, key // n, key % n, self.buffer,
+                geoms[pf], files[pf], marker_xy[mf], [marker_props[i] for i in mf],
+            )
+
+    def _render(self, batches):
+        """Render job batches in order; at most 2 x workers batches in flight."""
+        if self.workers == 1:
+            yield from map(_render_tiles, batches)
+            return
+        with ProcessPoolExecutor(self.workers) as pool:
+            pending = deque()
+            for batch in batches:
+                pending.append(pool.submit(_render_tiles, batch))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def run(self, df_LL_W84: pd.DataFrame, out_path: Path):
+        sink_cls = self.SINKS.get(out_path.suffix.lower())
+        if sink_cls is None:
+            raise SystemExit(f"[ERROR] Tile archive must be .mbtiles or .pmtiles: {out_path}")
+        t0 = time.perf_counter()
+
+        to_3857 = Transformer.from_crs(4326, 3857, always_xy=True)
+        lon = df_LL_W84["LON"].to_numpy(dtype="float64")
+        lat = df_LL_W84["LAT"].to_numpy(dtype="float64")
+        mx, my = to_3857.transform(lon, lat)
+        df = CoordinateTransformer._with_columns(df_LL_W84, X=mx, Y=my)
+        gdf = ParcelBuilder.parcels(df, CRS.from_epsg(3857), x="X", y="Y")
+        geoms = np.asarray(gdf.geometry.values)
+        files = gdf["File"].to_numpy(dtype=object)
+
+        marker_xy = np.column_stack([mx, my])
+        marker_props = [
+            {"File": f, "MARKER": m, "code": c, "idx": int(i)}
+            for f, m, c, i in zip(
+                df_LL_W84["File"].astype(str),
+                df_LL_W84["MARKER"].astype(str),
+                df_LL_W84["code"].astype(str),
+                df_LL_W84["idx"],
+            )
+        ]
+
+        n_tiles = 0
+        zoom_counts = {}
+        with file_lock(out_path), atomic_path(out_path) as tmp_path:
+            sink = sink_cls(tmp_path)
+            jobs = (
+                job
+                for z in range(self.minzoom, self.maxzoom + 1)
+                for job in self._jobs(z, geoms, files, marker_xy, marker_props)
+            )
+            batches = iter(lambda: list(islice(jobs, 32)), [])
+            for tiles in self._render(batches):
+                for z, x, y, data in tiles:
+                    sink.add(z, x, y, data)
+                    n_tiles += 1
+                    zoom_counts[z] = zoom_counts.get(z, 0) + 1
+
+            w, s, e, n = lon.min(), lat.min(), lon.max(), lat.max()
+            fields = {"File": "String"}
+            sink.close(
+                {
+                    "name": out_path.stem,
+                    "description": "RV25J cadastre parcels / markers (WGS84)",
+                    "minzoom": self.minzoom,
+                    "maxzoom": self.maxzoom,
+                    "bounds": (w, s, e, n),
+                    "center": ((w + e) / 2, (s + n) / 2),
+                    "vector_layers": [
+                        {
+                            "id": "parcel",
+                            "fields": fields,
+                            "minzoom": self.minzoom,
+                            "maxzoom": self.maxzoom,
+                        },
+                        {
+                            "id": "marker",
+                            "fields": {**fields, "MARKER": "String", "code": "String", "idx": "Number"},
+                            "minzoom": max(self.minzoom, self.marker_minzoom),
+                            "maxzoom": self.maxzoom,
+                        },
+                    ],
+                }
+            )
+
+        print(
+            f"[TILES] {len(files)} parcels, {len(df_LL_W84)} markers → {n_tiles} tiles "
+            f"z{self.minzoom}-{self.maxzoom} {zoom_counts} ({self.workers} workers) "
+            f"in {time.perf_counter() - t0:.2f} s"
+        )
+        print(f"[OK] Vector tiles → {out_path}")
+        return n_tiles
+
+
+# =========================================
+# Whole-cadastre overview rendering
+# =========================================
+
+class CadastreRenderer:
+    """
+    Draw all parcels (+ markers) into one overview PNG (Cadastre_All.png).
+
+    - engine "mpl": one matplotlib PolyCollection + one scatter for the
+      whole map (axes, legend, labels); "pil": direct PIL rasteriser
+      (polygon fill per parcel, markers stamped with NumPy) for huge sets;
+      "auto" switches to pil above PIL_THRESHOLD parcels
+    - colour "source" (MAPL1 / MAPL1x TOML), "qa" (worst TopologyQA issue
+      a parcel takes part in) or "none"
+    - grid (cols, rows) > (1, 1): split the extent into tiles, each
+      rendered at full size → <stem>_r<row>_c<col>.png
+    Coordinates: WGS84 UTM zone of the most common parcel EPSG.
+    """
+
+    PIL_THRESHOLD = 20000
+    COLORS = {
+        "source": {"MAPL1": "#4c72b0", "MAPL1x": "#dd8452"},
+        "qa": {"ok": "#55a868", "gap": "#ccb974", "overlap": "#c44e52", "invalid": "#8172b2"},
+        "none": {"parcel": "#9fb7cf"},
+    }
+    QA_RANK = ("ok", "gap", "overlap", "invalid")  # worst last
+    EDGE = "#2f3b4c"
+    MARKER = "#d62728"
+
+    def __init__(
+        self,
+        size: int = 4000,
+        color: str = "source",
+        labels: bool = False,
+        markers: bool = True,
+        engine: str = "auto",
+        grid=(1, 1),
+    ):
+        self.size = size
+        self.color = color
+        self.labels = labels
+        self.markers = markers
+        self.engine = engine
+        self.grid = grid
+
+    @classmethod
+    def qa_status(cls, qa: pd.DataFrame, files) -> np.ndarray:
+        """Worst QA issue type per File ("ok" when none)."""
+        rank = pd.Series(0, index=pd.Index(files), dtype="int64")
+        for t in ("gap", "overlap", "invalid"):
+            sub = qa[qa["type"] == t]
+            hit = pd.unique(np.concatenate([sub["File_a"], sub["File_b"]]).astype(str))
+            hit = rank.index.intersection(hit)
+            rank[hit] = np.maximum(rank[hit], cls.QA_RANK.index(t))
+        return np.asarray(cls.QA_RANK, dtype=object)[rank.to_numpy()]
+
+    @staticmethod
+    def _hex_rgb(color: str):
+        return tuple(int(color[i : i + 2], 16) for i in (1, 3, 5))
+
+    def _render_mpl(self, rings, classes, labels, mxy, bbox, out_path, title):
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import PolyCollection
+        from matplotlib.patches import Patch
+
+        minx, miny, maxx, maxy = bbox
+        w, h = maxx - minx, maxy - miny
+        dpi = 200
+        scale = self.size / dpi / max(w, h)
+        fig, ax = plt.subplots(figsize=(max(w * scale, 2), max(h * scale, 2)), dpi=dpi)
+        colors = self.COLORS[self.color]
+        coll = PolyCollection(
+            rings,
+            facecolors=[colors[c] for c in classes],
+            edgecolors=self.EDGE,
+            linewidths=0.2,
+            alpha=0.8,
+        )
+        ax.add_collection(coll)
+        if self.markers and len(mxy):
+            ax.scatter(mxy[:, 0], mxy[:, 1], s=2, c=self.MARKER, linewidths=0)
+        if labels is not None:
+            for (x, y), text in zip(labels[0], labels[1]):
+                ax.text(x, y, text, fontsize=5, ha="center", va="center", clip_on=True)
+
+        ax.set_xlim(minx, maxx)
+        ax.set_ylim(miny, maxy)
+        ax.set_aspect("equal", "box")
+        ax.grid(True, linestyle="--", linewidth=0.3)
+        ax.set_xlabel("EASTING (m)")
+        ax.set_ylabel("NORTHING (m)")
+        ax.set_title(title)
+        present = set(classes)
+        ax.legend(
+            handles=[Patch(color=c, label=k) for k, c in colors.items() if k in present],
+            loc="upper right",
+            fontsize=6,
+        )
+        plt.tight_layout()
+        with atomic_path(out_path) as tmp:
+            fig.savefig(tmp, dpi=dpi, format="png")
+        plt.close(fig)
+
+    def _render_pil(self, rings, classes, labels, mxy, bbox, out_path, title):
+        from PIL import Image, ImageDraw
+
+        minx, miny, maxx, maxy = bbox
+        scale = (self.size - 1) / max(maxx - minx, maxy - miny)
+        width = int((maxx - minx) * scale) + 1
+        height = int((maxy - miny) * scale) + 1
+        img = Image.new("RGB", (width, height), "white")
+        draw = ImageDraw.Draw(img)
+        fills = {k: self._hex_rgb(c) for k, c in self.COLORS[self.color].items()}
+        edge = self._hex_rgb(self.EDGE)
+        for ring, c in zip(rings, classes):
+            px = np.empty(ring.shape)
+            px[:, 0] = (ring[:, 0] - minx) * scale
+            px[:, 1] = (maxy - ring[:, 1]) * scale
+            draw.polygon(px.ravel().tolist(), fill=fills[c], outline=edge)
+
+        if self.markers and len(mxy):
+            arr = np.array(img)
+            mx = np.rint((mxy[:, 0] - minx) * scale).astype("int64")
+            my = np.rint((maxy - mxy[:, 1]) * scale).astype("int64")
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    x, y = mx + dx, my + dy
+                    ok = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+                    arr[y[ok], x[ok]] = self._hex_rgb(self.MARKER)
+            img = Image.fromarray(arr)
+            draw = ImageDraw.Draw(img)
+
+        if labels is not None:
+            for (x, y), text in zip(labels[0], labels[1]):
+                draw.text(((x - minx) * scale, (maxy - y) * scale), text, fill="black", anchor="mm")
+        draw.text((8, 8), title, fill="black")
+        with atomic_path(out_path) as tmp:
+            img.save(tmp, format="PNG", optimize=False)
+
+    def run(self, df_LL_W84: pd.DataFrame, classes_by_file: dict, out_path: Path):
+        t0 = time.perf_counter()
+        epsg_w84 = CRSFactory.w84_utm_epsg(int(df_LL_W84["EPSG"].mode()[0]))
+        to_utm = Transformer.from_crs(4326, epsg_w84, always_xy=True)
+        x, y = to_utm.transform(
+            df_LL_W84["LON"].to_numpy(dtype="float64"),
+            df_LL_W84["LAT"].to_numpy(dtype="float64"),
+        )
+        df = CoordinateTransformer._with_columns(df_LL_W84, X=x, Y=y)
+        gdf = ParcelBuilder.parcels(df, CRS.from_epsg(epsg_w84), x="X", y="Y")
+        geoms = np.asarray(gdf.geometry.values)
+        files = gdf["File"].to_numpy(dtype=object)
+        classes = np.array([classes_by_file.get(f, "parcel") for f in files], dtype=object)
+        mxy = np.column_stack([x, y])
+
+        engine = self.engine
+        if engine == "auto":
+            engine = "pil" if len(geoms) > self.PIL_THRESHOLD else "mpl"
+        render = self._render_pil if engine == "pil" else self._render_mpl
+
+        minx, miny, maxx, maxy = shapely.total_bounds(geoms)
+        pad = 0.02 * max(maxx - minx, maxy - miny, 1.0)
+        minx, miny, maxx, maxy = minx - pad, miny - pad, maxx + pad, maxy + pad
+        cols, rows = self.grid
+        tw, th = (maxx - minx) / cols, (maxy - miny) / rows
+        tree = shapely.STRtree(geoms)
+
+        outputs = []
+        for r in range(rows):
+            for c in range(cols):
+                bbox = (minx + c * tw, maxy - (r + 1) * th, minx + (c + 1) * tw, maxy - r * th)
+                idx = np.sort(tree.query(shapely.box(*bbox)))
+                if not len(idx):
+                    continue
+                xy, ring = shapely.get_coordinates(
+                    shapely.get_exterior_ring(geoms[idx]), return_index=True
+                )
+                rings = np.split(xy, np.flatnonzero(np.diff(ring)) + 1)
+                labels = None
+                if self.labels:
+                    pts = shapely.get_coordinates(shapely.point_on_surface(geoms[idx]))
+                    labels = (pts, [str(f) for f in files[idx]])
+                inside = (
+                    (mxy[:, 0] >= bbox[0]) & (mxy[:, 0] <= bbox[2])
+                    & (mxy[:, 1] >= bbox[1]) & (mxy[:, 1] <= bbox[3])
+                )
+                if (cols, rows) == (1, 1):
+                    path, title = out_path, out_path.stem
+                else:
+                    path = out_path.with_name(f"{out_path.stem}_r{r}_c{c}{out_path.suffix}")
+                    title = f"{out_path.stem} r{r} c{c}"
+                title += f" | {len(idx)} parcels, EPSG:{epsg_w84}, colour: {self.color}"
+                with file_lock(path):
+                    render(rings, classes[idx], labels, mxy[inside], bbox, path, title)
+                outputs.append(path)
+
+        print(
+            f"[RENDER] {len(geoms)} parcels, {len(mxy)} markers → {len(outputs)} PNG "
+            f"({engine}, {self.size}px, colour={self.color}) in {time.perf_counter() - t0:.2f} s"
+        )
+        for path in outputs:
+            print(f"[OK] Overview → {path}")
+        return outputs
+
+
+# =========================================
+# High-level Processor
+# =========================================
+
+class MarkerProcessor:
+    """
+    Orchestrates the whole flow:
+    - Load CONFIG.toml
+    - Load df_ID75 from folder
+    - Transform to df_LL_W84 and df_W84
+    - Optional CSV (df_ID75)
+    - Write GPKG (ID, WGS84, W84UTM)
+    - Optional streaming exports (GeoParquet / FlatGeobuf / CSV)
+    - Optional parcel metrics (CSV + parcel layer attributes)
+    - Optional bulk load into SpatiaLite / PostGIS (SpatialDBWriter)
+    - Optional change feed of incremental runs (ChangeFeed)
+    - Vector tile archive for web viewers (tiles subcommand)
+    - Overview PNG of all parcels (render subcommand)
+    - Local GeoJSON feature server (serve subcommand)
+    """
+
+    def __init__(
+        self,
+        folder: Path,
+        config_path: Path,
+        gpkg_prefix: str,
+        bulk: bool = False,
+        csv_path: Path | None = None,
+        export_formats=(),
+        export_batch: int = 5000,
+        conflate_tol: float | None = None,
+        conflict_radius: float = 1.0,
+        qa: bool = False,
+        qa_min_area: float = 1.0,
+        qa_gap: float = 0.5,
+        workers: int | None = None,
+        processes: bool = False,
+        use_store: bool = False,
+        chunk: int | None = None,
+        metrics: bool = False,
+        db: str | None = None,
+        db_upsert: bool = False,
+        changes: bool = False,
+    ):
+        self.folder = folder
+        self.config_path = config_path
         self.gpkg_prefix = gpkg_prefix
+        self.bulk = bulk
+        self.csv_path = csv_path
+        self.export_formats = list(export_formats)
+        self.export_batch = export_batch
+        self.conflate_tol = conflate_tol
+        self.conflict_radius = conflict_radius
+        self.qa = qa
+        self.qa_min_area = qa_min_area
+        self.qa_gap = qa_gap
+        self.workers = workers
+        self.processes = processes
+        self.use_store = use_store
+        self.chunk = chunk
+        self.metrics = metrics
+        self.db = db
+        self.db_upsert = db_upsert
+        self.changes = changes
 
         # Load config
         self.config = RV25JConfig.from_toml(config_path)
@@ -557,21 +3426,270 @@ class MarkerProcessor:
         # Setup CRS factory
         self.crs_factory = CRSFactory(self.config.towgs84)
 
+    def make_loader(self) -> MarkerLoader:
+        return MarkerLoader(
+            self.folder, self.config, self.workers, self.processes, self.use_store
+        )
+
+    def load_markers(self):
+        """Load df_ID75 and transform it: returns (df_ID75, df_LL_W84, df_W84)."""
+        df_ID75 = self.make_loader().load_df_id75()
+        transformer = CoordinateTransformer(self.crs_factory)
+        return (df_ID75, *transformer.to_wgs84_and_w84_utm(df_ID75))
+
+    def query(self, csv_path: Path, kind: str, epsg: int, out_path: Path | None):
+        t0 = time.perf_counter()
+        _, df_LL_W84, _ = self.load_markers()
+        index = ParcelIndex.from_markers(df_LL_W84, self.crs_factory)
+        print(
+            f"[INDEX] STRtree over {len(index.gdf)} parcels "
+            f"({time.perf_counter() - t0:.2f} s incl. loading)"
+        )
+        return ParcelQuery(index).run(csv_path, kind, epsg, out_path)
+
+    def serve(self, host: str, port: int):
+        df_ID75, df_LL_W84, df_W84 = self.load_markers()
+        t0 = time.perf_counter()
+        index = ParcelIndex.from_markers(df_LL_W84, self.crs_factory)
+        metrics = ParcelMetrics.compute(df_ID75, df_LL_W84, df_W84) if self.metrics else None
+        server = FeatureServer(index, df_LL_W84, self.crs_factory, metrics)
+        print(f"[INDEX] STRtree + GeoJSON properties in {time.perf_counter() - t0:.2f} s")
+        server.serve(host, port)
+
+    def tiles(self, out_path: Path, tiler: VectorTiler):
+        _, df_LL_W84, _ = self.load_markers()
+        return tiler.run(df_LL_W84, out_path)
+
+    def render(self, out_path: Path, renderer: CadastreRenderer):
+        loader = self.make_loader()
+        df_ID75 = loader.load_df_id75()
+        transformer = CoordinateTransformer(self.crs_factory)
+        df_LL_W84, df_W84 = transformer.to_wgs84_and_w84_utm(df_ID75)
+
+        classes = {}
+        if renderer.color == "source":
+            classes = {
+                f: "MAPL1x" if p.name.endswith("_MAPL1x.toml") else "MAPL1"
+                for f, p in loader.choose(loader.discover())
+            }
+        elif renderer.color == "qa":
+            qa = TopologyQA(self.qa_min_area, self.qa_gap).check(df_W84)
+            files = np.asarray(df_W84["File"].unique(), dtype=object)
+            classes = dict(zip(files, CadastreRenderer.qa_status(qa, files)))
+        return renderer.run(df_LL_W84, classes, out_path)
+
+    def state_path(self) -> Path:
+        return self.folder / f"{self.gpkg_prefix}_state.json"
+
+    def run_incremental(self):
+        """
+        Re-load / re-transform only added or modified deeds and upsert them
+        (delete by File + append) into the bulk GPKGs; delete removed deeds.
+        Falls back to a full bulk build when there is no usable state.
+        changes=True also writes the run's ChangeFeed set; once
+        <prefix>_changes/ exists every incremental run writes its set, so
+        the feed has no gaps. The set is written and its seq committed
+        (state "pending") before the GPKGs / database are touched.
+        """
+        t0 = time.perf_counter()
+        loader = self.make_loader()
+        chosen = loader.choose(loader.discover())
+
+        writer = GPKGWriter(self.folder, self.crs_factory, bulk=True)
+        db = SpatialDBWriter(self.db, self.export_batch) if self.db else None
+        state = BuildState.load(self.state_path(), self.config)
+        feed = ChangeFeed(self.folder, self.gpkg_prefix)
+        changes = self.changes or feed.dir.is_dir()
+        if changes and not self.changes:
+            print(f"[INFO] {feed.dir.name}/ exists → writing the change set (feed stays continuous)")
+        if (
+            state is None
+            or state.pending
+            or not all(GPKGWriter.is_bulk_gpkg(p) for p in writer.gpkg_paths(self.gpkg_prefix))
+            or (db is not None and not db.exists())
+        ):
+            if state is not None and state.pending:
+                print("[WARN] Previous incremental build did not finish → full bulk build")
+            else:
+                print("[INFO] No usable build state / bulk GPKG / database tables → full bulk build")
+            # fingerprint first: a deed edited during the build is redone next run
+            seq = state.changes_seq if state is not None else 0
+            state = BuildState(self.state_path(), BuildState.config_key(self.config), changes_seq=seq)
+            state.files = {f: BuildState.fingerprint(p) for f, p in chosen}
+            state.pending = True
+            state.save()
+            self.bulk = True
+            df_ID75, df_W84 = self.run()
+            if changes:
+                new = ChangeFeed.frame(df_ID75, df_W84)
+                parcels, markers = ChangeFeed.diff(
+                    ChangeFeed.empty(), new, new["File"].unique(), [], []
+                )
+                state.changes_seq = feed.next_seq(state)
+                feed.write(state.changes_seq, parcels, markers, full=True)
+            state.pending = False
+            state.save()
+            return
+
+        added, modified, removed, files = state.diff(chosen)
+        print(
+            f"[DIFF] {len(chosen)} parcels: {len(added)} added, "
+            f"{len(modified)} modified, {len(removed)} removed "
+            f"({time.perf_counter() - t0:.2f} s)"
+        )
+        if added or modified or removed:
+            delete_files = [f for f, _ in modified] + removed
+            old = None
+            if changes:  # before the GPKGs are updated
+                old = ChangeFeed.read_old(writer.gpkg_paths(self.gpkg_prefix), delete_files)
+            df_ID75 = loader.load_files(added + modified, allow_empty=True)
+            if len(df_ID75):
+                transformer = CoordinateTransformer(self.crs_factory)
+                _, df_W84 = transformer.to_wgs84_and_w84_utm(df_ID75)
+            else:
+                df_W84 = df_ID75
+            if changes:
+                parcels, markers = ChangeFeed.diff(
+                    old,
+                    ChangeFeed.frame(df_ID75, df_W84),
+                    [f for f, _ in added],
+                    [f for f, _ in modified],
+                    removed,
+                )
+                if parcels:
+                    state.changes_seq = feed.next_seq(state)
+                    feed.write(state.changes_seq, parcels, markers)
+                else:
+                    print("[CHANGES] Only re-saved deeds, no marker changes → no change set.")
+            # the set (if any) is on disk: commit its seq before touching the outputs
+            state.pending = True
+            state.save()
+            writer.update_ID75_W84(df_ID75, df_W84, self.gpkg_prefix, delete_files)
+            if db is not None:
+                epsg_w84 = CRSFactory.w84_utm_epsg(self.config.default_epsg)
+                db.upsert(df_W84, CRS.from_epsg(epsg_w84), delete_files)
+        else:
+            print("[OK] Cadastre is up to date.")
+
+        state.files = files
+        state.pending = False
+        state.save()
+        print(f"[TIME] incremental build: {time.perf_counter() - t0:.2f} s")
+
+    def run_chunked(self):
+        """
+        Stream the cadastre in chunks of `self.chunk` parcels: load →
+        transform → append to the bulk GPKGs / exports / CSV, so memory is
+        bounded by the chunk size, not the archive. The GPKG CRS is the one
+        of CONFIG [Deed].EPSG (the archive-wide EPSG mode is unknown up front);
+        deeds in another EPSG are reprojected into it group by group.
+        """
+        t0 = time.perf_counter()
+        loader = self.make_loader()
+        transformer = CoordinateTransformer(self.crs_factory)
+        writer = GPKGWriter(self.folder, self.crs_factory, bulk=True)
+
+        epsg_i75 = self.config.default_epsg
+        epsg_w84 = CRSFactory.w84_utm_epsg(epsg_i75)
+        crs_i75 = self.crs_factory.get_src_crs(epsg_i75)
+        crs_w84 = CRS.from_epsg(epsg_w84)
+        exporter = (
+            ColumnarExporter(self.folder, self.gpkg_prefix, self.export_formats, self.export_batch)
+            if self.export_formats
+            else None
+        )
+
+        with ExitStack() as stack:
+            gpkg_tmp = []
+            for path in writer.gpkg_paths(self.gpkg_prefix):
+                stack.enter_context(file_lock(path))
+                gpkg_tmp.append(stack.enter_context(atomic_path(path)))
+            sinks = {}
+            if exporter:
+                sinks["I75UTM"] = exporter.open_sinks(stack, "I75UTM", crs_i75)
+                sinks["W84UTM"] = exporter.open_sinks(stack, "W84UTM", crs_w84)
+            csv_tmp = None
+            if self.csv_path is not None:
+                stack.enter_context(file_lock(self.csv_path))
+                csv_tmp = stack.enter_context(atomic_path(self.csv_path))
+            metrics_tmp = None
+            if self.metrics:
+                metrics_path = ParcelMetrics.csv_path(self.folder, self.gpkg_prefix)
+                stack.enter_context(file_lock(metrics_path))
+                metrics_tmp = stack.enter_context(atomic_path(metrics_path))
+
+            done = n_markers = n_parcels = n_chunks = 0
+            for n_total, df_ID75 in loader.iter_chunks(self.chunk):
+                done += self.chunk
+                n_chunks += 1
+                if len(df_ID75):
+                    df_LL_W84, df_W84 = transformer.to_wgs84_and_w84_utm(df_ID75)
+                    create = n_markers == 0
+                    metrics = None
+                    if metrics_tmp is not None:
+                        metrics = ParcelMetrics.compute(df_ID75, df_LL_W84, df_W84)
+                        metrics.to_csv(metrics_tmp, mode="a", header=create, index=False)
+                    df_I75 = transformer.to_epsg(df_ID75, epsg_i75)
+                    df_W84 = transformer.to_epsg(df_W84, epsg_w84)
+                    for df, path, crs in (
+                        (df_I75, gpkg_tmp[0], crs_i75),
+                        (df_W84, gpkg_tmp[1], crs_w84),
+                    ):
+                        m, p = writer.append_gpkg_bulk(df, path, crs, create, metrics)
+                    n_markers += m
+                    n_parcels += p
+                    if exporter:
+                        exporter.write(sinks["I75UTM"], df_I75, crs_i75)
+                        exporter.write(sinks["W84UTM"], df_W84, crs_w84)
+                    if csv_tmp is not None:
+                        df_ID75.to_csv(csv_tmp, mode="a", header=create, index=False)
+                    del df_LL_W84, df_I75, df_W84
+                del df_ID75
+
+                done = min(done, n_total)
+                dt = time.perf_counter() - t0
+                rate = done / dt if dt > 0 else 0.0
+                eta = (n_total - done) / rate if rate > 0 else 0.0
+                print(
+                    f"[CHUNK {n_chunks}] {done}/{n_total} ({100.0 * done / max(n_total, 1):.1f}%) "
+                    f"→ {n_parcels} parcels, {n_markers} markers | "
+                    f"{rate:.0f} parcels/s, {n_markers / dt if dt > 0 else 0:.0f} markers/s | "
+                    f"ETA {eta:.0f} s"
+                )
+
+            if n_markers == 0:
+                raise RuntimeError(
+                    "No marker data found in any TOML file (even though some TOMLs were found)."
+                )
+            for tmp in gpkg_tmp:
+                GPKGWriter._index_file_column(tmp)
+            for s in sinks.values():
+                exporter.close_sinks(s)
+
+        print(
+            f"[OK] Chunked build: {n_parcels} parcels, {n_markers} markers in "
+            f"{n_chunks} chunks, {time.perf_counter() - t0:.2f} s → "
+            + ", ".join(str(p) for p in writer.gpkg_paths(self.gpkg_prefix))
+        )
+
     def run(self):
-        loader = MarkerLoader(self.folder, self.config)
+        loader = self.make_loader()
         df_ID75 = loader.load_df_id75()
         print("\n=== df_ID75 (source CRS) ===")
         print(df_ID75)
 
+        if self.csv_path is not None:
+            atomic_write_text(self.csv_path, df_ID75.to_csv(index=False))
+            print(f"[OK] Wrote CSV → {self.csv_path}")
+
         transformer = CoordinateTransformer(self.crs_factory)
 
-        # Geographic WGS84
-        df_LL_W84 = transformer.to_wgs84(df_ID75)
+        # Geographic WGS84 + WGS84 UTM in one fused pass
+        df_LL_W84, df_W84 = transformer.to_wgs84_and_w84_utm(df_ID75)
         print("\n=== df_LL_W84 (EPSG:4326) ===")
         print(df_LL_W84[["File", "idx", "code", "MARKER", "LON", "LAT"]])
 
         # WGS84 UTM
-        df_W84 = transformer.to_w84_utm(df_ID75)
         print("\n=== df_W84 (WGS84 UTM; EPSG 32647/32648) ===")
         print(
             df_W84[
@@ -587,29 +3705,281 @@ class MarkerProcessor:
             ]
         )
 
-        writer = GPKGWriter(self.folder, self.crs_factory)
+        metrics = None
+        if self.metrics:
+            t0 = time.perf_counter()
+            metrics = ParcelMetrics.compute(df_ID75, df_LL_W84, df_W84)
+            metrics_path = ParcelMetrics.csv_path(self.folder, self.gpkg_prefix)
+            atomic_write_text(metrics_path, metrics.to_csv(index=False))
+            print(
+                f"[METRICS] {len(metrics)} parcels in {time.perf_counter() - t0:.2f} s "
+                f"→ {metrics_path}"
+            )
+
+        writer = GPKGWriter(self.folder, self.crs_factory, bulk=self.bulk, metrics=metrics)
         writer.write_ID75_W84(df_ID75, df_W84, self.gpkg_prefix)
 
+        if self.db:
+            db = SpatialDBWriter(self.db, self.export_batch, metrics)
+            crs_w84 = CRS.from_epsg(int(df_W84["EPSG"].mode()[0]))
+            if self.db_upsert:
+                db.upsert(df_W84, crs_w84)
+            else:
+                db.write(df_W84, crs_w84)
+
+        if self.export_formats:
+            exporter = ColumnarExporter(
+                self.folder, self.gpkg_prefix, self.export_formats, self.export_batch
+            )
+            epsg_src = int(df_ID75["EPSG"].mode()[0])
+            epsg_w84 = int(df_W84["EPSG"].mode()[0])
+            exporter.export(df_ID75, "I75UTM", self.crs_factory.get_src_crs(epsg_src))
+            exporter.export(df_W84, "W84UTM", CRS.from_epsg(epsg_w84))
+
+        if self.conflate_tol is not None:
+            conflator = MarkerConflator(self.conflate_tol, self.conflict_radius)
+            conflator.run(df_W84, self.folder, self.gpkg_prefix)
+
+        if self.qa:
+            TopologyQA(self.qa_min_area, self.qa_gap).run(
+                df_W84, self.folder, self.gpkg_prefix
+            )
+        return df_ID75, df_W84
+
 
 # =========================================
 # main()
 # =========================================
 
-def parse_args():
-    parser = argparse.ArgumentParser(
-        description="RV25J Cadastre Marker Processor (CONFIG.toml required, ID→WGS84/W84UTM)"
-    )
+COMMANDS = ("build", "query", "tiles", "render", "serve")
+
+
+def add_folder_arg(parser):
     # positional: folder
     parser.add_argument(
         "folder",
         help="Root folder containing *_MAPL1.toml / *_MAPL1x.toml (recursively).",
     )
     parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="TOML parsing workers (default: 4 x CPUs threads, or CPUs processes).",
+    )
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="Parse TOMLs in a process pool instead of threads (CPU-bound local disks).",
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help="Load markers from <folder>/_parcel_store (created / updated as "
+        "needed) instead of parsing every TOML.",
+    )
+
+
+def parse_args(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # no subcommand given → "build" (keeps `RV25j_Cadastre.py Narativas` working)
+    if argv and argv[0] not in COMMANDS + ("-h", "--help"):
+        argv = ["build"] + argv
+
+    parser = argparse.ArgumentParser(
+        description="RV25J Cadastre Marker Processor (CONFIG.toml required, ID→WGS84/W84UTM)"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    # ---- build (default) ----
+    p_build = sub.add_parser("build", help="Build cadastre outputs (default).")
+    add_folder_arg(p_build)
+    p_build.add_argument(
         "--gpkg-prefix",
         default="cadastre",
         help="Prefix for output GPKG files (default: 'cadastre').",
     )
-    return parser.parse_args()
+    p_build.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Write single 'marker' and 'parcel' layers (File attribute) "
+        "instead of one layer pair per parcel.",
+    )
+    p_build.add_argument(
+        "--chunk",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Stream the build N parcels at a time (bulk layout, bounded memory).",
+    )
+    p_build.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-process TOMLs changed since the last build "
+        "(<gpkg-prefix>_state.json) and upsert them into the bulk GPKGs.",
+    )
+    p_build.add_argument(
+        "--changes",
+        action="store_true",
+        help="With --incremental: write the run's added / modified / removed parcels "
+        "and markers to <gpkg-prefix>_changes/<seq>.ndjson (automatic once that "
+        "folder exists).",
+    )
+    p_build.add_argument(
+        "-o",
+        "--csv",
+        default=None,
+        help="Also save df_ID75 (source CRS markers) as this CSV file.",
+    )
+    p_build.add_argument(
+        "--export",
+        default="",
+        help="Comma list of streaming exports: parquet,fgb,csv",
+    )
+    p_build.add_argument(
+        "--export-batch",
+        type=int,
+        default=5000,
+        help="Parcels per export batch (default: 5000).",
+    )
+    p_build.add_argument(
+        "--db",
+        default=None,
+        metavar="TARGET",
+        help="Also bulk-load marker / parcel (WGS84 UTM) into a SpatiaLite file "
+        "(.sqlite / .db) or PostGIS (postgresql://user@host/dbname).",
+    )
+    p_build.add_argument(
+        "--db-upsert",
+        action="store_true",
+        help="Replace only the loaded Files in the --db tables instead of the whole tables.",
+    )
+    p_build.add_argument(
+        "--conflate",
+        type=float,
+        default=None,
+        metavar="TOL",
+        help="Snap markers within TOL metres (WGS84 UTM) into canonical markers.",
+    )
+    p_build.add_argument(
+        "--conflict-radius",
+        type=float,
+        default=1.0,
+        help="Same-code markers closer than this but farther than TOL are "
+        "reported as coordinate conflicts (default: 1.0 m).",
+    )
+    p_build.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Parcel area / perimeter / misclosure table (<gpkg-prefix>_parcel_metrics.csv) "
+        "and the same columns on the parcel layer.",
+    )
+    p_build.add_argument(
+        "--qa",
+        action="store_true",
+        help="Topology QA: overlaps / gaps between neighbouring parcels.",
+    )
+    p_build.add_argument(
+        "--qa-min-area",
+        type=float,
+        default=1.0,
+        help="Report overlaps / gaps larger than this (m², default: 1.0).",
+    )
+    p_build.add_argument(
+        "--qa-gap",
+        type=float,
+        default=0.5,
+        help="Slivers narrower than this are gaps (m, default: 0.5).",
+    )
+
+    # ---- query ----
+    p_query = sub.add_parser("query", help="Point-in-parcel / bbox queries from CSV.")
+    add_folder_arg(p_query)
+    src = p_query.add_mutually_exclusive_group(required=True)
+    src.add_argument("--points", help="CSV with columns id,x,y")
+    src.add_argument("--boxes", help="CSV with columns id,minx,miny,maxx,maxy")
+    p_query.add_argument(
+        "--crs",
+        type=int,
+        default=4326,
+        help="EPSG of query coordinates: 4326 (lon/lat), 32647/32648, 24047/24048.",
+    )
+    p_query.add_argument("-o", "--out", default=None, help="Result CSV (id,File).")
+
+    # ---- tiles ----
+    p_tiles = sub.add_parser("tiles", help="Vector tile archive (.mbtiles / .pmtiles).")
+    add_folder_arg(p_tiles)
+    p_tiles.add_argument(
+        "-o",
+        "--out",
+        default=None,
+        help="Output .pmtiles or .mbtiles (default: <folder>/cadastre.pmtiles).",
+    )
+    p_tiles.add_argument("--minzoom", type=int, default=10)
+    p_tiles.add_argument("--maxzoom", type=int, default=16)
+    p_tiles.add_argument(
+        "--marker-minzoom",
+        type=int,
+        default=15,
+        help="Lowest zoom with the marker layer (default: 15).",
+    )
+    p_tiles.add_argument(
+        "--tile-workers",
+        type=int,
+        default=None,
+        help="Tile encoding processes (default: CPUs; 1 = no pool).",
+    )
+
+    # ---- render ----
+    p_render = sub.add_parser("render", help="Overview PNG of all parcels (Cadastre_All.png).")
+    add_folder_arg(p_render)
+    p_render.add_argument(
+        "-o",
+        "--out",
+        default=None,
+        help="Output PNG (default: <folder>/Cadastre_All.png).",
+    )
+    p_render.add_argument(
+        "--color",
+        choices=("source", "qa", "none"),
+        default="source",
+        help="Colour parcels by TOML source (MAPL1 / MAPL1x), topology QA status, or not.",
+    )
+    p_render.add_argument("--labels", action="store_true", help="Label parcels with File.")
+    p_render.add_argument(
+        "--no-markers", action="store_true", help="Do not draw marker points."
+    )
+    p_render.add_argument(
+        "--size", type=int, default=4000, help="Longest image side in pixels (default: 4000)."
+    )
+    p_render.add_argument(
+        "--engine",
+        choices=("auto", "mpl", "pil"),
+        default="auto",
+        help=f"matplotlib collection or PIL rasteriser (auto: pil above "
+        f"{CadastreRenderer.PIL_THRESHOLD} parcels).",
+    )
+    p_render.add_argument(
+        "--grid",
+        default="1x1",
+        metavar="COLSxROWS",
+        help="Split a large extent into COLSxROWS tiles, each --size pixels.",
+    )
+    p_render.add_argument("--qa-min-area", type=float, default=1.0)
+    p_render.add_argument("--qa-gap", type=float, default=0.5)
+
+    # ---- serve ----
+    p_serve = sub.add_parser("serve", help="Local GeoJSON feature server (bbox / attribute queries).")
+    add_folder_arg(p_serve)
+    p_serve.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1).")
+    p_serve.add_argument("--port", type=int, default=8075, help="Port (default: 8075).")
+    p_serve.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Add ParcelMetrics columns (area, perimeter, misclosure ...) to parcel properties.",
+    )
+
+    return parser.parse_args(argv)
 
 
 def main():
@@ -622,12 +3992,133 @@ def main():
         sys.exit(1)
 
     folder = Path(args.folder)
+
+    if args.command == "query":
+        processor = MarkerProcessor(
+            folder,
+            config_path,
+            gpkg_prefix="cadastre",
+            workers=args.workers,
+            processes=args.processes,
+            use_store=args.store,
+        )
+        kind, csv_path = ("points", args.points) if args.points else ("boxes", args.boxes)
+        processor.query(
+            Path(csv_path), kind, args.crs, Path(args.out) if args.out else None
+        )
+        return
+
+    if args.command == "tiles":
+        if not 0 <= args.minzoom <= args.maxzoom <= 24:
+            print("[ERROR] Need 0 <= --minzoom <= --maxzoom <= 24.")
+            sys.exit(1)
+        processor = MarkerProcessor(
+            folder,
+            config_path,
+            gpkg_prefix="cadastre",
+            workers=args.workers,
+            processes=args.processes,
+            use_store=args.store,
+        )
+        tiler = VectorTiler(
+            args.minzoom, args.maxzoom, args.marker_minzoom, args.tile_workers
+        )
+        processor.tiles(Path(args.out) if args.out else folder / "cadastre.pmtiles", tiler)
+        return
+
+    if args.command == "serve":
+        processor = MarkerProcessor(
+            folder,
+            config_path,
+            gpkg_prefix="cadastre",
+            workers=args.workers,
+            processes=args.processes,
+            use_store=args.store,
+            metrics=args.metrics,
+        )
+        processor.serve(args.host, args.port)
+        return
+
+    if args.command == "render":
+        try:
+            cols, rows = (int(v) for v in args.grid.lower().split("x"))
+        except ValueError:
+            cols = rows = 0
+        if cols < 1 or rows < 1:
+            print(f"[ERROR] --grid must be COLSxROWS, e.g. 2x2 (got {args.grid!r}).")
+            sys.exit(1)
+        processor = MarkerProcessor(
+            folder,
+            config_path,
+            gpkg_prefix="cadastre",
+            qa_min_area=args.qa_min_area,
+            qa_gap=args.qa_gap,
+            workers=args.workers,
+            processes=args.processes,
+            use_store=args.store,
+        )
+        renderer = CadastreRenderer(
+            size=args.size,
+            color=args.color,
+            labels=args.labels,
+            markers=not args.no_markers,
+            engine=args.engine,
+            grid=(cols, rows),
+        )
+        processor.render(Path(args.out) if args.out else folder / "Cadastre_All.png", renderer)
+        return
+
+    if args.incremental and (
+        args.csv or args.export or args.conflate is not None or args.qa or args.metrics
+    ):
+        # these are whole-archive products; they need a full build
+        print("[ERROR] --incremental cannot be combined with -o/--export/--conflate/--qa/--metrics.")
+        sys.exit(1)
+    if args.chunk is not None and (
+        args.chunk < 1 or args.incremental or args.conflate is not None or args.qa or args.db
+    ):
+        print("[ERROR] --chunk N (N >= 1) cannot be combined with --incremental/--conflate/--qa/--db.")
+        sys.exit(1)
+    if args.changes and not args.incremental:
+        print("[ERROR] --changes needs --incremental (it diffs against the previous build state).")
+        sys.exit(1)
+    if args.db_upsert and not args.db:
+        print("[ERROR] --db-upsert needs --db.")
+        sys.exit(1)
+    if args.db and not SpatialDBWriter.is_postgis(args.db) and (
+        Path(args.db).suffix.lower() not in SpatialDBWriter.SPATIALITE_SUFFIXES
+    ):
+        print(f"[ERROR] --db must be postgresql://... or a .sqlite / .db file (got {args.db!r}).")
+        sys.exit(1)
+
     processor = MarkerProcessor(
         folder=folder,
         config_path=config_path,
         gpkg_prefix=args.gpkg_prefix,
+        bulk=args.bulk,
+        csv_path=Path(args.csv) if args.csv else None,
+        export_formats=[f.strip() for f in args.export.split(",") if f.strip()],
+        export_batch=args.export_batch,
+        conflate_tol=args.conflate,
+        conflict_radius=args.conflict_radius,
+        qa=args.qa,
+        qa_min_area=args.qa_min_area,
+        qa_gap=args.qa_gap,
+        workers=args.workers,
+        processes=args.processes,
+        use_store=args.store,
+        chunk=args.chunk,
+        metrics=args.metrics,
+        db=args.db,
+        db_upsert=args.db_upsert,
+        changes=args.changes,
     )
-    processor.run()
+    if args.incremental:
+        processor.run_incremental()
+    elif args.chunk is not None:
+        processor.run_chunked()
+    else:
+        processor.run()
 
 
 if __name__ == "__main__":
@@ -40,6 +40,23 @@
                 scrollbar
       - Bottom: *_plot.png polygon preview (if exists)
 
+   6. Request OCR now: appends the current "<subdir>/<prefix>" to
+      <folder>/OCR_URGENT.txt
+      so a running RV25j_Process batch on that folder handles it next.
+
+ *_rect.json and *_table.jpg are written atomically under the per-prefix
+ <prefix> lock shared with RV25j_Process (see RV25j_SafeIO), so the app can
+ be used while OCR workers run on the same folder.
+
+ The 0.5 / 0.25 zoom levels come from an image pyramid cache
+ (<folder>/_pyramid/<hash>_<scale>.jpg, keyed on the scan's content hash)
+ that a background thread fills when a folder is opened, so paging and
+ zooming never resize the full 300-dpi scan on the UI thread. The deeds
+ around the current one (main image at view_scale, *_table.jpg, *_plot.png,
+ TOML text) are decoded ahead by a second thread into a memory-bounded LRU;
+ Next / Previous only create the Tk PhotoImages. A deed that is not decoded
+ yet shows "Loading ..." until that thread has it (the UI never decodes).
+
  Layout ratio (bottom content area):
       left_frame   ≈ 10%  (list of files)
       middle_frame ≈ 70%  (main image + rectangle)
@@ -68,11 +85,18 @@
 
 import os
 import json
+import queue
+import threading
 import tkinter as tk
+from collections import OrderedDict
+from pathlib import Path
 from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk
 import pandas as pd
 
+from RV25j_ParcelStore import fingerprint
+from RV25j_SafeIO import LockTimeout, atomic_path, atomic_write_text, file_lock, prefix_lock
+
 # Try stdlib TOML reader (Python 3.11+)
 try:
     import tomllib  # Python 3.11+
@@ -80,6 +104,7 @@ except ImportError:
     tomllib = None
 
 RV_SUFFIX = "_rv25j.jpg"   # strict suffix we support
+LOCK_TIMEOUT = 5.0         # seconds to wait for a busy <prefix> lock
 
 
 # ---------------------------------------------------------------------------
@@ -119,6 +144,311 @@ class AutoHideScrollbar(tk.Scrollbar):
         super().set(lo, hi)
 
 
+# ---------------------------------------------------------------------------
+# Disk-backed image pyramid for the main canvas
+# ---------------------------------------------------------------------------
+class ImagePyramid:
+    """
+    Downscaled copies of each *_rv25j.jpg for the view_scale levels:
+
+        <folder>/_pyramid/<hash>_0.5.jpg
+        <folder>/_pyramid/<hash>_0.25.jpg
+
+    <hash> is the blake2b hash of the source JPEG (RV25j_ParcelStore
+    fingerprint, re-hashed only when size / mtime change), so an edited
+    scan gets new levels and a copied one reuses them. Level 1.0 is the
+    source itself. A daemon thread builds the levels of a whole folder
+    (prefetch); a deed shown before its turn is built on the spot. When
+    _pyramid is not writable the levels are resized in memory instead.
+    close() stops the thread (another folder was opened).
+    """
+
+    DIRNAME = "_pyramid"
+    LEVELS = (0.5, 0.25)
+    QUALITY = 90
+
+    def __init__(self, folder: str):
+        self.path = Path(folder) / self.DIRNAME
+        self._fps = {}                 # source path → fingerprint
+        self._guard = threading.Lock()
+        self._building = {}            # hash → Lock (one builder per source)
+        self._queue = queue.Queue()
+        self._generation = 0           # bumped by prefetch(): drops older work
+        self._writable = True
+        self._worker = None
+
+    def _hash(self, src: str) -> str:
+        with self._guard:
+            old = self._fps.get(src)
+        fp = fingerprint(Path(src), old)
+        with self._guard:
+            self._fps[src] = fp
+        return fp["hash"]
+
+    def level_path(self, h: str, scale: float) -> Path:
+        return self.path / f"{h}_{scale}.jpg"
+
+    @staticmethod
+    def _open(path) -> Image.Image:
+        """Decoded image; the file is closed again (no handle per level)."""
+        with Image.open(path) as img:
+            img.load()
+        return img
+
+    def _build(self, src: str, h: str) -> dict:
+        """Missing levels of src (scale → PIL image); one builder per hash."""
+        with self._guard:
+            lock = self._building.setdefault(h, threading.Lock())
+        with lock:
+            missing = [s for s in self.LEVELS if not self.level_path(h, s).is_file()]
+            if not missing:
+                return {}
+            img = self._open(src)
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            w, h_px = img.size
+            built = {}
+            for scale in self.LEVELS:  # 0.25 from 0.5: half the LANCZOS work
+                base = built.get(scale * 2, img)
+                built[scale] = base.resize(
+                    (max(1, int(w * scale)), max(1, int(h_px * scale))), Image.LANCZOS
+                )
+            if self._writable:
+                try:
+                    self.path.mkdir(parents=True, exist_ok=True)
+                    for scale in missing:
+                        with atomic_path(self.level_path(h, scale)) as tmp:
+                            built[scale].save(tmp, format="JPEG", quality=self.QUALITY)
+                except OSError as e:
+                    self._writable = False
+                    print(f"[WARN] Image pyramid not saved ({self.path}): {e}")
+            return built
+
+    def get(self, src: str, scale: float):
+        """(PIL image at scale, (full width, full height)) for a source JPEG."""
+        if scale == 1.0:
+            img = self._open(src)
+            return img, img.size
+        with Image.open(src) as img:
+            full_size = img.size  # header only
+            if scale not in self.LEVELS:
+                return img.resize(
+                    (max(1, int(full_size[0] * scale)), max(1, int(full_size[1] * scale))),
+                    Image.LANCZOS,
+                ), full_size
+        h = self._hash(src)
+        path = self.level_path(h, scale)
+        if path.is_file():
+            return self._open(path), full_size
+        built = self._build(src, h)
+        if scale in built:
+            return built[scale], full_size
+        return self._open(path), full_size  # built meanwhile by the worker
+
+    # ---- background builder ----
+    def prefetch(self, paths):
+        """Build the levels of paths (in order) in the background."""
+        with self._guard:
+            self._generation += 1
+            gen = self._generation
+        for p in paths:
+            self._queue.put((gen, p))
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+
+    def close(self):
+        """Drop the queued work and stop the background builder."""
+        with self._guard:
+            self._generation += 1
+        if self._worker is not None:
+            self._queue.put((None, None))
+            self._worker = None
+
+    def _run(self):
+        built = 0
+        while True:
+            gen, src = self._queue.get()
+            if gen is None:  # close()
+                return
+            if gen == self._generation:
+                try:
+                    built += len(self._build(src, self._hash(src)))
+                except Exception as e:  # unreadable scan: shown as an error when opened
+                    print(f"[WARN] Image pyramid skipped {src}: {e}")
+            if self._queue.empty() and built:
+                print(f"[PYRAMID] {built} levels built → {self.path}")
+                built = 0
+
+
+# ---------------------------------------------------------------------------
+# Background prefetch of neighbouring deeds
+# ---------------------------------------------------------------------------
+class DeedPrefetcher:
+    """
+    Decoded deeds (main image at view_scale, *_table.jpg / *_plot.png
+    fitted to their canvases, TOML text) in an LRU bounded by MAX_BYTES
+    of pixel data. A daemon thread loads the current deed and the ones
+    around it (schedule()); the main thread only turns an entry into
+    PhotoImages, and get() never decodes: on a miss the UI shows a
+    placeholder and polls. An entry is dropped when one of its files changed
+    (mtime), e.g. a new *_table.jpg from "Clip" or *_plot.png from
+    RV25j_Process. close() stops the thread and frees the LRU.
+    """
+
+    MAX_BYTES = 256 * 1024 * 1024
+    NEIGHBOURS = 2                   # deeds prefetched on each side
+    POLL_MS = 40                     # UI poll interval while a deed loads
+
+    def __init__(self, pyramid: ImagePyramid):
+        self.pyramid = pyramid
+        self._lru = OrderedDict()    # key → entry
+        self._bytes = 0
+        self._guard = threading.Lock()
+        self._queue = queue.Queue()
+        self._generation = 0
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    @staticmethod
+    def key(req: dict):
+        return (req["rv_path"], req["scale"], req["table_box"], req["plot_box"])
+
+    @staticmethod
+    def side_paths(rv_path: str) -> dict:
+        folder, fname = os.path.split(rv_path)
+        prefix = fname[:-len(RV_SUFFIX)]
+        return {
+            "table": os.path.join(folder, f"{prefix}_table.jpg"),
+            "toml": os.path.join(folder, f"{prefix}_MAPL1.toml"),
+            "toml_x": os.path.join(folder, f"{prefix}_MAPL1x.toml"),  # side-file
+            "plot": os.path.join(folder, f"{prefix}_plot.png"),
+        }
+
+    @classmethod
+    def _stamp(cls, rv_path: str) -> tuple:
+        """mtime_ns (None = missing) of the scan and its side files."""
+        stamp = []
+        for p in [rv_path, *cls.side_paths(rv_path).values()]:
+            try:
+                stamp.append(os.stat(p).st_mtime_ns)
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    @staticmethod
+    def fit(img, box):
+        """Resize img to fit box (w, h), keeping the aspect ratio."""
+        box_w, box_h = box
+        img_ratio = img.width / img.height
+        if img_ratio > box_w / box_h:
+            size = (box_w, max(1, int(box_w / img_ratio)))
+        else:
+            size = (max(1, int(box_h * img_ratio)), box_h)
+        return img.resize(size, Image.LANCZOS)
+
+    def load(self, req: dict) -> dict:
+        """Read + decode one deed (any thread; no Tk calls)."""
+        rv_path = req["rv_path"]
+        side = self.side_paths(rv_path)
+        entry = {"stamp": self._stamp(rv_path), "error": None, "table": None, "plot": None}
+
+        try:
+            entry["main"], entry["size"] = self.pyramid.get(rv_path, req["scale"])
+        except Exception as e:
+            entry["main"], entry["error"] = None, e
+
+        for name, box in (("table", req["table_box"]), ("plot", req["plot_box"])):
+            if os.path.isfile(side[name]):
+                try:
+                    with Image.open(side[name]) as img:
+                        entry[name] = self.fit(img, box)
+                except Exception as e:
+                    print(f"[WARN] Failed to open {side[name]}: {e}")
+
+        use_side = os.path.isfile(side["toml_x"])
+        path_to_show = side["toml_x"] if use_side else side["toml"]
+        if os.path.isfile(path_to_show):
+            try:
+                with open(path_to_show, "r", encoding="utf-8") as f:
+                    txt = f.read()
+            except Exception as e:
+                txt = f"Error reading {path_to_show}:\n{e}"
+        else:
+            txt = "No *_MAPL1.toml / *_MAPL1x.toml"
+        entry["toml"] = (txt, use_side)
+
+        entry["bytes"] = sum(
+            im.width * im.height * len(im.getbands())
+            for im in (entry["main"], entry["table"], entry["plot"])
+            if im is not None
+        )
+        return entry
+
+    def _put(self, key, entry: dict):
+        with self._guard:
+            old = self._lru.pop(key, None)
+            if old is not None:
+                self._bytes -= old["bytes"]
+            self._lru[key] = entry
+            self._bytes += entry["bytes"]
+            while self._bytes > self.MAX_BYTES and len(self._lru) > 1:
+                _, dropped = self._lru.popitem(last=False)
+                self._bytes -= dropped["bytes"]
+
+    def _cached(self, req: dict):
+        key = self.key(req)
+        with self._guard:
+            entry = self._lru.get(key)
+        if entry is None:
+            return None
+        if entry["stamp"] != self._stamp(req["rv_path"]):
+            return None
+        with self._guard:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+        return entry
+
+    def get(self, req: dict) -> dict | None:
+        """Entry for req from memory; None until the worker has loaded it."""
+        return self._cached(req)
+
+    def schedule(self, reqs):
+        """Prefetch reqs (nearest first); older requests are dropped."""
+        with self._guard:
+            self._generation += 1
+            gen = self._generation
+        for req in reqs:
+            self._queue.put((gen, req))
+
+    def close(self):
+        """Stop the background thread and drop every cached deed."""
+        with self._guard:
+            self._generation += 1
+            self._lru.clear()
+            self._bytes = 0
+        self._queue.put((None, None))
+
+    def _run(self):
+        while True:
+            gen, req = self._queue.get()
+            if gen is None:  # close()
+                return
+            if gen != self._generation or self._cached(req) is not None:
+                continue
+            try:
+                entry = self.load(req)
+            except Exception as e:
+                print(f"[WARN] Prefetch failed for {req['rv_path']}: {e}")
+                entry = {
+                    "stamp": self._stamp(req["rv_path"]), "error": e, "main": None,
+                    "table": None, "plot": None, "toml": (f"Error: {e}", False), "bytes": 0,
+                }
+            # failed loads are kept too (a waiting UI shows the error); the
+            # stamp drops them once the scan is replaced
+            self._put(self.key(req), entry)
+
+
 class ImageBrowserApp:
     def __init__(self, master):
         self.master = master
@@ -127,6 +457,10 @@ class ImageBrowserApp:
         # Data
         self.df = None
         self.current_idx = None
+        self.folder = None
+        self.pyramid = None          # ImagePyramid of the open folder
+        self.prefetcher = None       # DeedPrefetcher (decoded neighbours)
+        self._pending_key = None     # deed the UI waits for (with_entry)
 
         # Keep references to PhotoImage
         self.photo_main = None       # middle canvas (full deed image, scaled)
@@ -273,6 +607,18 @@ class ImageBrowserApp:
         )
         btn_clip_force.pack(side=tk.LEFT, padx=5)
 
+        # Push current deed to the front of a running OCR batch
+        btn_urgent = tk.Button(
+            ribbon,
+            text="Request OCR now",
+            command=self.request_ocr_now,
+            bg="yellow",
+            fg="black",
+            font=("Arial", 12, "bold"),
+            width=16,
+        )
+        btn_urgent.pack(side=tk.LEFT, padx=5)
+
         spacer = tk.Frame(ribbon)
         spacer.pack(side=tk.LEFT, expand=True, fill=tk.X)
         btn_quit = tk.Button(ribbon, text="Quit", command=self.master.quit)
@@ -376,18 +722,24 @@ class ImageBrowserApp:
         """
         if self.df is None or self.current_idx is None:
             return
-        row = self.df.iloc[self.current_idx]
-        rv_path = row["rv_path"]
+        req = self.deed_request(self.current_idx)
+        rv_path = req["rv_path"]
+        if self._pending_key is not None:  # the deed itself is still loading
+            self.with_entry(req, self.show_entry)
+            return
 
-        # Redisplay main image with new scale
-        self.display_image_on_canvas(rv_path, self.canvas_main, is_main=True)
+        def show(entry):
+            # Redisplay main image with new scale
+            self.display_main_entry(rv_path, entry)
 
-        # Redraw existing rectangle in image coords (if any)
-        if self.current_rect_img is not None:
-            self.draw_rect_from_image_coords(self.current_rect_img, color="red")
-        else:
-            # If no current rect, try load existing *_rect.json
-            self.load_existing_rect(rv_path)
+            # Redraw existing rectangle in image coords (if any)
+            if self.current_rect_img is not None:
+                self.draw_rect_from_image_coords(self.current_rect_img, color="red")
+            else:
+                # If no current rect, try load existing *_rect.json
+                self.load_existing_rect(rv_path)
+
+        self.with_entry(req, show)
 
     # ------------------------------------------------------------------
     # Folder + DataFrame loading
@@ -423,6 +775,14 @@ class ImageBrowserApp:
 
         self.df = pd.DataFrame(records)
         self.current_idx = 0
+        self.folder = folder
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+        if self.pyramid is not None:
+            self.pyramid.close()
+        self.pyramid = ImagePyramid(folder)
+        self.pyramid.prefetch(self.df["rv_path"].tolist())
+        self.prefetcher = DeedPrefetcher(self.pyramid)
 
         self.listbox.delete(0, tk.END)
         for i, row in self.df.iterrows():
@@ -476,6 +836,72 @@ class ImageBrowserApp:
     # ------------------------------------------------------------------
     # Image display helpers
     # ------------------------------------------------------------------
+    def deed_request(self, idx: int) -> dict:
+        """What DeedPrefetcher needs for deed idx (canvas sizes read here, on the UI thread)."""
+        return {
+            "rv_path": self.df.iloc[idx]["rv_path"],
+            "scale": self.view_scale if self.view_scale else 1.0,
+            "table_box": (
+                max(self.canvas_table.winfo_width(), 200),
+                max(self.canvas_table.winfo_height(), 100),
+            ),
+            "plot_box": (
+                max(self.canvas_plot.winfo_width(), 200),
+                max(self.canvas_plot.winfo_height(), 100),
+            ),
+        }
+
+    def prefetch_neighbours(self):
+        """Queue the current deed (if not cached), then the next / previous ones, nearest first."""
+        if self.prefetcher is None or self.df is None or self.current_idx is None:
+            return
+        order = [self.current_idx]
+        for d in range(1, DeedPrefetcher.NEIGHBOURS + 1):
+            order += [self.current_idx + d, self.current_idx - d]
+        self.prefetcher.schedule(
+            [self.deed_request(i) for i in order if 0 <= i < len(self.df)]
+        )
+
+    def with_entry(self, req, show):
+        """
+        Call show(entry) with the decoded deed of req: now when it is in the
+        prefetcher, else after a "Loading ..." placeholder once the worker
+        has loaded it. A newer request (paging on) cancels the wait.
+        """
+        entry = self.prefetcher.get(req)
+        self.prefetch_neighbours()
+        key = DeedPrefetcher.key(req)
+        self._pending_key = None if entry is not None else key
+        if entry is not None:
+            show(entry)
+            return
+        self.show_loading(req["rv_path"])
+
+        def poll():
+            if self._pending_key != key or self.prefetcher is None:
+                return
+            entry = self.prefetcher.get(req)
+            if entry is None:
+                self.master.after(DeedPrefetcher.POLL_MS, poll)
+                return
+            self._pending_key = None
+            show(entry)
+
+        self.master.after(DeedPrefetcher.POLL_MS, poll)
+
+    def show_loading(self, rv_path):
+        """Placeholder while the prefetcher decodes rv_path (no rectangle drawing meanwhile)."""
+        self.main_img_size = None
+        self.main_scale = None
+        for canvas in (self.canvas_main, self.canvas_table, self.canvas_plot):
+            canvas.delete("all")
+        self.canvas_main.create_text(
+            max(self.canvas_main.winfo_width(), 200) // 2,
+            max(self.canvas_main.winfo_height(), 100) // 2,
+            text=f"Loading {os.path.basename(rv_path)} ...",
+            fill="white",
+        )
+
     def update_images(self):
         # Reset rectangle state for new file
         self.main_img_size = None
@@ -489,23 +915,19 @@ class ImageBrowserApp:
         if self.df is None or self.current_idx is None:
             return
 
-        row = self.df.iloc[self.current_idx]
-        rv_path = row["rv_path"]
-        table_path = row["table_path"]
+        self.with_entry(self.deed_request(self.current_idx), self.show_entry)
 
-        folder, fname = os.path.split(rv_path)
-        prefix = fname[:-len(RV_SUFFIX)]
-        toml_path = os.path.join(folder, f"{prefix}_MAPL1.toml")
-        toml_x_path = os.path.join(folder, f"{prefix}_MAPL1x.toml")  # side-file
-        plot_path = os.path.join(folder, f"{prefix}_plot.png")
+    def show_entry(self, entry):
+        """Main image, *_table.jpg, TOML text and *_plot.png of the current deed."""
+        rv_path = self.df.iloc[self.current_idx]["rv_path"]
 
         # Middle: main image (scaled by view_scale)
-        self.display_image_on_canvas(rv_path, self.canvas_main, is_main=True)
+        self.display_main_entry(rv_path, entry)
         self.load_existing_rect(rv_path)
 
         # Right top: *_table.jpg
-        if table_path and os.path.isfile(table_path):
-            self.display_table_image(table_path)
+        if entry["table"] is not None:
+            self.display_table_image(entry["table"])
         else:
             self.canvas_table.delete("all")
             self.canvas_table.create_text(
@@ -519,37 +941,22 @@ class ImageBrowserApp:
         self.text_toml.config(state="normal", bg="white")  # reset default
         self.text_toml.delete("1.0", tk.END)
 
-        # Determine TOML source
-        if os.path.isfile(toml_x_path):
-            path_to_show = toml_x_path
-            use_side = True
+        txt, use_side = entry["toml"]
+        if use_side:
             self.label_toml.config(text="*_MAPL1x.toml (override)")  # update label
         else:
-            path_to_show = toml_path
-            use_side = False
             self.label_toml.config(text="*_MAPL1.toml")
+        self.text_toml.insert("1.0", txt)
 
-        # Load TOML
-        if os.path.isfile(path_to_show):
-            try:
-                with open(path_to_show, "r", encoding="utf-8") as f:
-                    txt = f.read()
-                self.text_toml.insert("1.0", txt)
-
-                # Pink highlight when side file is active
-                if use_side:
-                    self.text_toml.config(bg="pink")
-
-            except Exception as e:
-                self.text_toml.insert("1.0", f"Error reading {path_to_show}:\n{e}")
-        else:
-            self.text_toml.insert("1.0", "No *_MAPL1.toml / *_MAPL1x.toml")
+        # Pink highlight when side file is active
+        if use_side:
+            self.text_toml.config(bg="pink")
 
         self.text_toml.config(state="disabled")
 
         # Right bottom: *_plot.png
-        if os.path.isfile(plot_path):
-            self.display_plot_image(plot_path)
+        if entry["plot"] is not None:
+            self.display_plot_image(entry["plot"])
         else:
             self.canvas_plot.delete("all")
             self.canvas_plot.create_text(
@@ -559,59 +966,31 @@ class ImageBrowserApp:
                 fill="white",
             )
 
-    def display_image_on_canvas(self, path, canvas, is_main=True):
-        try:
-            img = Image.open(path)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to open image:\n{path}\n\n{e}")
+    def display_main_entry(self, path, entry):
+        """Main canvas from a DeedPrefetcher entry (PhotoImage: UI thread only)."""
+        if entry["main"] is None:
+            messagebox.showerror("Error", f"Failed to open image:\n{path}\n\n{entry['error']}")
             return
 
-        orig_w, orig_h = img.size
-
-        if is_main:
-            # Apply view_scale
-            scale = self.view_scale if self.view_scale else 1.0
-            if scale != 1.0:
-                new_w = max(1, int(orig_w * scale))
-                new_h = max(1, int(orig_h * scale))
-                img_disp = img.resize((new_w, new_h), Image.LANCZOS)
-            else:
-                img_disp = img
-
-            self.photo_main = ImageTk.PhotoImage(img_disp)
-            canvas.delete("all")
-            canvas.create_image(0, 0, image=self.photo_main, anchor="nw")
-            canvas.config(scrollregion=(0, 0, img_disp.width, img_disp.height))
-
-            # For coordinate transforms we keep original size and scale factor
-            self.main_img_size = (orig_w, orig_h)
-            self.main_scale = scale
-            self.main_offset = (0.0, 0.0)
+        img_disp = entry["main"]
+        self.photo_main = ImageTk.PhotoImage(img_disp)
+        canvas = self.canvas_main
+        canvas.delete("all")
+        canvas.create_image(0, 0, image=self.photo_main, anchor="nw")
+        canvas.config(scrollregion=(0, 0, img_disp.width, img_disp.height))
 
-    def display_table_image(self, path):
-        try:
-            img = Image.open(path)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to open image:\n{path}\n\n{e}")
-            return
+        # For coordinate transforms we keep original size and scale factor
+        self.main_img_size = entry["size"]
+        self.main_scale = self.view_scale if self.view_scale else 1.0
+        self.main_offset = (0.0, 0.0)
 
-        orig_w, orig_h = img.size
+    def display_table_image(self, img):
+        """img: *_table.jpg already fitted to the canvas (DeedPrefetcher)."""
         canvas = self.canvas_table
         canvas_width = max(canvas.winfo_width(), 200)
         canvas_height = max(canvas.winfo_height(), 100)
 
-        img_ratio = orig_w / orig_h
-        canvas_ratio = canvas_width / canvas_height
-
-        if img_ratio > canvas_ratio:
-            new_width = canvas_width
-            new_height = int(canvas_width / img_ratio)
-        else:
-            new_height = canvas_height
-            new_width = int(canvas_height * img_ratio)
-
-        img_resized = img.resize((new_width, new_height), Image.LANCZOS)
-        self.photo_table = ImageTk.PhotoImage(img_resized)
+        self.photo_table = ImageTk.PhotoImage(img)
 
         canvas.delete("all")
         canvas.create_image(
@@ -620,30 +999,13 @@ class ImageBrowserApp:
             image=self.photo_table,
         )
 
-    def display_plot_image(self, path):
-        try:
-            img = Image.open(path)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to open image:\n{path}\n\n{e}")
-            return
-
-        orig_w, orig_h = img.size
+    def display_plot_image(self, img):
+        """img: *_plot.png already fitted to the canvas (DeedPrefetcher)."""
         canvas = self.canvas_plot
         canvas_width = max(canvas.winfo_width(), 200)
         canvas_height = max(canvas.winfo_height(), 100)
 
-        img_ratio = orig_w / orig_h
-        canvas_ratio = canvas_width / canvas_height
-
-        if img_ratio > canvas_ratio:
-            new_width = canvas_width
-            new_height = int(canvas_width / img_ratio)
-        else:
-            new_height = canvas_height
-            new_width = int(canvas_height * img_ratio)
-
-        img_resized = img.resize((new_width, new_height), Image.LANCZOS)
-        self.photo_plot = ImageTk.PhotoImage(img_resized)
+        self.photo_plot = ImageTk.PhotoImage(img)
 
         canvas.delete("all")
         canvas.create_image(
@@ -798,14 +1160,39 @@ class ImageBrowserApp:
             "image": os.path.basename(rv_path),
             "rect": {"ul": [ulx, uly], "lr": [lrx, lry]},
         }
+        folder, fname = os.path.split(rv_path)
+        prefix = fname[:-len(RV_SUFFIX)]
 
         try:
-            with open(rect_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            with prefix_lock(folder, prefix, timeout=LOCK_TIMEOUT):
+                atomic_write_text(rect_path, json.dumps(data, indent=2))
             messagebox.showinfo("Saved", f"Wrote rectangle to:\n{rect_path}")
+        except LockTimeout:
+            messagebox.showwarning("Busy", f"{prefix} is being processed, try again.")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to write {rect_path}: {e}")
 
+    # ------------------------------------------------------------------
+    # Request OCR now (→ OCR_URGENT.txt read by RV25j_Process)
+    # ------------------------------------------------------------------
+    def request_ocr_now(self):
+        if self.df is None or self.current_idx is None:
+            messagebox.showwarning("No image", "No image selected.")
+            return
+
+        rv_path = self.df.iloc[self.current_idx]["rv_path"]
+        # "<subdir>/<prefix>": unique even when two folders share a prefix
+        prefix = os.path.relpath(rv_path, self.folder)[:-len(RV_SUFFIX)].replace(os.sep, "/")
+        urgent_path = os.path.join(self.folder, "OCR_URGENT.txt")
+
+        try:
+            with file_lock(urgent_path, timeout=LOCK_TIMEOUT):
+                with open(urgent_path, "a", encoding="utf-8") as f:
+                    f.write(prefix + "\n")
+            print(f"[URGENT] {prefix} → {urgent_path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to write {urgent_path}: {e}")
+
     # ------------------------------------------------------------------
     # Clip to *_table.jpg
     # ------------------------------------------------------------------
@@ -874,7 +1261,9 @@ class ImageBrowserApp:
             table_img = table_img.resize((new_w, new_h), Image.LANCZOS)
 
             try:
-                table_img.save(table_path, quality=95)
+                with prefix_lock(folder, prefix, timeout=LOCK_TIMEOUT):
+                    with atomic_path(table_path) as tmp:
+                        table_img.save(tmp, quality=95)
             except Exception as e:
                 print(f"❌ Failed to save {table_path}: {e}")
                 continue
@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RV25j_ParcelStore — compact columnar parcel store (memory-mappable)
+
+The *_MAPL1.toml / *_MAPL1x.toml files stay the editable source of truth;
+this store is a derived cache of their markers so that a cadastre build
+does not have to re-parse hundreds of thousands of small TOMLs:
+
+   <folder>/_parcel_store/
+       meta.json     version, default_epsg, files [File, ...] (store order),
+                     codes / markers (category lists), fingerprints per File
+       offsets.npy   int32   (P+1)  markers of parcel i = offsets[i]:offsets[i+1]
+       epsg.npy      int32   (P)
+       idx.npy       int32   (M)
+       code.npy      int32   (M)    → meta["codes"][code]
+       marker.npy    int32   (M)    → meta["markers"][marker]
+       north.npy     float64 (M)
+       east.npy      float64 (M)
+
+   - ParcelStore.update() re-parses only TOMLs whose fingerprint
+     (size, mtime_ns, content hash) changed; unchanged parcels are copied
+     from the previous arrays. Category lists are append-only.
+   - Arrays are opened with np.load(mmap_mode="r").
+   - Writers hold the _parcel_store lock (RV25j_SafeIO) and replace
+     each file atomically; meta.json is written last.
+
+Created by RV25j_Cadastre --store (opt-in), which reads it through
+MarkerLoader; once it exists RV25j_Process refreshes it after each run with
+the default_epsg it was built with.
+The TOML discovery / parsing helpers used by both live here as well.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from RV25j_SafeIO import atomic_path, atomic_write_text, file_lock
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    import tomli as tomllib  # fallback for older versions
+
+
+# =========================================
+# TOML discovery / parsing
+# =========================================
+
+def file_prefix(path: Path) -> str:
+    """
+    'p08_MAPL1x.toml' -> 'p08'
+    'p09_MAPL1.toml'  -> 'p09'
+    """
+    stem = path.stem  # e.g. "p08_MAPL1x"
+    for suf in ("_MAPL1x", "_MAPL1"):
+        if stem.endswith(suf):
+            return stem[:-len(suf)]
+    return stem
+
+
+def discover(folder: Path) -> dict:
+    """
+    One os.walk over the folder, collecting *_MAPL1.toml and
+    *_MAPL1x.toml together. Returns prefix_map[prefix] = {"x"|"base": Path}.
+    """
+    if not folder.is_dir():
+        raise NotADirectoryError(f"Folder not found: {folder}")
+
+    prefix_map = {}
+    n_found = 0
+    for root, _dirs, files in os.walk(folder):
+        for fname in files:
+            if fname.endswith("_MAPL1x.toml"):
+                prefix, key = fname[:-len("_MAPL1x.toml")], "x"
+            elif fname.endswith("_MAPL1.toml"):
+                prefix, key = fname[:-len("_MAPL1.toml")], "base"
+            else:
+                continue
+            n_found += 1
+            prefix_map.setdefault(prefix, {})[key] = Path(root) / fname
+
+    if not n_found:
+        raise FileNotFoundError(
+            f"No *_MAPL1.toml or *_MAPL1x.toml found under {folder}"
+        )
+    return prefix_map
+
+
+def choose(prefix_map: dict) -> list:
+    """Sorted [(File, Path)], preferring *_MAPL1x.toml per prefix."""
+    chosen = []
+    for prefix in sorted(prefix_map):
+        entry = prefix_map[prefix]
+        path = entry.get("x") or entry.get("base")
+        chosen.append((file_prefix(path), path))
+    return chosen
+
+
+def extract_epsg(toml_data: dict, default_epsg: int) -> int:
+    """Look for EPSG or crs inside [Deed] section."""
+    deed = toml_data.get("Deed") or toml_data.get("deed")
+    if not isinstance(deed, dict):
+        return default_epsg
+
+    epsg = deed.get("EPSG") or deed.get("epsg")
+    if epsg is None:
+        crs_val = deed.get("crs") or deed.get("CRS")
+        if crs_val is not None:
+            try:
+                epsg = int(crs_val)
+            except ValueError:
+                epsg = None
+    if epsg is None:
+        return default_epsg
+    return int(epsg)
+
+
+def extract_markers(toml_data: dict):
+    """
+    For this project we assume only one format:
+
+        [Deed]
+        marker = [
+          [1, "A", "s24", 711494.218, 810313.001],
+          [2, "B", "s18", 711510.841, 810323.391],
+          ...
+        ]
+
+    Interpreted as:
+        [idx, MARKER, code, NORTHING, EASTING]
+
+    Returns: list of dicts with keys:
+      "idx", "code", "MARKER", "NORTHING", "EASTING"
+    """
+    rows = []
+
+    deed = toml_data.get("Deed") or toml_data.get("deed")
+    if not isinstance(deed, dict):
+        return rows
+
+    marker_arr = deed.get("marker")
+    if not isinstance(marker_arr, list):
+        return rows
+
+    for entry in marker_arr:
+        if not isinstance(entry, (list, tuple)) or len(entry) < 5:
+            continue
+
+        idx_raw, marker_raw, code_raw, n_raw, e_raw = entry[:5]
+
+        try:
+            n_val = float(n_raw)
+            e_val = float(e_raw)
+        except Exception:
+            continue
+
+        rows.append(
+            {
+                "idx": idx_raw,
+                "code": code_raw,
+                "MARKER": marker_raw,
+                "NORTHING": n_val,
+                "EASTING": e_val,
+            }
+        )
+
+    return rows
+
+
+def marker_idx(value) -> int | None:
+    """idx as int (1, 1.0, "1" → 1); None when it is not an int32 integer."""
+    if isinstance(value, bool):
+        return None
+    try:
+        i = int(value.strip()) if isinstance(value, str) else int(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if i != value and not isinstance(value, str):  # 1.5
+        return None
+    return i if -(2**31) <= i < 2**31 else None
+
+
+def parse_marker_toml(path: Path, default_epsg: int):
+    """
+    Parse one TOML (module level so process pools can pickle it).
+    Returns (epsg, idx, code, MARKER, NORTHING, EASTING) lists, or an
+    error string (which skips only this deed). A non-integer idx (e.g. "12a"
+    in a hand-edited *_MAPL1x.toml) keeps the deed: the marker gets its row
+    ordinal (1-based) instead, with a [WARN].
+    """
+    try:
+        with path.open("rb") as fp:
+            data = tomllib.load(fp)
+    except Exception as e:
+        return f"[ERROR] reading {path}: {e}"
+
+    epsg = extract_epsg(data, default_epsg)
+    rows = extract_markers(data)
+    if not rows:
+        return f"[INFO] No marker data found in: {path}"
+    idx = [marker_idx(r["idx"]) for r in rows]
+    for pos, i in enumerate(idx):
+        if i is None:
+            print(
+                f"[WARN] {path}: marker idx {rows[pos]['idx']!r} is not an integer "
+                f"→ using row ordinal {pos + 1}"
+            )
+            idx[pos] = pos + 1
+    return (
+        epsg,
+        idx,
+        [r["code"] for r in rows],
+        [r["MARKER"] for r in rows],
+        [r["NORTHING"] for r in rows],
+        [r["EASTING"] for r in rows],
+    )
+
+
+def file_hash(path: Path) -> str:
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+def fingerprint(path: Path, old: dict | None = None) -> dict:
+    """
+    {"path", "size", "mtime_ns", "hash"}; the file is only read (hashed)
+    when size or mtime_ns differ from `old`.
+    """
+    st = path.stat()
+    fp = {"path": str(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if old and old["size"] == fp["size"] and old["mtime_ns"] == fp["mtime_ns"]:
+        fp["hash"] = old["hash"]
+    else:
+        fp["hash"] = file_hash(path)
+    return fp
+
+
+# =========================================
+# Compact marker columns
+# =========================================
+
+def marker_frame(files, counts, epsg, idx, code, codes, marker, markers, north, east):
+    """
+    df_ID75 in its compact form: File / code / MARKER are categoricals
+    (integer codes + one copy of each string), idx / EPSG int32,
+    NORTHING / EASTING float64. `files` must be sorted (File order).
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    file_codes = np.repeat(np.arange(len(files), dtype=np.int32), counts)
+    return pd.DataFrame(
+        {
+            "File": pd.Categorical.from_codes(file_codes, categories=pd.Index(files, dtype=object)),
+            "idx": np.asarray(idx, dtype=np.int32),
+            "code": pd.Categorical.from_codes(code, categories=pd.Index(codes, dtype=object)),
+            "MARKER": pd.Categorical.from_codes(marker, categories=pd.Index(markers, dtype=object)),
+            "NORTHING": np.asarray(north, dtype=np.float64),
+            "EASTING": np.asarray(east, dtype=np.float64),
+            "EPSG": np.repeat(np.asarray(epsg, dtype=np.int32), counts),
+        },
+        copy=False,
+    )
+
+
+class MarkerColumns:
+    """
+    Accumulates parsed TOMLs (parse_marker_toml results) column-wise:
+    code / MARKER are mapped to category ids on the fly, so no per-marker
+    string column is ever built. Python lists are flushed into NumPy
+    chunks every CHUNK markers to keep the peak small.
+    """
+
+    CHUNK = 1 << 16
+    COLUMNS = {
+        "idx": np.int32,
+        "code": np.int32,
+        "marker": np.int32,
+        "north": np.float64,
+        "east": np.float64,
+    }
+
+    def __init__(self, codes=(), markers=()):
+        self.code_id = {v: i for i, v in enumerate(codes)}
+        self.marker_id = {v: i for i, v in enumerate(markers)}
+        self.files, self.counts, self.epsg = [], [], []
+        self.idx, self.code, self.marker, self.north, self.east = [], [], [], [], []
+        self.chunks = {name: [] for name in self.COLUMNS}
+        self.n_flushed = 0
+
+    def __len__(self):
+        return self.n_flushed + len(self.idx)
+
+    def _flush(self):
+        self.n_flushed += len(self.idx)
+        for name, dt in self.COLUMNS.items():
+            self.chunks[name].append(np.asarray(getattr(self, name), dtype=dt))
+            setattr(self, name, [])
+
+    def add(self, file: str, res):
+        epsg, idx, code, marker, north, east = res
+        code_id, marker_id = self.code_id, self.marker_id
+        self.files.append(file)
+        self.counts.append(len(idx))
+        self.epsg.append(epsg)
+        self.idx.extend(idx)
+        self.code.extend(code_id.setdefault(c, len(code_id)) for c in code)
+        self.marker.extend(marker_id.setdefault(m, len(marker_id)) for m in marker)
+        self.north.extend(north)
+        self.east.extend(east)
+        if len(self.idx) >= self.CHUNK:
+            self._flush()
+
+    @property
+    def codes(self):
+        return list(self.code_id)
+
+    @property
+    def markers(self):
+        return list(self.marker_id)
+
+    def arrays(self) -> dict:
+        """Store arrays (without offsets) + per-parcel counts."""
+        self._flush()
+        out = {
+            "counts": np.asarray(self.counts, dtype=np.int64),
+            "epsg": np.asarray(self.epsg, dtype=np.int32),
+        }
+        for name, dt in self.COLUMNS.items():
+            chunks = self.chunks[name]
+            out[name] = chunks[0] if len(chunks) == 1 else np.concatenate(chunks or [np.empty(0, dt)])
+            self.chunks[name] = [out[name]]
+        return out
+
+    def to_frame(self) -> pd.DataFrame:
+        a = self.arrays()
+        return marker_frame(
+            self.files, a["counts"], a["epsg"], a["idx"],
+            a["code"], self.codes, a["marker"], self.markers,
+            a["north"], a["east"],
+        )
+
+
+# =========================================
+# ParcelStore
+# =========================================
+
+class ParcelStore:
+    DIRNAME = "_parcel_store"
+    VERSION = 1
+    ARRAYS = {
+        "offsets": np.int32,
+        "epsg": np.int32,
+        "idx": np.int32,
+        "code": np.int32,
+        "marker": np.int32,
+        "north": np.float64,
+        "east": np.float64,
+    }
+    MARKER_ARRAYS = ("idx", "code", "marker", "north", "east")
+
+    def __init__(self, folder: Path):
+        self.folder = Path(folder)
+        self.path = self.folder / self.DIRNAME
+        self.meta = None
+        self.arrays = None
+
+    def exists(self) -> bool:
+        return (self.path / "meta.json").is_file()
+
+    def built_epsg(self) -> int | None:
+        """default_epsg the store was built with (None when there is no store)."""
+        meta = self._read_meta()
+        return None if meta is None else meta.get("default_epsg")
+
+    def _read_meta(self):
+        try:
+            return json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _map(self):
+        """Memory-map all arrays (caller holds the lock)."""
+        meta = self._read_meta()
+        if meta is None or meta.get("version") != self.VERSION:
+            raise FileNotFoundError(f"No parcel store in {self.folder}")
+        self.meta = meta
+        self.arrays = {
+            name: np.load(self.path / f"{name}.npy", mmap_mode="r")
+            for name in self.ARRAYS
+        }
+        return self
+
+    def open(self):
+        with file_lock(self.path, shared=True):
+            return self._map()
+
+    @property
+    def n_parcels(self) -> int:
+        return len(self.meta["files"])
+
+    @property
+    def n_markers(self) -> int:
+        return int(self.arrays["offsets"][-1])
+
+    # ---------- build / update ----------
+
+    def update(self, default_epsg: int, workers: int | None = None):
+        """
+        Bring the store in line with the TOMLs under folder; re-parse only
+        new or changed files. Returns self, mapped.
+        """
+        t0 = time.perf_counter()
+        self.path.mkdir(exist_ok=True)
+        with file_lock(self.path):
+            meta = self._read_meta()
+            if (
+                meta is None
+                or meta.get("version") != self.VERSION
+                or meta.get("default_epsg") != default_epsg
+            ):
+                meta = None
+                old = None
+            else:
+                old = self._map()
+
+            chosen = choose(discover(self.folder))
+            old_fps = meta["fingerprints"] if meta else {}
+            old_pos = {f: i for i, f in enumerate(meta["files"])} if meta else {}
+
+            fps, keep, parse = {}, {}, []
+            for f, path in chosen:
+                fp = fingerprint(path, old_fps.get(f))
+                prev = old_fps.get(f)
+                if prev is not None and prev["hash"] == fp["hash"]:
+                    fps[f] = fp
+                    if f in old_pos:
+                        keep[f] = old_pos[f]
+                else:
+                    parse.append((f, path, fp))
+
+            if meta is not None and not parse and fps == old_fps:
+                print(
+                    f"[STORE] up to date: {len(meta['files'])} parcels "
+                    f"({time.perf_counter() - t0:.2f} s)"
+                )
+                return self
+
+            with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 4)) as pool:
+                results = list(
+                    pool.map(
+                        parse_marker_toml,
+                        [p for _, p, _ in parse],
+                        [default_epsg] * len(parse),
+                    )
+                )
+            t1 = time.perf_counter()
+
+            self._rebuild(default_epsg, chosen, old, keep, parse, results, fps)
+            print(
+                f"[STORE] {self.path}: {len(self.meta['files'])} parcels, "
+                f"{self.n_markers} markers; re-parsed {len(parse)} TOMLs "
+                f"(parse {t1 - t0:.2f} s, write {time.perf_counter() - t1:.2f} s)"
+            )
+            return self
+
+    def _rebuild(self, default_epsg, chosen, old, keep, parse, results, fps):
+        # newly parsed parcels → columns (appended after the old markers)
+        acc = MarkerColumns(
+            old.meta["codes"] if old else (), old.meta["markers"] if old else ()
+        )
+        for (f, path, fp), res in zip(parse, results):
+            if isinstance(res, str):
+                print(res)
+                if res.startswith("[INFO]"):
+                    fps[f] = fp  # no markers: remember, do not re-parse
+                continue
+            acc.add(f, res)
+            fps[f] = fp
+        new_pos = {f: i for i, f in enumerate(acc.files)}
+        cols = acc.arrays()
+        codes, markers = acc.codes, acc.markers
+
+        # pool = old markers + new markers; parcels gathered in File order
+        new_cnt = cols["counts"]
+        new_start = np.cumsum(new_cnt) - new_cnt
+        new_epsg = cols["epsg"]
+        if old:
+            old_off = np.asarray(old.arrays["offsets"], dtype=np.int64)
+            old_cnt = np.diff(old_off)
+            pool = {
+                name: np.concatenate([np.asarray(old.arrays[name]), cols[name]])
+                for name in self.MARKER_ARRAYS
+            }
+            pool_start = np.concatenate([old_off[:-1], old_off[-1] + new_start])
+            pool_cnt = np.concatenate([old_cnt, new_cnt])
+            pool_epsg = np.concatenate([np.asarray(old.arrays["epsg"]), new_epsg])
+            n_old = len(old_cnt)
+        else:
+            pool = {name: cols[name] for name in self.MARKER_ARRAYS}
+            pool_start = new_start
+            pool_cnt = new_cnt
+            pool_epsg = new_epsg
+            n_old = 0
+        # release the old memory maps before the files are replaced
+        self.arrays = None
+        del old
+
+        files, order = [], []
+        for f, _ in chosen:
+            if f in new_pos:
+                files.append(f)
+                order.append(n_old + new_pos[f])
+            elif f in keep:
+                files.append(f)
+                order.append(keep[f])
+        order = np.asarray(order, dtype=np.int64)
+
+        cnt = pool_cnt[order]
+        offsets = np.zeros(len(order) + 1, dtype=np.int64)
+        np.cumsum(cnt, out=offsets[1:])
+        if offsets[-1] > np.iinfo(np.int32).max:
+            raise OverflowError("Parcel store exceeds 2^31 markers")
+        # marker gather index: ranges pool_start[order[i]] : + cnt[i]
+        gather = np.repeat(pool_start[order] - offsets[:-1], cnt) + np.arange(offsets[-1])
+
+        out = {name: pool[name][gather] for name in self.MARKER_ARRAYS}
+        out["offsets"] = offsets.astype(np.int32)
+        out["epsg"] = pool_epsg[order]
+
+        for name, dt in self.ARRAYS.items():
+            with atomic_path(self.path / f"{name}.npy") as tmp:
+                np.save(tmp, np.ascontiguousarray(out[name], dtype=dt))
+
+        meta = {
+            "version": self.VERSION,
+            "default_epsg": default_epsg,
+            "files": files,
+            "codes": codes,
+            "markers": markers,
+            "fingerprints": fps,
+        }
+        atomic_write_text(self.path / "meta.json", json.dumps(meta, ensure_ascii=False))
+        self._map()
+
+    # ---------- read ----------
+
+    def to_frame(self, lo: int = 0, hi: int | None = None) -> pd.DataFrame:
+        """
+        df_ID75 (File, idx, code, MARKER, NORTHING, EASTING, EPSG) of
+        parcels lo:hi; only that slice of the mapped arrays is read.
+        """
+        a = self.arrays
+        hi = self.n_parcels if hi is None else min(hi, self.n_parcels)
+        off = a["offsets"][lo:hi + 1]
+        m = slice(int(off[0]), int(off[-1])) if len(off) else slice(0, 0)
+        return marker_frame(
+            self.meta["files"][lo:hi], np.diff(off), a["epsg"][lo:hi], np.array(a["idx"][m]),
+            np.array(a["code"][m]), self.meta["codes"], np.array(a["marker"][m]), self.meta["markers"],
+            np.array(a["north"][m]), np.array(a["east"][m]),
+        )
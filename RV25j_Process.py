@@ -5,29 +5,61 @@ RV25J_Process OCR Pipeline and data processing
 Author: Improved for modular maintainability
 
 Pipeline:
-   *_table.jpg  →  OCR (PP-Structure) or existing *_tblXX.md
+   *_table.jpg  →  (optional) perceptual-hash dedup of repeated pages
+                →  priority scheduling (operator / edited / new / reprocess)
+                →  OCR backend ([OCR].backend) or existing *_tblXX.md
                  →  parse HTML/MD table
                  →  clean numeric
                  →  detect closure
                  →  *_MAPL1.toml
                  →  *_plot.png
+                →  _parcel_store/ (compact marker arrays for RV25j_Cadastre)
 
 NOTE:
    - CONFIG.toml is MANDATORY in the root folder.
    - [Deed].EPSG and [Deed].Survey_Type are copied into the output TOML.
    - [META].DOL_Office is copied into the output TOML.
+   - [OCR].backend selects the OCR engine (default "ppstructure"):
+        ppstructure  PaddleOCR PP-StructureV3 table recognition
+        paddle_text  PaddleOCR text-only; lines re-assembled into a table
+        stub         replay stored *_tblXX.md after [OCR].stub_latency sec
+                     (no Paddle needed; for throughput benchmarks)
+   - "<subdir>/<prefix>" lines (relative to the root; a bare prefix also
+     works when it is unique) appended to <folder>/OCR_URGENT.txt, e.g. by
+     the "Request OCR" button in RV25j_Center, jump to the front of a
+     running batch.
+   - After the batch the folder's parcel store (RV25j_ParcelStore), if
+     RV25j_Cadastre --store created one, is brought up to date; only
+     changed *_MAPL1(x).toml are re-parsed.
+   - All outputs are written atomically (RV25j_SafeIO) and per-prefix
+     outputs under the <prefix> lock, so RV25j_Center / RV25j_Cadastre can
+     run on the same folder at the same time.
 """
 
 import argparse
+import heapq
+import html
+import json
 import re
+import time
+from abc import ABC, abstractmethod
 from pathlib import Path
 from io import StringIO
 
 import pandas as pd
 from bs4 import BeautifulSoup
-from paddleocr import PPStructureV3
+from PIL import Image
 import matplotlib.pyplot as plt
 
+from RV25j_SafeIO import (
+    atomic_path,
+    atomic_write_bytes,
+    atomic_write_text,
+    file_lock,
+    prefix_lock,
+)
+from RV25j_ParcelStore import ParcelStore
+
 # ---- TOML reader (Python 3.11+ or older with tomli) -----------------
 try:
     import tomllib  # Python 3.11+
@@ -35,13 +67,460 @@ except ModuleNotFoundError:  # older Python
     import tomli as tomllib  # type: ignore
 
 
+# ============================================================
+# Perceptual-hash dedup of repeated deed pages
+# ============================================================
+class PageDeduper:
+    """
+    Group near-identical *_table.jpg pages (re-scans, copies filed in
+    several folders) by a 256-bit difference hash (dHash, 16x16). Table
+    crops share the same grid layout, so 8x8 hashes are too coarse to
+    tell different deeds apart.
+
+    Pages whose hashes differ by at most `max_dist` bits form one cluster.
+    The first page of a cluster (in sorted path order) is the representative
+    and is the only one sent to OCR; the others reuse its *_tblXX.md.
+
+    Candidate pairs are found by splitting the hash into `max_dist + 1`
+    bands: two hashes within `max_dist` bits must agree exactly on at
+    least one band, so only pages sharing a band are compared.
+    """
+
+    HASH_SIZE = 16  # 16x16 → 256 bits
+    HASH_BITS = HASH_SIZE * HASH_SIZE
+
+    def __init__(self, max_dist: int = 8):
+        self.max_dist = max(0, min(int(max_dist), self.HASH_BITS // 8))
+
+    # -----------------------------------------------------------
+    def dhash(self, image_path: Path) -> int:
+        size = self.HASH_SIZE
+        with Image.open(image_path) as img:
+            gray = img.convert("L").resize((size + 1, size), Image.LANCZOS)
+            px = gray.tobytes()
+
+        bits = 0
+        for row in range(size):
+            base = row * (size + 1)
+            for col in range(size):
+                bits = (bits << 1) | (px[base + col] > px[base + col + 1])
+        return bits
+
+    # -----------------------------------------------------------
+    def _bands(self, h: int):
+        n_bands = self.max_dist + 1
+        width = self.HASH_BITS // n_bands
+        for b in range(n_bands):
+            lo = b * width
+            hi = self.HASH_BITS if b == n_bands - 1 else lo + width
+            yield b, (h >> lo) & ((1 << (hi - lo)) - 1)
+
+    # -----------------------------------------------------------
+    def find_clusters(self, images: list) -> dict:
+        """
+        Return {representative Path: [duplicate Path, ...]} for every
+        cluster with at least one duplicate. `images` must be sorted.
+        """
+        hashes = {}
+        for img in images:
+            try:
+                hashes[img] = self.dhash(img)
+            except Exception as e:
+                print(f"[WARN] dHash failed {img}: {e}")
+
+        paths = list(hashes)
+        parent = list(range(len(paths)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        buckets = {}
+        for i, img in enumerate(paths):
+            for key in self._bands(hashes[img]):
+                buckets.setdefault(key, []).append(i)
+
+        for members in buckets.values():
+            for a_pos, a in enumerate(members):
+                for b in members[a_pos + 1:]:
+                    ra, rb = find(a), find(b)
+                    if ra == rb:
+                        continue
+                    dist = bin(hashes[paths[a]] ^ hashes[paths[b]]).count("1")
+                    if dist <= self.max_dist:
+                        # keep the lowest index (sorted order) as root
+                        parent[max(ra, rb)] = min(ra, rb)
+
+        clusters = {}
+        for i, img in enumerate(paths):
+            root = find(i)
+            if root != i:
+                clusters.setdefault(paths[root], []).append(img)
+
+        self.hashes = hashes
+        return clusters
+
+    # -----------------------------------------------------------
+    def write_report(self, clusters: dict, report_path: Path, root: Path):
+        report = []
+        for rep, dups in clusters.items():
+            report.append(
+                {
+                    "representative": str(rep.relative_to(root)),
+                    "dhash": f"{self.hashes[rep]:064x}",
+                    "duplicates": [
+                        {
+                            "image": str(d.relative_to(root)),
+                            "dhash": f"{self.hashes[d]:064x}",
+                            "distance": bin(self.hashes[rep] ^ self.hashes[d]).count("1"),
+                        }
+                        for d in dups
+                    ],
+                }
+            )
+        data = {
+            "max_dist": self.max_dist,
+            "pages": len(self.hashes),
+            "clusters": len(report),
+            "ocr_saved": sum(len(c["duplicates"]) for c in report),
+            "cluster": report,
+        }
+        atomic_write_text(report_path, json.dumps(data, indent=2))
+        print(f"[OK] Dedup report → {report_path}")
+
+
+# ============================================================
+# OCR backends
+# ============================================================
+class OCRBackend(ABC):
+    """
+    Turn one *_table.jpg into <prefix>_tblXX.md files (HTML <table> inside),
+    which RV25jProcessor.parse_markdown_table then parses.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def predict_md(self, image_path: Path, prefix: str) -> list:
+        """Return the list of *_tblXX.md paths written for image_path."""
+
+
+class PPStructureBackend(OCRBackend):
+    """PaddleOCR Thai PP-StructureV3 with table recognition."""
+
+    name = "ppstructure"
+
+    def __init__(self):
+        from paddleocr import PPStructureV3
+
+        print("[INFO] Init PaddleOCR Thai PP-StructureV3...")
+        self.pipeline = PPStructureV3(
+            lang="th",
+            use_doc_orientation_classify=False,
+            use_doc_unwarping=False,
+            use_textline_orientation=False,
+            use_table_recognition=True,
+        )
+
+    def predict_md(self, image_path: Path, prefix: str) -> list:
+        out_img_dir = image_path.parent / "imgs"
+        out_img_dir.mkdir(exist_ok=True)
+
+        md_files = []
+        for i, res in enumerate(self.pipeline.predict(str(image_path))):
+            md_file = image_path.parent / f"{prefix}_tbl{i:02d}.md"
+            with atomic_path(md_file) as tmp:
+                res.save_to_markdown(save_path=str(tmp))
+            res.save_to_img(save_path=str(out_img_dir))
+            md_files.append(md_file)
+        return md_files
+
+
+class PaddleTextBackend(OCRBackend):
+    """
+    Lighter text-only PaddleOCR (detection + recognition, no layout/table
+    models). Recognised boxes are grouped into rows by their vertical
+    centre and into columns by the x-centres of the widest row, then
+    written as a single <prefix>_tbl00.md HTML table.
+    """
+
+    name = "paddle_text"
+
+    def __init__(self):
+        from paddleocr import PaddleOCR
+
+        print("[INFO] Init PaddleOCR Thai text-only...")
+        self.ocr = PaddleOCR(
+            lang="th",
+            use_doc_orientation_classify=False,
+            use_doc_unwarping=False,
+            use_textline_orientation=False,
+        )
+
+    @staticmethod
+    def boxes_to_rows(texts: list, boxes: list) -> list:
+        cells = []
+        for text, (x1, y1, x2, y2) in zip(texts, boxes):
+            cells.append(((x1 + x2) / 2, (y1 + y2) / 2, y2 - y1, str(text)))
+        if not cells:
+            return []
+
+        # rows: start a new row when the centre drops > half a line height
+        cells.sort(key=lambda c: c[1])
+        heights = sorted(c[2] for c in cells)
+        half_line = max(heights[len(heights) // 2] / 2, 1.0)
+        rows, row = [], [cells[0]]
+        for c in cells[1:]:
+            if c[1] - row[-1][1] > half_line:
+                rows.append(row)
+                row = []
+            row.append(c)
+        rows.append(row)
+
+        # columns: anchor on the row with most cells, snap others to nearest
+        anchors = sorted(c[0] for c in max(rows, key=len))
+        table = []
+        for row in rows:
+            out = [""] * len(anchors)
+            for cx, _, _, text in sorted(row):
+                col = min(range(len(anchors)), key=lambda k: abs(anchors[k] - cx))
+                out[col] = f"{out[col]} {text}".strip()
+            table.append(out)
+        return table
+
+    def predict_md(self, image_path: Path, prefix: str) -> list:
+        md_files = []
+        for i, res in enumerate(self.ocr.predict(str(image_path))):
+            rows = self.boxes_to_rows(res["rec_texts"], res["rec_boxes"])
+            body = "".join(
+                "<tr>" + "".join(f"<td>{html.escape(c)}</td>" for c in r) + "</tr>" for r in rows
+            )
+            md_file = image_path.parent / f"{prefix}_tbl{i:02d}.md"
+            atomic_write_text(
+                md_file, f"<table border=\"1\"><tbody>{body}</tbody></table>"
+            )
+            md_files.append(md_file)
+        return md_files
+
+
+class StubBackend(OCRBackend):
+    """
+    Deterministic stand-in: sleep `latency` seconds per page, then replay
+    the stored <prefix>_tblXX.md of that deed only: from the image's folder,
+    or with `replay_dir` from replay_dir/<deed folder> (else replay_dir
+    itself). Lets parsing/writing/plotting be load-tested without Paddle.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency: float = 0.0, replay_dir: str | None = None):
+        self.latency = float(latency)
+        self.replay_dir = Path(replay_dir) if replay_dir else None
+        print(f"[INFO] Init stub OCR backend (latency={self.latency}s)")
+
+    def predict_md(self, image_path: Path, prefix: str) -> list:
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        src_dir = image_path.parent
+        if self.replay_dir is not None:
+            deed_dir = self.replay_dir / image_path.parent.name
+            src_dir = deed_dir if deed_dir.is_dir() else self.replay_dir
+        md_files = []
+        for md in sorted(src_dir.glob(f"{prefix}_tbl*.md")):
+            dst = image_path.parent / md.name
+            if dst != md:
+                atomic_write_bytes(dst, md.read_bytes())
+            md_files.append(dst)
+        if not md_files:
+            print(f"[WARN] Stub OCR: no stored {prefix}_tblXX.md under {src_dir}")
+        return md_files
+
+
+OCR_BACKENDS = {
+    PPStructureBackend.name: PPStructureBackend,
+    PaddleTextBackend.name: PaddleTextBackend,
+    StubBackend.name: StubBackend,
+}
+
+
+def make_ocr_backend(ocr_cfg: dict) -> OCRBackend:
+    """Build the backend named by CONFIG.toml [OCR].backend."""
+    name = str(ocr_cfg.get("backend", PPStructureBackend.name)).strip().lower()
+    if name not in OCR_BACKENDS:
+        raise SystemExit(
+            f"[FATAL] Unknown [OCR].backend = {name!r}; "
+            f"choose one of {', '.join(OCR_BACKENDS)}"
+        )
+    if name == StubBackend.name:
+        return StubBackend(
+            latency=ocr_cfg.get("stub_latency", 0.0),
+            replay_dir=ocr_cfg.get("stub_replay_dir"),
+        )
+    return OCR_BACKENDS[name]()
+
+
+# ============================================================
+# Priority scheduler for the OCR work queue
+# ============================================================
+class OCRScheduler:
+    """
+    Order *_table.jpg work by priority class (lower runs first):
+
+        0 operator   "<subdir>/<prefix>" (or bare prefix) in <root>/OCR_URGENT.txt
+        1 edited     *_rect.json / *_table.jpg newer than *_MAPL1.toml
+        2 new        no *_MAPL1.toml yet
+        3 reprocess  everything else
+
+    OCR_URGENT.txt is re-read before every pop(), so an operator can push
+    a prefix to the front while a batch is running. Latency (enqueue →
+    done) is collected per class and printed by report().
+    """
+
+    CLASS_NAMES = ("operator", "edited", "new", "reprocess")
+    OPERATOR, EDITED, NEW, REPROCESS = range(4)
+    URGENT_FILE = "OCR_URGENT.txt"
+
+    def __init__(self, root: Path, images: list, get_prefix):
+        self.root = root
+        self.get_prefix = get_prefix
+        # "<subdir>/<prefix>" (relative to root) is unique; a bare prefix
+        # may name deeds in several folders
+        self.by_key = {}
+        for img in images:
+            self.by_key.setdefault(get_prefix(img), []).append(img)
+        for img in images:
+            key = self.rel_key(img)
+            if key != get_prefix(img):  # root-folder deeds: same as the prefix
+                self.by_key[key] = [img]
+        self._heap = []
+        self._entry = {}    # img -> live heap entry (stale entries are skipped)
+        self._seq = 0
+        self._active = {}   # img -> (class, enqueue time)
+        self.latency = {name: [] for name in self.CLASS_NAMES}
+
+        urgent = set()
+        for key in self._read_urgent():
+            urgent.update(self.lookup(key))
+        for img in images:
+            cls = self.OPERATOR if img in urgent else self.classify(img)
+            self.push(img, cls)
+
+    def rel_key(self, img: Path) -> str:
+        rel = img.parent.relative_to(self.root) / self.get_prefix(img)
+        return rel.as_posix()
+
+    def lookup(self, key: str) -> list:
+        """Images for an OCR_URGENT.txt line ("<subdir>/<prefix>" or bare prefix)."""
+        imgs = self.by_key.get(key.replace("\\", "/").strip("/"), [])
+        if len(imgs) > 1:
+            print(
+                f"[WARN] Urgent prefix {key!r} matches {len(imgs)} deeds "
+                f"({', '.join(self.rel_key(i) for i in imgs)}); all queued first"
+            )
+        return imgs
+
+    # -----------------------------------------------------------
+    def classify(self, img: Path) -> int:
+        prefix = self.get_prefix(img)
+        toml_path = img.with_name(f"{prefix}_MAPL1.toml")
+        if not toml_path.is_file():
+            return self.NEW
+
+        t_out = toml_path.stat().st_mtime
+        for src in (img, img.with_name(f"{prefix}_rect.json")):
+            if src.is_file() and src.stat().st_mtime > t_out:
+                return self.EDITED
+        return self.REPROCESS
+
+    # -----------------------------------------------------------
+    def push(self, img: Path, cls: int):
+        old = self._entry.get(img)
+        if old is not None:
+            if old[0] <= cls:
+                return
+            old[2] = None  # invalidate, re-push at higher priority
+        entry = [cls, self._seq, img]
+        self._seq += 1
+        self._entry[img] = entry
+        heapq.heappush(self._heap, entry)
+        self._active[img] = (cls, time.perf_counter())
+
+    # -----------------------------------------------------------
+    def _read_urgent(self) -> list:
+        urgent_path = self.root / self.URGENT_FILE
+        if not urgent_path.is_file():
+            return []
+
+        # same lock as RV25j_Center.request_ocr_now → no lost appends
+        try:
+            with file_lock(urgent_path, timeout=5):
+                text = urgent_path.read_text(encoding="utf-8")
+                urgent_path.unlink()
+        except OSError as e:
+            print(f"[WARN] Cannot read {urgent_path}: {e}")
+            return []
+        return [line.strip() for line in text.splitlines() if line.strip()]
+
+    def poll_urgent(self):
+        for key in self._read_urgent():
+            imgs = self.lookup(key)
+            if not imgs:
+                print(f"[WARN] Urgent prefix not in batch: {key}")
+                continue
+            print(f"[INFO] Urgent request → front of queue: {key}")
+            for img in imgs:
+                self.push(img, self.OPERATOR)
+
+    # -----------------------------------------------------------
+    def pop(self):
+        """Return (img, class name) of the next job, or None when empty."""
+        self.poll_urgent()
+        while self._heap:
+            cls, _, img = heapq.heappop(self._heap)
+            if img is None:
+                continue
+            del self._entry[img]
+            return img, self.CLASS_NAMES[cls]
+        return None
+
+    def done(self, img: Path):
+        cls, t0 = self._active.pop(img)
+        self.latency[self.CLASS_NAMES[cls]].append(time.perf_counter() - t0)
+
+    # -----------------------------------------------------------
+    def report(self):
+        print("\n[STATS] Latency per priority class (enqueue → done, sec)")
+        for name in self.CLASS_NAMES:
+            lat = sorted(self.latency[name])
+            if not lat:
+                continue
+            p50 = lat[len(lat) // 2]
+            p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))]
+            print(
+                f"   {name:<10} n={len(lat):<6} mean={sum(lat) / len(lat):8.2f} "
+                f"p50={p50:8.2f} p95={p95:8.2f} max={lat[-1]:8.2f}"
+            )
+
+
 class RV25jProcessor:
     COLUMN_SPEC = "MARKER,,NORTHING,EASTING".split(",")
 
-    def __init__(self, root_folder: str, skip_ocr: bool = False):
+    def __init__(
+        self,
+        root_folder: str,
+        skip_ocr: bool = False,
+        dedup_dist: int | None = None,
+        ocr_backend: str | None = None,
+        update_store: bool = True,
+    ):
         self.root = Path(root_folder)
         self.skip_ocr = skip_ocr
-        self.pipeline = None
+        self.update_store = update_store
+        self.dedup_dist = dedup_dist
+        self.backend = None
         self.config = {}
 
         if not self.root.is_dir():
@@ -62,17 +541,13 @@ class RV25jProcessor:
             raise SystemExit(f"[FATAL] Failed to read/parse CONFIG.toml → {e}")
 
         # -------------------------------
-        # Init OCR pipeline (if needed)
+        # Init OCR backend (if needed)
         # -------------------------------
         if not self.skip_ocr:
-            print("[INFO] Init PaddleOCR Thai PP-StructureV3...")
-            self.pipeline = PPStructureV3(
-                lang="th",
-                use_doc_orientation_classify=False,
-                use_doc_unwarping=False,
-                use_textline_orientation=False,
-                use_table_recognition=True,
-            )
+            ocr_cfg = dict(self.config.get("OCR", {}))
+            if ocr_backend:
+                ocr_cfg["backend"] = ocr_backend
+            self.backend = make_ocr_backend(ocr_cfg)
 
     # -----------------------------------------------------------
     def get_prefix(self, image_path: Path) -> str:
@@ -137,18 +612,12 @@ class RV25jProcessor:
     # -----------------------------------------------------------
     def run_ocr(self, image_path: Path) -> pd.DataFrame:
         prefix = self.get_prefix(image_path)
-        out_img_dir = image_path.parent / "imgs"
-        out_img_dir.mkdir(exist_ok=True)
 
-        print(f"\n[INFO] OCR: {image_path}")
-        outputs = self.pipeline.predict(str(image_path))
+        print(f"\n[INFO] OCR ({self.backend.name}): {image_path}")
+        md_files = self.backend.predict_md(image_path, prefix)
 
         dfs = []
-        for i, res in enumerate(outputs):
-            md_file = image_path.parent / f"{prefix}_tbl{i:02d}.md"
-            res.save_to_markdown(save_path=str(md_file))
-            res.save_to_img(save_path=str(out_img_dir))
-
+        for md_file in md_files:
             df = self.parse_markdown_table(md_file)
             if not df.empty:
                 dfs.append(df)
@@ -176,6 +645,24 @@ class RV25jProcessor:
             else pd.DataFrame(columns=self.COLUMN_SPEC)
         )
 
+    # -----------------------------------------------------------
+    def link_duplicate_md(self, rep_path: Path, image_path: Path) -> pd.DataFrame:
+        """
+        Copy the already-OCR'd page's *_tblXX.md next to the duplicate page
+        (as <dup_prefix>_tblXX.md) and parse them instead of running OCR.
+        """
+        rep_prefix = self.get_prefix(rep_path)
+        prefix = self.get_prefix(image_path)
+        print(f"\n[INFO] Duplicate of {rep_path} → reuse OCR result")
+
+        for md in sorted(rep_path.parent.glob(f"{rep_prefix}_tbl*.md")):
+            suffix = md.name[len(rep_prefix):]  # "_tbl00.md"
+            dst = image_path.parent / f"{prefix}{suffix}"
+            if dst != md:
+                atomic_write_bytes(dst, md.read_bytes())
+
+        return self.parse_existing_md(image_path)
+
     # -----------------------------------------------------------
     def _toml_escape(self, s: str) -> str:
         return s.replace("\\", "\\\\").replace('"', '\\"')
@@ -294,7 +781,7 @@ class RV25jProcessor:
             )
         lines.append("]")
 
-        toml_path.write_text("\n".join(lines), encoding="utf-8")
+        atomic_write_text(toml_path, "\n".join(lines))
         print(f"[OK] TOML → {toml_path}")
         return vertices, polygon_closed
 
@@ -377,7 +864,8 @@ class RV25jProcessor:
         ax.set_ylabel("NORTHING (m)")
         ax.set_title(prefix)
         plt.tight_layout()
-        plt.savefig(out_png, dpi=200)
+        with atomic_path(out_png) as tmp:
+            plt.savefig(tmp, dpi=200)
         plt.close()
         print(f"[OK] Plot → {out_png}")
 
@@ -389,37 +877,90 @@ class RV25jProcessor:
 
         print(f"[INFO] Found {len(images)} files")
 
-        for img in images:
-            print("\n" + "=" * 70)
-            print(f"[PROCESS] {img}")
+        # 0) Perceptual-hash dedup (only worth it when OCR actually runs)
+        dup_of = {}
+        if self.dedup_dist is not None and not self.skip_ocr:
+            deduper = PageDeduper(self.dedup_dist)
+            clusters = deduper.find_clusters(images)
+            for rep, dups in clusters.items():
+                for d in dups:
+                    dup_of[d] = rep
+            print(
+                f"[INFO] Dedup: {len(clusters)} clusters, "
+                f"{len(dup_of)} of {len(images)} pages skip OCR"
+            )
+            deduper.write_report(clusters, self.root / "dedup_report.json", self.root)
 
-            # 1) OCR or existing MD → DataFrame
-            df = self.parse_existing_md(img) if self.skip_ocr else self.run_ocr(img)
+        scheduler = OCRScheduler(self.root, images, self.get_prefix)
+        ocr_source = {}  # cluster representative -> page whose MD is available
 
-            vertices_ocr = []
-            if df.empty:
-                print("[WARN] Empty DF from OCR/MD")
-            else:
-                vertices_ocr, closed = self.write_toml(img, df)
+        while True:
+            job = scheduler.pop()
+            if job is None:
+                break
+            img, priority = job
 
-            # 2) Try side TOML override
-            vertices_edited = self.load_vertices_from_edit_toml(img)
+            print("\n" + "=" * 70)
+            print(f"[PROCESS] {img}  ({priority})")
 
-            if vertices_edited:
-                prefix = self.get_prefix(img)
-                print(
-                    f"[WARN] Plotting polygon from {prefix}_MAPL1x.toml "
-                    "(edited file override)."
-                )
-                self.plot_polygon(img, vertices_edited, "pink")
-            elif vertices_ocr:
-                self.plot_polygon(img, vertices_ocr, "white")
+            # 1) OCR or existing MD → DataFrame
+            cluster = dup_of.get(img, img)
+            if self.skip_ocr:
+                df = self.parse_existing_md(img)
+            elif ocr_source.get(cluster, img) != img:
+                df = self.link_duplicate_md(ocr_source[cluster], img)
             else:
-                print("[WARN] No vertices available → no plot")
+                df = self.run_ocr(img)
+                ocr_source[cluster] = img
+
+            prefix = self.get_prefix(img)
+            with prefix_lock(img.parent, prefix):
+                vertices_ocr = []
+                if df.empty:
+                    print("[WARN] Empty DF from OCR/MD")
+                else:
+                    vertices_ocr, closed = self.write_toml(img, df)
+
+                # 2) Try side TOML override
+                vertices_edited = self.load_vertices_from_edit_toml(img)
+
+                if vertices_edited:
+                    print(
+                        f"[WARN] Plotting polygon from {prefix}_MAPL1x.toml "
+                        "(edited file override)."
+                    )
+                    self.plot_polygon(img, vertices_edited, "pink")
+                elif vertices_ocr:
+                    self.plot_polygon(img, vertices_ocr, "white")
+                else:
+                    print("[WARN] No vertices available → no plot")
+
+            scheduler.done(img)
+
+        scheduler.report()
+
+        if self.update_store:
+            self.refresh_parcel_store()
 
         print("\n[DONE] Processing complete.")
 
 
+    def refresh_parcel_store(self):
+        """
+        Update <root>/_parcel_store if RV25j_Cadastre --store created one.
+        Uses the default EPSG the store was built with (Cadastre's
+        CONFIG.toml), so the two tools never rebuild it back and forth.
+        """
+        store = ParcelStore(self.root)
+        epsg = store.built_epsg()
+        if epsg is None:
+            return
+        try:
+            store.update(int(epsg))
+        except FileNotFoundError as e:  # no *_MAPL1(x).toml (yet)
+            print(f"[WARN] Parcel store not updated: {e}")
+
+
 # ============================================================
 # CLI Entry
 # ============================================================
@@ -432,9 +973,34 @@ def main():
         action="store_true",
         help="Skip OCR; use *_tbl00.md → *_MAPL1.toml → *_plot.png",
     )
+    parser.add_argument(
+        "-d",
+        "--dedup",
+        nargs="?",
+        type=int,
+        const=8,
+        default=None,
+        metavar="BITS",
+        help="OCR only one page per cluster of near-identical *_table.jpg "
+        "(dHash distance <= BITS, default 8); writes dedup_report.json",
+    )
+    parser.add_argument(
+        "-b",
+        "--ocr-backend",
+        choices=sorted(OCR_BACKENDS),
+        default=None,
+        help="Override CONFIG.toml [OCR].backend",
+    )
+    parser.add_argument(
+        "--no-store",
+        action="store_true",
+        help="Do not update <folder>/_parcel_store after the batch",
+    )
     args = parser.parse_args()
 
-    processor = RV25jProcessor(args.folder, args.skip_ocr)
+    processor = RV25jProcessor(
+        args.folder, args.skip_ocr, args.dedup, args.ocr_backend, not args.no_store
+    )
     processor.process()
 
 
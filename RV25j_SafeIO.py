@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+RV25j_SafeIO — atomic writes and advisory per-prefix locks
+
+Shared by RV25j_Center, RV25j_Process and RV25j_Cadastre so that OCR
+workers, GUI sessions and cadastre rebuilds can run concurrently on the
+same folder:
+
+   - atomic_write_text / atomic_write_bytes / atomic_path
+       write into a temp file in the same folder, fsync, then os.replace()
+       → readers see either the old or the new file, never a half-written one.
+
+   - prefix_lock(folder, prefix) / file_lock(path)
+       advisory lock on <folder>/.rv25j_locks/<prefix>.lock (or
+       <dir of path>/.rv25j_locks/<name>.lock) held while a tool rewrites
+       the per-prefix files (*_rect.json, *_table.jpg, *_MAPL1.toml,
+       *_plot.png) or a GPKG.
+       POSIX: fcntl.flock (shared or exclusive); Windows: msvcrt.locking
+       (always exclusive).
+
+Lock files are left in place on purpose (deleting them would race with
+another process that is just opening the same lock), but they are kept
+together in one hidden .rv25j_locks folder per directory instead of
+next to every output.
+"""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl  # POSIX
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_SUFFIX = ".lock"
+LOCK_DIRNAME = ".rv25j_locks"
+
+
+# =========================================
+# Atomic writes
+# =========================================
+
+@contextmanager
+def atomic_path(path):
+    """
+    Yield a temp path next to `path` (same suffix, so writers that pick a
+    format from the extension still work). On success the temp file is
+    fsync'ed and renamed over `path`; on error it is removed.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(
+        prefix=f".{path.stem}.", suffix=path.suffix, dir=path.parent
+    )
+    os.close(fd)
+    os.unlink(tmp)  # let the writer create it (GDAL refuses existing files)
+    tmp = Path(tmp)
+    try:
+        yield tmp
+        with open(tmp, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def atomic_write_bytes(path, data: bytes):
+    with atomic_path(path) as tmp:
+        tmp.write_bytes(data)
+
+
+def atomic_write_text(path, text: str, encoding: str = "utf-8"):
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+# =========================================
+# Advisory locks
+# =========================================
+
+class LockTimeout(TimeoutError):
+    pass
+
+
+@contextmanager
+def file_lock(path, shared: bool = False, timeout: float | None = None):
+    """
+    Advisory lock on `<dir>/.rv25j_locks/<name>.lock` for path <dir>/<name>.
+    Blocks until acquired, or raises LockTimeout after `timeout` seconds
+    (polling every 0.1 s).
+    """
+    path = Path(path)
+    lock_dir = path.parent / LOCK_DIRNAME
+    lock_dir.mkdir(exist_ok=True)
+    lock_path = lock_dir / (path.name + LOCK_SUFFIX)
+    fh = open(lock_path, "a+b")
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        while True:
+            try:
+                if fcntl is not None:
+                    mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+                    flags = mode if deadline is None else mode | fcntl.LOCK_NB
+                    fcntl.flock(fh.fileno(), flags)
+                else:
+                    fh.seek(0)
+                    mode = msvcrt.LK_LOCK if deadline is None else msvcrt.LK_NBLCK
+                    msvcrt.locking(fh.fileno(), mode, 1)
+                break
+            except OSError:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise LockTimeout(f"Lock busy: {lock_path}")
+                time.sleep(0.1)
+        yield lock_path
+    finally:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        fh.close()
+
+
+def prefix_lock(folder, prefix: str, shared: bool = False, timeout: float | None = None):
+    """Lock all files of one deed: <folder>/.rv25j_locks/<prefix>.lock"""
+    return file_lock(Path(folder) / prefix, shared=shared, timeout=timeout)
@@ -0,0 +1,45 @@
+"""
+Shared fixtures: every test works on a private copy of the Narativas
+sample tree (8 deeds, p08..p15) and its CONFIG.toml.
+"""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+os.environ.setdefault("MPLBACKEND", "Agg")  # plots without a display
+sys.path.insert(0, str(ROOT))
+
+import RV25j_Cadastre as cad  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def crs_profiles(tmp_path, monkeypatch):
+    """Keep the persisted CRS pipelines out of the user's cache directory."""
+    monkeypatch.setattr(cad.CRSFactory, "PROFILE_PATH", tmp_path / "crs_profiles.json")
+    monkeypatch.setattr(cad.CRSFactory, "_profiles", None)
+
+
+@pytest.fixture
+def narativas(tmp_path) -> Path:
+    return Path(shutil.copytree(ROOT / "Narativas", tmp_path / "Narativas"))
+
+
+@pytest.fixture
+def make_processor(narativas):
+    def make(**kw) -> cad.MarkerProcessor:
+        kw.setdefault("workers", 2)
+        return cad.MarkerProcessor(narativas, narativas / "CONFIG.toml", "cadastre", **kw)
+
+    return make
+
+
+def edit_marker(path: Path, old: str, new: str):
+    """Replace one coordinate string in a deed TOML."""
+    text = path.read_text(encoding="utf-8")
+    assert old in text
+    path.write_text(text.replace(old, new, 1), encoding="utf-8")
@@ -0,0 +1,69 @@
+import os
+import shutil
+
+import pyogrio
+
+import RV25j_Cadastre as cad
+from conftest import edit_marker
+
+
+def chosen_of(processor):
+    loader = processor.make_loader()
+    return loader.choose(loader.discover())
+
+
+def test_diff(narativas, make_processor):
+    processor = make_processor()
+    state = cad.BuildState(narativas / "s.json", cad.BuildState.config_key(processor.config))
+    _, _, _, state.files = state.diff(chosen_of(processor))
+
+    p12 = narativas / "p12" / "p12_MAPL1.toml"
+    os.utime(p12, ns=(p12.stat().st_atime_ns, p12.stat().st_mtime_ns + 10**9))  # touched only
+    edit_marker(narativas / "p11" / "p11_MAPL1x.toml", "810031.568]", "810032.568]")
+    shutil.rmtree(narativas / "p15")
+    shutil.copytree(narativas / "p08", narativas / "p16")
+    for p in (narativas / "p16").glob("p08_*"):
+        p.rename(p.with_name(p.name.replace("p08", "p16")))
+
+    added, modified, removed, files = state.diff(chosen_of(processor))
+    assert [f for f, _ in added] == ["p16"]
+    assert [f for f, _ in modified] == ["p11"]
+    assert removed == ["p15"]
+    assert sorted(files) == ["p08", "p09", "p10", "p11", "p12", "p13", "p14", "p16"]
+
+
+def test_load_rejects_other_config(narativas, make_processor):
+    processor = make_processor()
+    state = cad.BuildState(narativas / "s.json", cad.BuildState.config_key(processor.config))
+    state.changes_seq = 3
+    state.save()
+    assert cad.BuildState.load(state.path, processor.config).changes_seq == 3
+    other = cad.RV25JConfig(processor.config.path, {**processor.config.data, "Deed": {"EPSG": 24048}})
+    assert cad.BuildState.load(state.path, other) is None
+
+
+def test_incremental_upsert(narativas, make_processor):
+    make_processor().run_incremental()
+    edit_marker(narativas / "p11" / "p11_MAPL1x.toml", "810031.568]", "810032.568]")
+    shutil.rmtree(narativas / "p15")
+    make_processor().run_incremental()
+
+    src, w84 = cad.GPKGWriter(narativas, None, bulk=True).gpkg_paths("cadastre")
+    for path in (src, w84):
+        marker = pyogrio.read_dataframe(path, layer="marker")
+        parcel = pyogrio.read_dataframe(path, layer="parcel")
+        assert len(marker) == 48 and "p15" not in set(marker["File"])
+        assert sorted(parcel["File"]) == ["p08", "p09", "p10", "p11", "p12", "p13", "p14"]
+        assert (marker["File"] == "p11").sum() == 5
+    p11 = pyogrio.read_dataframe(src, layer="marker", where="File = 'p11' AND idx = 1")
+    assert p11["EASTING"].tolist() == [810032.568]
+
+    # same rows as loading the edited tree from scratch
+    df_ID75 = make_processor().make_loader().load_df_id75()
+    marker = pyogrio.read_dataframe(src, layer="marker", read_geometry=False)
+    key = ["File", "idx"]
+    got = marker.sort_values(key)[key + ["EASTING", "NORTHING"]].reset_index(drop=True)
+    want = df_ID75.astype({"File": str, "idx": "int64"}).sort_values(key)
+    assert got.astype({"idx": "int64"}).equals(
+        want[key + ["EASTING", "NORTHING"]].reset_index(drop=True)
+    )
@@ -0,0 +1,90 @@
+import json
+
+import numpy as np
+
+import RV25j_Cadastre as cad
+from conftest import edit_marker
+
+
+def read_set(path):
+    head, *lines = [json.loads(s) for s in path.read_text(encoding="utf-8").splitlines()]
+    parcels = [r for r in lines if r["type"] == "parcel"]
+    markers = [r for r in lines if r["type"] == "marker"]
+    return head, parcels, markers
+
+
+def test_diff_ops(make_processor):
+    df_ID75, _, df_W84 = make_processor().load_markers()
+    frame = cad.ChangeFeed.frame(df_ID75, df_W84)
+    old = frame[frame["File"].isin(["p09", "p11"])].reset_index(drop=True)
+    new = frame[frame["File"].isin(["p08", "p11"])].reset_index(drop=True)
+    moved = new.index[(new["File"] == "p11") & (new["idx"] == 2)]
+    new.loc[moved, "EASTING"] += 1.0
+
+    parcels, markers = cad.ChangeFeed.diff(old, new, ["p08"], ["p11"], ["p09"])
+
+    assert [(p["op"], p["File"]) for p in parcels] == [
+        ("added", "p08"), ("modified", "p11"), ("removed", "p09")
+    ]
+    ops = markers.groupby("File")["op"].unique().apply(list).to_dict()
+    assert ops == {"p08": ["added"], "p09": ["removed"], "p11": ["modified"]}
+    p11 = markers[markers["File"] == "p11"]
+    assert p11["idx"].tolist() == [2]
+    assert p11["EASTING_new"].iloc[0] == p11["EASTING_old"].iloc[0] + 1.0
+    assert len(markers) == (frame["File"] == "p08").sum() + (frame["File"] == "p09").sum() + 1
+
+
+def test_diff_ignores_resaved_deed(make_processor):
+    df_ID75, _, df_W84 = make_processor().load_markers()
+    p11 = cad.ChangeFeed.frame(df_ID75, df_W84).query("File == 'p11'")
+    parcels, markers = cad.ChangeFeed.diff(p11, p11.copy(), [], ["p11"], [])
+    assert parcels == [] and markers.empty
+
+
+def test_seq_per_incremental_run(narativas, make_processor):
+    feed = cad.ChangeFeed(narativas, "cadastre")
+    make_processor(changes=True).run_incremental()
+    head, parcels, markers = read_set(feed.path(1))
+    assert head["full"] and head["seq"] == 1 and head["prev_seq"] == 0
+    assert len(parcels) == 8 and len(markers) == 53
+
+    edit_marker(narativas / "p11" / "p11_MAPL1x.toml", "810031.568]", "810032.568]")
+    make_processor(changes=True).run_incremental()
+    head, parcels, markers = read_set(feed.path(2))
+    assert (head["seq"], head["prev_seq"], head["full"]) == (2, 1, False)
+    assert parcels == [{"type": "parcel", "op": "modified", "File": "p11", "n_old": 5, "n_new": 5}]
+    (m,) = markers
+    assert (m["File"], m["idx"], m["op"]) == ("p11", 1, "modified")
+    assert np.isclose(m["new"][0] - m["old"][0], 1.0)  # EASTING
+    assert np.isclose(m["new"][3] - m["old"][3], 1.0, atol=1e-3)  # WGS84 UTM easting
+
+    make_processor(changes=True).run_incremental()  # nothing changed
+    assert feed.last_seq() == 2
+    state = cad.BuildState.load(narativas / "cadastre_state.json", make_processor().config)
+    assert state.changes_seq == 2 and not state.pending
+
+
+def test_feed_continues_without_changes_flag(narativas, make_processor):
+    feed = cad.ChangeFeed(narativas, "cadastre")
+    make_processor(changes=True).run_incremental()
+    edit_marker(narativas / "p12" / "p12_MAPL1.toml", "[1, ", "[1, ")  # touch only
+    edit_marker(narativas / "p11" / "p11_MAPL1x.toml", "810031.568]", "810033.568]")
+    make_processor().run_incremental()
+    head, parcels, _ = read_set(feed.path(2))
+    assert head["seq"] == 2 and [p["File"] for p in parcels] == ["p11"]
+
+
+def test_unfinished_run_gives_full_set(narativas, make_processor):
+    feed = cad.ChangeFeed(narativas, "cadastre")
+    make_processor(changes=True).run_incremental()
+    state_path = narativas / "cadastre_state.json"
+    data = json.loads(state_path.read_text(encoding="utf-8"))
+    data["pending"] = True  # GPKGs were being updated when the run stopped
+    state_path.write_text(json.dumps(data), encoding="utf-8")
+    (feed.dir / "000004.ndjson").write_text("", encoding="utf-8")  # orphaned set
+
+    make_processor(changes=True).run_incremental()
+    head, parcels, markers = read_set(feed.path(5))
+    assert head["full"] and len(parcels) == 8 and len(markers) == 53
+    state = cad.BuildState.load(state_path, make_processor().config)
+    assert state.changes_seq == 5 and not state.pending
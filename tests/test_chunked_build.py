@@ -0,0 +1,41 @@
+import numpy as np
+import pyogrio
+
+from conftest import edit_marker
+
+
+def marker_xy(path, file):
+    df = pyogrio.read_dataframe(path, layer="marker")
+    df = df[df["File"] == file].sort_values("idx")
+    return np.column_stack([df.geometry.x, df.geometry.y]), set(df["EPSG"])
+
+
+def test_chunked_build_reprojects_other_zones(narativas, make_processor):
+    edit_marker(narativas / "p15" / "p15_MAPL1x.toml", "EPSG = 24047", "EPSG = 24048")
+    proc = make_processor(bulk=True, chunk=3)
+    df_ID75, _, df_W84 = proc.load_markers()
+    proc.run_chunked()
+    i75, w84 = (narativas / "cadastre_I75UTM.gpkg", narativas / "cadastre_W84UTM.gpkg")
+    assert '"central_meridian",99]' in pyogrio.read_info(i75, layer="marker")["crs"]  # zone 47
+    assert pyogrio.read_info(w84, layer="marker")["crs"] == "EPSG:32647"
+    assert len(pyogrio.read_dataframe(i75, layer="parcel")) == 8
+
+    # deeds already in the layer CRS are written as read
+    src = df_ID75[df_ID75["File"] == "p14"].sort_values("idx")
+    xy, epsg = marker_xy(i75, "p14")
+    np.testing.assert_allclose(xy, src[["EASTING", "NORTHING"]].to_numpy())
+    assert epsg == {24047}
+
+    # the 24048 deed lands in zone 47, not on its raw zone-48 coordinates
+    factory = proc.crs_factory
+    for path, df, dst in ((i75, df_ID75, 24047), (w84, df_W84, 32647)):
+        src = df[df["File"] == "p15"].sort_values("idx")
+        assert set(src["EPSG"]) == {24048 if dst == 24047 else 32648}
+        expected = np.column_stack(
+            factory.get_transformer(int(src["EPSG"].iloc[0]), dst).transform(
+                src["EASTING"].to_numpy(), src["NORTHING"].to_numpy()
+            )
+        )
+        xy, epsg = marker_xy(path, "p15")
+        np.testing.assert_allclose(xy, expected, atol=1e-6)
+        assert epsg == {dst} and len(xy) == 5
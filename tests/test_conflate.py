@@ -0,0 +1,59 @@
+import pandas as pd
+
+import RV25j_Cadastre as cad
+
+
+def squares():
+    """Two unit parcels sharing the edge x = 10 (WGS84 UTM 47N)."""
+    rows = [
+        # File, idx, code, E, N
+        ("a", 1, "s1", 0.0, 0.0), ("a", 2, "s2", 10.0, 0.0), ("a", 3, "s3", 10.0, 10.0), ("a", 4, "s4", 0.0, 10.0),
+        ("b", 1, "s2", 10.01, 0.0),   # same marker, 1 cm off → snapped
+        ("b", 2, "s5", 20.0, 0.0), ("b", 3, "s6", 20.0, 10.0),
+        ("b", 4, "S3 ", 10.0, 10.02),  # same marker, OCR'd code variant → snapped
+        ("c", 1, "s6", 20.4, 10.0),   # same code 40 cm away → coord_mismatch
+        ("c", 2, "s7", 30.0, 10.0), ("c", 3, "s8", 30.0, 20.0),
+    ]
+    df = pd.DataFrame(rows, columns=["File", "idx", "code", "EASTING", "NORTHING"])
+    return df.assign(MARKER="A", EPSG=32647)
+
+
+def test_conflate_snaps_and_reports():
+    canon, refs, conflicts = cad.MarkerConflator(tolerance=0.05, conflict_radius=1.0).conflate(squares())
+    assert len(canon) == 11 - 2
+    shared = canon[canon["n_parcels"] > 1].set_index("code")
+    assert sorted(shared["Files"]) == ["a;b", "a;b"]
+    assert abs(shared.loc["s2", "EASTING"] - 10.005) < 1e-9
+    assert shared["spread"].max() <= 0.05
+
+    ids = refs.set_index(["File", "idx"])["MARKER_ID"]
+    assert ids[("a", 2)] == ids[("b", 1)] and ids[("a", 3)] == ids[("b", 4)]
+    assert ids[("b", 3)] != ids[("c", 1)]
+
+    assert sorted(conflicts["type"]) == ["coord_mismatch"]  # "s3" / "S3 " normalise equal
+    (row,) = conflicts.to_dict("records")
+    assert (row["code"], row["Files"]) == ("s6", "b;c") and abs(row["distance"] - 0.4) < 1e-9
+
+
+def test_code_mismatch():
+    df = squares()
+    df.loc[(df["File"] == "b") & (df["idx"] == 1), "code"] = "520"
+    _, _, conflicts = cad.MarkerConflator(0.05, 1.0).conflate(df)
+    mism = conflicts[conflicts["type"] == "code_mismatch"].iloc[0]
+    assert (mism["code"], mism["Files"]) == ("520;s2", "a;b")
+
+
+def test_zones_never_snap_together():
+    df = squares()
+    df.loc[df["File"] == "b", "EPSG"] = 32648
+    canon, _, _ = cad.MarkerConflator(0.05, 1.0).conflate(df)
+    assert len(canon) == 11 - 0 and (canon["n_parcels"] == 1).all()
+
+
+def test_run_on_narativas(narativas, make_processor):
+    _, _, df_W84 = make_processor().load_markers()
+    canon, refs, _ = cad.MarkerConflator(0.05, 1.0).run(df_W84, narativas, "cadastre")
+    assert len(refs) == 53 and canon["n_refs"].sum() == 53
+    assert (canon["n_parcels"] > 1).any()  # neighbouring deeds share boundary markers
+    for name in ("markers_conflated", "marker_refs", "marker_conflicts"):
+        assert (narativas / f"cadastre_{name}.csv").is_file()
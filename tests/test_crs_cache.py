@@ -0,0 +1,70 @@
+import json
+import threading
+
+import numpy as np
+import pytest
+
+import RV25j_Cadastre as cad
+
+TOWGS84 = [204.5, 837.9, 294.8]
+
+
+def test_pipelines_are_persisted_and_reused(monkeypatch):
+    factory = cad.CRSFactory(TOWGS84)
+    expected = factory.get_transformer_to_wgs84(24047).transform(810313.001, 711494.218)
+    data = json.loads(cad.CRSFactory.PROFILE_PATH.read_text(encoding="utf-8"))
+    assert data["stamp"] == cad.CRSFactory._profile_stamp()
+    key = "24047>4326|204.5,837.9,294.8"
+    assert key in data["pipelines"]
+
+    # a new process (fresh class cache) builds from the stored pipeline, no proj.db search
+    monkeypatch.setattr(cad.CRSFactory, "_profiles", None)
+
+    def no_search(*a, **kw):
+        raise AssertionError("Transformer.from_crs called")
+
+    monkeypatch.setattr(cad.Transformer, "from_crs", no_search)
+    got = cad.CRSFactory(TOWGS84).get_transformer_to_wgs84(24047).transform(810313.001, 711494.218)
+    assert got == pytest.approx(expected, abs=1e-9)
+
+
+def test_towgs84_is_part_of_the_key():
+    a = cad.CRSFactory(TOWGS84).get_transformer_to_wgs84(24047)
+    b = cad.CRSFactory([210.0, 814.0, 289.0]).get_transformer_to_wgs84(24047)
+    assert a.transform(810313.001, 711494.218) != b.transform(810313.001, 711494.218)
+    pipelines = json.loads(cad.CRSFactory.PROFILE_PATH.read_text(encoding="utf-8"))["pipelines"]
+    assert len([k for k in pipelines if k.startswith("24047>4326|")]) == 2
+
+
+def test_stale_stamp_is_ignored(monkeypatch):
+    path = cad.CRSFactory.PROFILE_PATH
+    path.write_text(
+        json.dumps({"stamp": {"version": 0}, "pipelines": {"24047>4326|204.5,837.9,294.8": "bogus"}}),
+        encoding="utf-8",
+    )
+    factory = cad.CRSFactory(TOWGS84)
+    lon, lat = factory.get_transformer_to_wgs84(24047).transform(810313.001, 711494.218)
+    assert 100 < lon < 102 and 6 < lat < 8
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["stamp"] == cad.CRSFactory._profile_stamp()
+    assert data["pipelines"]["24047>4326|204.5,837.9,294.8"] != "bogus"
+
+
+def test_not_persisted_when_disabled():
+    cad.CRSFactory(TOWGS84, persist=False).get_transformer_to_wgs84(24048)
+    assert not cad.CRSFactory.PROFILE_PATH.exists()
+
+
+def test_transformers_are_per_thread():
+    factory = cad.CRSFactory(TOWGS84)
+    main = factory.get_transformer(24047, 32647)
+    assert factory.get_transformer(24047, 32647) is main
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(factory.get_transformer(24047, 32647)))
+    t.start()
+    t.join()
+    assert seen[0] is not main
+    e = np.array([810313.001, 810323.391])
+    n = np.array([711494.218, 711510.841])
+    np.testing.assert_allclose(seen[0].transform(e, n), main.transform(e, n))
+    assert factory.get_src_crs(24047) is cad.CRSFactory(TOWGS84).get_src_crs(24047)
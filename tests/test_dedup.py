@@ -0,0 +1,69 @@
+import json
+import shutil
+
+from PIL import Image
+
+import RV25j_Process as proc
+
+
+def tables(folder):
+    return sorted(folder.rglob("*_table.jpg"))
+
+
+def rescan(src, dst):
+    """A re-encoded copy of a page (what a second scan / copy looks like)."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    with Image.open(src) as img:
+        img.convert("RGB").save(dst, format="JPEG", quality=60)
+
+
+def test_clusters_repeated_pages(narativas):
+    rescan(narativas / "p08" / "p08_table.jpg", narativas / "zz" / "p90_table.jpg")
+    deduper = proc.PageDeduper(8)
+    clusters = deduper.find_clusters(tables(narativas))
+    assert clusters == {narativas / "p08" / "p08_table.jpg": [narativas / "zz" / "p90_table.jpg"]}
+
+    # the eight real deeds are all told apart
+    real = [deduper.hashes[p] for p in tables(narativas) if p.parent.name != "zz"]
+    dists = [bin(a ^ b).count("1") for i, a in enumerate(real) for b in real[i + 1:]]
+    assert min(dists) > deduper.max_dist
+
+
+def test_max_dist_zero_needs_identical_hash(narativas):
+    (narativas / "zz").mkdir()
+    shutil.copy(narativas / "p09" / "p09_table.jpg", narativas / "zz" / "p91_table.jpg")
+    deduper = proc.PageDeduper(0)
+    clusters = deduper.find_clusters(tables(narativas))
+    assert clusters == {narativas / "p09" / "p09_table.jpg": [narativas / "zz" / "p91_table.jpg"]}
+
+
+def test_report(narativas):
+    rescan(narativas / "p08" / "p08_table.jpg", narativas / "zz" / "p90_table.jpg")
+    deduper = proc.PageDeduper(8)
+    clusters = deduper.find_clusters(tables(narativas))
+    deduper.write_report(clusters, narativas / "dedup_report.json", narativas)
+    report = json.loads((narativas / "dedup_report.json").read_text(encoding="utf-8"))
+    assert (report["pages"], report["clusters"], report["ocr_saved"]) == (9, 1, 1)
+    (cluster,) = report["cluster"]
+    assert cluster["representative"] == "p08/p08_table.jpg"
+    assert [d["image"] for d in cluster["duplicates"]] == ["zz/p90_table.jpg"]
+
+
+def test_duplicate_reuses_representative_md(narativas):
+    rescan(narativas / "p08" / "p08_table.jpg", narativas / "zz" / "p90_table.jpg")
+    # an older output → "reprocess" like the others, so p08 (sorted first) is OCR'd
+    (narativas / "zz" / "p90_MAPL1.toml").write_text("", encoding="utf-8")
+    processor = proc.RV25jProcessor(
+        str(narativas), dedup_dist=8, ocr_backend="stub", update_store=False
+    )
+    calls = []
+    predict_md = processor.backend.predict_md
+    processor.backend.predict_md = lambda img, prefix: calls.append(prefix) or predict_md(img, prefix)
+    processor.process()
+
+    assert sorted(calls) == [f"p{i:02d}" for i in range(8, 16)]  # p90 not OCR'd
+    md = (narativas / "zz" / "p90_tbl00.md").read_bytes()
+    assert md == (narativas / "p08" / "p08_tbl00.md").read_bytes()
+    dup = (narativas / "zz" / "p90_MAPL1.toml").read_text(encoding="utf-8")
+    rep = (narativas / "p08" / "p08_MAPL1.toml").read_text(encoding="utf-8")
+    assert dup.split("marker", 1)[1] == rep.split("marker", 1)[1]
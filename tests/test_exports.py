@@ -0,0 +1,67 @@
+import threading
+
+import geopandas as gpd
+import pandas as pd
+import pyogrio
+import pytest
+import shapely
+
+import RV25j_Cadastre as cad
+
+CRS = cad.CRS.from_epsg(32647)
+
+
+def test_batches_hold_whole_parcels(make_processor):
+    _, _, df_W84 = make_processor().load_markers()
+    exporter = cad.ColumnarExporter(None, "", (), batch_parcels=3)
+    batches = list(exporter.iter_batches(df_W84.iloc[::-1]))  # any row order
+    assert [b["File"].nunique() for b in batches] == [3, 3, 2]
+    files = [set(b["File"].astype(str)) for b in batches]
+    assert not (files[0] & files[1]) and sum(len(b) for b in batches) == 53
+
+
+@pytest.mark.parametrize("batch", [1, 3, 5000])
+def test_export_formats(narativas, make_processor, batch):
+    _, _, df_W84 = make_processor().load_markers()
+    cad.ColumnarExporter(narativas, "cadastre", ["parquet", "fgb", "csv"], batch).export(
+        df_W84, "W84UTM", CRS
+    )
+    expected = cad.ParcelBuilder.parcels(df_W84, CRS).set_index("File").geometry
+
+    pq = gpd.read_parquet(narativas / "cadastre_W84UTM_parcel.parquet")
+    fgb = pyogrio.read_dataframe(narativas / "cadastre_W84UTM_parcel.fgb")
+    csv = pd.read_csv(narativas / "cadastre_W84UTM_parcel.csv")
+    assert pq.crs.to_epsg() == 32647 and fgb.crs.to_epsg() == 32647
+    for got in (pq.set_index("File").geometry, fgb.set_index("File").geometry,
+                gpd.GeoSeries.from_wkt(csv["geometry"]).set_axis(csv["File"])):
+        got = got.sort_index()
+        assert got.index.tolist() == expected.index.tolist()
+        assert shapely.equals_exact(got.values, expected.values, 1e-6).all()
+
+    for suffix in ("parquet", "fgb", "csv"):
+        path = narativas / f"cadastre_W84UTM_marker.{suffix}"
+        read = {"parquet": gpd.read_parquet, "fgb": pyogrio.read_dataframe, "csv": pd.read_csv}
+        markers = read[suffix](path)
+        assert len(markers) == 53
+        assert sorted(markers["File"].astype(str).unique()) == expected.index.tolist()
+
+
+def test_failed_export_leaves_nothing(narativas, make_processor, monkeypatch):
+    _, _, df_W84 = make_processor().load_markers()
+    calls = []
+    parcel_table = cad.ColumnarExporter._parcel_table
+
+    def flaky(batch, crs, wkt):
+        calls.append(1)
+        if len(calls) > 2:
+            raise RuntimeError("bad parcel")
+        return parcel_table(batch, crs, wkt)
+
+    monkeypatch.setattr(cad.ColumnarExporter, "_parcel_table", staticmethod(flaky))
+    threads = threading.active_count()
+    with pytest.raises(RuntimeError):
+        cad.ColumnarExporter(narativas, "cadastre", ["parquet", "fgb", "csv"], 2).export(
+            df_W84, "W84UTM", CRS
+        )
+    assert not list(narativas.glob("*cadastre_W84UTM*"))
+    assert threading.active_count() == threads  # FlatGeobuf writer stopped
@@ -0,0 +1,40 @@
+import sqlite3
+
+import pyogrio
+import shapely
+
+import RV25j_Cadastre as cad
+
+
+def test_bulk_matches_per_parcel_layers(narativas, make_processor):
+    df_ID75, _, df_W84 = make_processor().load_markers()
+    crs = cad.CRS.from_epsg(32647)
+    bulk = narativas / "bulk.gpkg"
+    per_parcel = narativas / "layers.gpkg"
+    writer = cad.GPKGWriter(narativas, None)
+    cad.GPKGWriter(narativas, None, bulk=True).write_gpkg_bulk(df_W84, bulk, crs)
+    writer.write_gpkg(df_W84, per_parcel, crs)
+
+    assert {name for name, _ in pyogrio.list_layers(bulk)} == {"marker", "parcel"}
+    assert cad.GPKGWriter.is_bulk_gpkg(bulk) and not cad.GPKGWriter.is_bulk_gpkg(per_parcel)
+    marker = pyogrio.read_dataframe(bulk, layer="marker")
+    parcel = pyogrio.read_dataframe(bulk, layer="parcel")
+    assert len(marker) == 53 and parcel["File"].tolist() == sorted(set(df_W84["File"].astype(str)))
+    assert pyogrio.read_info(bulk, layer="parcel")["crs"] == "EPSG:32647"
+
+    for f, geom in zip(parcel["File"], parcel.geometry):
+        other = pyogrio.read_dataframe(per_parcel, layer=f"parcel:{f}").geometry.iloc[0]
+        assert shapely.equals_exact(shapely.normalize(geom), shapely.normalize(other), 1e-9)
+        assert (marker["File"] == f).sum() == len(pyogrio.read_dataframe(per_parcel, layer=f"marker:{f}"))
+
+
+def test_bulk_indexes(narativas, make_processor):
+    df_ID75, _, df_W84 = make_processor().load_markers()
+    path = narativas / "bulk.gpkg"
+    cad.GPKGWriter(narativas, None, bulk=True).write_gpkg_bulk(df_W84, path, cad.CRS.from_epsg(32647))
+    con = sqlite3.connect(path)
+    try:
+        names = {r[0] for r in con.execute("SELECT name FROM sqlite_master")}
+    finally:
+        con.close()
+    assert {"idx_marker_File", "idx_parcel_File", "rtree_marker_geom", "rtree_parcel_geom"} <= names
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+import RV25j_Cadastre as cad
+
+
+def loader(narativas, **kw):
+    config = cad.RV25JConfig.from_toml(narativas / "CONFIG.toml")
+    return cad.MarkerLoader(narativas, config, **kw)
+
+
+def test_discover_prefers_side_file(narativas):
+    (narativas / "p12" / "p12_MAPL1x.toml").unlink()
+    chosen = dict(loader(narativas).choose(loader(narativas).discover()))
+    assert sorted(chosen) == [f"p{i:02d}" for i in range(8, 16)]
+    assert chosen["p11"].name == "p11_MAPL1x.toml"
+    assert chosen["p12"].name == "p12_MAPL1.toml"
+
+
+@pytest.mark.parametrize("kw", [{"workers": 1}, {"workers": 8}, {"workers": 2, "processes": True}])
+def test_pools_give_the_same_frame(narativas, kw):
+    ref = loader(narativas, workers=1).load_df_id75()
+    df = loader(narativas, **kw).load_df_id75()
+    pd.testing.assert_frame_equal(df, ref)
+    assert len(df) == 53 and df["File"].is_monotonic_increasing
+
+
+def test_unreadable_toml_is_skipped(narativas, capsys):
+    (narativas / "p10" / "p10_MAPL1x.toml").write_text("marker = [", encoding="utf-8")
+    df = loader(narativas, workers=4).load_df_id75()
+    assert "p10" not in set(df["File"]) and df["File"].nunique() == 7
+    assert "[ERROR]" in capsys.readouterr().out
+
+
+def test_empty_archive(narativas):
+    files = [("p10", narativas / "p10" / "missing.toml")]
+    with pytest.raises(RuntimeError):
+        loader(narativas).load_files(files)
+    assert loader(narativas).load_files(files, allow_empty=True).empty
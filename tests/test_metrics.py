@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+import shapely
+
+import RV25j_Cadastre as cad
+from conftest import edit_marker
+
+
+def rings(df, file):
+    sub = df[df["File"] == file]
+    return sub["EASTING"].to_numpy(), sub["NORTHING"].to_numpy()
+
+
+def test_metrics_match_shapely(make_processor):
+    df_ID75, df_LL_W84, df_W84 = make_processor().load_markers()
+    m = cad.ParcelMetrics.compute(df_ID75, df_LL_W84, df_W84).set_index("File")
+    assert list(m.reset_index().columns) == cad.ParcelMetrics.COLUMNS
+    assert len(m) == 8 and m.loc["p15", "n_vertex"] == 5
+
+    for file, row in m.iterrows():
+        for df, tag in ((df_ID75, "src"), (df_W84, "w84")):
+            x, y = rings(df, file)
+            ring = shapely.LinearRing(np.column_stack([x, y]))
+            poly = shapely.Polygon(ring)
+            assert row[f"area_{tag}"] == pytest.approx(poly.area, rel=1e-9)
+            assert row[f"perimeter_{tag}"] == pytest.approx(ring.length, rel=1e-9)
+        x, y = rings(df_ID75, file)
+        ccw = shapely.LinearRing(np.column_stack([x, y])).is_ccw
+        assert row["orientation"] == ("CCW" if ccw else "CW")
+        assert row["closing_dist"] == pytest.approx(np.hypot(x[-1] - x[0], y[-1] - y[0]))
+        assert row["misclosure"] == 0.0
+        assert row["area_ellps"] == pytest.approx(row["area_w84"], rel=5e-3)
+
+
+def test_repeated_first_marker_is_a_misclosure(narativas, make_processor):
+    edit_marker(
+        narativas / "p15" / "p15_MAPL1x.toml",
+        '[5, "E", "s19", 711354.507, 810440.839],',
+        '[5, "E", "s19", 711354.507, 810440.839],\n  [6, "A", "s24", 711494.218, 810313.101],',
+    )
+    df_ID75, df_LL_W84, df_W84 = make_processor().load_markers()
+    row = cad.ParcelMetrics.compute(df_ID75, df_LL_W84, df_W84).set_index("File").loc["p15"]
+    assert row["n_vertex"] == 5
+    assert row["misclosure"] == pytest.approx(0.1, abs=1e-6)
+    assert row["closing_dist"] == row["misclosure"]
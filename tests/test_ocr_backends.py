@@ -0,0 +1,59 @@
+import shutil
+
+import pytest
+
+import RV25j_Process as proc
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        proc.OCRBackend()
+
+
+def test_make_backend():
+    stub = proc.make_ocr_backend({"backend": " Stub ", "stub_latency": 0.5})
+    assert isinstance(stub, proc.StubBackend) and stub.latency == 0.5
+    with pytest.raises(SystemExit, match="Unknown"):
+        proc.make_ocr_backend({"backend": "tesseract"})
+
+
+def test_stub_replays_own_deed_only(narativas):
+    img = narativas / "p08" / "p08_table.jpg"
+    # a same-named MD of another folder must not be picked up
+    (narativas / "p09" / "p08_tbl01.md").write_text("<table></table>", encoding="utf-8")
+    md_files = proc.StubBackend().predict_md(img, "p08")
+    assert md_files == [narativas / "p08" / "p08_tbl00.md"]
+
+
+def test_stub_replay_dir(narativas, tmp_path):
+    replay = tmp_path / "replay"
+    shutil.copytree(narativas / "p08", replay / "p08")
+    (narativas / "p08" / "p08_tbl00.md").unlink()
+    img = narativas / "p08" / "p08_table.jpg"
+    md_files = proc.StubBackend(replay_dir=str(replay)).predict_md(img, "p08")
+    assert md_files == [narativas / "p08" / "p08_tbl00.md"]
+    assert md_files[0].read_bytes() == (replay / "p08" / "p08_tbl00.md").read_bytes()
+    assert proc.StubBackend().predict_md(narativas / "p09" / "p09_table.jpg", "nope") == []
+
+
+def test_boxes_to_rows():
+    texts = ["A", "711644.466", "810031.568", "B", "711624.835", "810051.076"]
+    boxes = [
+        (10, 10, 30, 30), (100, 12, 200, 30), (300, 11, 400, 29),
+        (11, 50, 29, 70), (101, 50, 199, 71), (302, 52, 398, 70),
+    ]
+    rows = proc.PaddleTextBackend.boxes_to_rows(texts, boxes)
+    assert rows == [["A", "711644.466", "810031.568"], ["B", "711624.835", "810051.076"]]
+    assert proc.PaddleTextBackend.boxes_to_rows([], []) == []
+
+
+def test_paddle_text_escapes_cells(tmp_path):
+    class FakeOCR:
+        def predict(self, path):
+            return [{"rec_texts": ["<b>A&B</b>", "1"], "rec_boxes": [(0, 0, 10, 10), (20, 0, 30, 10)]}]
+
+    backend = object.__new__(proc.PaddleTextBackend)  # no PaddleOCR models
+    backend.ocr = FakeOCR()
+    (md,) = backend.predict_md(tmp_path / "p01_table.jpg", "p01")
+    text = md.read_text(encoding="utf-8")
+    assert "<td>&lt;b&gt;A&amp;B&lt;/b&gt;</td><td>1</td>" in text
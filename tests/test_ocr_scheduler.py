@@ -0,0 +1,70 @@
+import os
+import shutil
+
+import RV25j_Process as proc
+
+
+def get_prefix(img):
+    return img.stem[: -len("_table")]
+
+
+def touch(path, t):
+    path.write_text("", encoding="utf-8") if not path.exists() else None
+    os.utime(path, (t, t))
+
+
+def drain(scheduler):
+    order = []
+    while (job := scheduler.pop()) is not None:
+        order.append((get_prefix(job[0]), job[1]))
+        scheduler.done(job[0])
+    return order
+
+
+def test_priority_classes(tmp_path):
+    for prefix in ("a", "b", "c"):
+        touch(tmp_path / f"{prefix}_table.jpg", 1000)
+    touch(tmp_path / "b_MAPL1.toml", 2000)  # up to date → reprocess
+    touch(tmp_path / "c_MAPL1.toml", 2000)
+    touch(tmp_path / "c_rect.json", 3000)  # edited after the TOML
+    images = sorted(tmp_path.glob("*_table.jpg"))
+    scheduler = proc.OCRScheduler(tmp_path, images, get_prefix)
+    assert drain(scheduler) == [("c", "edited"), ("a", "new"), ("b", "reprocess")]
+    assert {k: len(v) for k, v in scheduler.latency.items()} == {
+        "operator": 0, "edited": 1, "new": 1, "reprocess": 1
+    }
+
+
+def test_urgent_file_jumps_the_queue(tmp_path):
+    for sub in ("d1", "d2"):
+        (tmp_path / sub).mkdir()
+        for prefix in ("p01", "p02"):
+            touch(tmp_path / sub / f"{prefix}_table.jpg", 1000)
+    images = sorted(tmp_path.rglob("*_table.jpg"))
+    urgent = tmp_path / proc.OCRScheduler.URGENT_FILE
+    urgent.write_text("d2/p02\n", encoding="utf-8")
+    scheduler = proc.OCRScheduler(tmp_path, images, get_prefix)
+    assert not urgent.exists()  # consumed
+    assert scheduler.pop() == (tmp_path / "d2" / "p02_table.jpg", "operator")
+
+    # pushed while the batch runs; a bare prefix names both folders
+    urgent.write_text("p02\n", encoding="utf-8")
+    assert scheduler.pop() == (tmp_path / "d1" / "p02_table.jpg", "operator")
+    assert scheduler.pop() == (tmp_path / "d2" / "p02_table.jpg", "operator")  # asked again
+    assert [job[1] for job in iter(scheduler.pop, None)] == ["new", "new"]
+
+
+def test_root_folder_deed_is_not_ambiguous(tmp_path, capsys):
+    touch(tmp_path / "p01_table.jpg", 1000)
+    (tmp_path / "sub").mkdir()
+    touch(tmp_path / "sub" / "p02_table.jpg", 1000)
+    shutil.copy(tmp_path / "sub" / "p02_table.jpg", tmp_path / "p02_table.jpg")
+    images = sorted(tmp_path.rglob("*_table.jpg"))
+    scheduler = proc.OCRScheduler(tmp_path, images, get_prefix)
+
+    assert scheduler.lookup("p01") == [tmp_path / "p01_table.jpg"]
+    assert "[WARN]" not in capsys.readouterr().out
+    # the root deed does not hide the subfolder deed of the same prefix
+    assert sorted(scheduler.lookup("p02")) == [tmp_path / "p02_table.jpg", tmp_path / "sub" / "p02_table.jpg"]
+    assert "matches 2 deeds" in capsys.readouterr().out
+    assert scheduler.lookup("sub/p02") == [tmp_path / "sub" / "p02_table.jpg"]
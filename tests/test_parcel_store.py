@@ -0,0 +1,87 @@
+import tomllib
+
+import pandas as pd
+import pandas.testing as pdt
+
+import RV25j_ParcelStore as ps
+from conftest import edit_marker
+
+
+def deeds(folder):
+    return ps.choose(ps.discover(folder))
+
+
+def test_marker_columns_round_trip(narativas, monkeypatch):
+    monkeypatch.setattr(ps.MarkerColumns, "CHUNK", 4)  # several flushes on 53 markers
+    acc = ps.MarkerColumns()
+    expected = []
+    for file, path in deeds(narativas):
+        acc.add(file, ps.parse_marker_toml(path, 24047))
+        with path.open("rb") as fp:
+            deed = tomllib.load(fp)["Deed"]
+        expected += [(file, int(i), c, m, n, e, deed.get("EPSG", 24047)) for i, m, c, n, e in deed["marker"]]
+
+    df = acc.to_frame()
+    assert len(acc) == len(df) == len(expected) == 53
+    assert isinstance(df["File"].dtype, pd.CategoricalDtype)
+    got = list(zip(*(df[c].astype(object).tolist() for c in
+                     ["File", "idx", "code", "MARKER", "NORTHING", "EASTING", "EPSG"])))
+    assert got == expected
+
+
+def test_store_round_trip(narativas):
+    acc = ps.MarkerColumns()
+    for file, path in deeds(narativas):
+        acc.add(file, ps.parse_marker_toml(path, 24047))
+    expected = acc.to_frame()
+
+    store = ps.ParcelStore(narativas).update(24047, workers=2)
+    assert (store.n_parcels, store.n_markers) == (8, 53)
+    assert store.built_epsg() == 24047
+    pdt.assert_frame_equal(store.to_frame(), expected)
+
+    # slices read only their parcels
+    part = store.to_frame(2, 5)
+    assert part["File"].astype(str).unique().tolist() == ["p10", "p11", "p12"]
+    pdt.assert_frame_equal(
+        part.astype({"File": str, "code": str, "MARKER": str}),
+        expected[expected["File"].isin(["p10", "p11", "p12"])]
+        .astype({"File": str, "code": str, "MARKER": str})
+        .reset_index(drop=True),
+    )
+
+    # an edited deed is re-parsed; a fresh open maps the same arrays
+    edit_marker(narativas / "p11" / "p11_MAPL1x.toml", "810031.568]", "810032.568]")
+    store.update(24047, workers=2)
+    reopened = ps.ParcelStore(narativas).open()
+    df = reopened.to_frame()
+    row = df[(df["File"] == "p11") & (df["idx"] == 1)]
+    assert row["EASTING"].tolist() == [810032.568]
+    assert len(df) == 53
+
+
+def test_loader_reads_the_store(narativas):
+    import RV25j_Cadastre as cad
+
+    config = cad.RV25JConfig.from_toml(narativas / "CONFIG.toml")
+    toml = cad.MarkerLoader(narativas, config, workers=2)
+    mapped = cad.MarkerLoader(narativas, config, workers=2, use_store=True)
+    assert mapped.store_enabled and not toml.store_enabled
+
+    cols = ["File", "idx", "code", "MARKER", "NORTHING", "EASTING", "EPSG"]
+    got = mapped.load_df_id75()[cols].astype({"File": str, "code": str, "MARKER": str})
+    pdt.assert_frame_equal(got, toml.load_df_id75()[cols].astype({"File": str, "code": str, "MARKER": str}),
+                           check_dtype=False)
+    chunks = [df for _, df in mapped.iter_chunks(3)]
+    assert [c["File"].nunique() for c in chunks] == [3, 3, 2]
+
+
+def test_non_integer_idx_keeps_the_deed(narativas, capsys):
+    path = narativas / "p11" / "p11_MAPL1x.toml"
+    edit_marker(path, '[2, "B"', '["2a", "B"')
+    epsg, idx, code, marker, north, east = ps.parse_marker_toml(path, 24047)
+    assert idx[:3] == [1, 2, 3] and marker[1] == "B"
+    assert "[WARN]" in capsys.readouterr().out
+
+    store = ps.ParcelStore(narativas).update(24047, workers=2)
+    assert (store.n_parcels, store.n_markers) == (8, 53)
@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+import RV25j_Center as center
+
+
+@pytest.fixture
+def deeds(tmp_path):
+    paths = []
+    for i in range(3):
+        prefix = tmp_path / f"p{i:02d}"
+        Image.new("RGB", (400, 300), (i * 60, 0, 0)).save(f"{prefix}_rv25j.jpg")
+        Image.new("RGB", (120, 40), "white").save(f"{prefix}_table.jpg")
+        (tmp_path / f"p{i:02d}_MAPL1.toml").write_text(f"# deed {i}\n", encoding="utf-8")
+        paths.append(f"{prefix}_rv25j.jpg")
+    (tmp_path / "p01_MAPL1x.toml").write_text("# side file\n", encoding="utf-8")
+    return paths
+
+
+@pytest.fixture
+def prefetcher(tmp_path):
+    pf = center.DeedPrefetcher(center.ImagePyramid(str(tmp_path)))
+    yield pf
+    pf.close()
+
+
+def request(path, scale=0.5):
+    return {"rv_path": path, "scale": scale, "table_box": (60, 60), "plot_box": (60, 60)}
+
+
+def wait(pf, req, timeout=10.0):
+    t0 = time.monotonic()
+    while (entry := pf.get(req)) is None:
+        assert time.monotonic() - t0 < timeout, "deed not loaded"
+        time.sleep(0.01)
+    return entry
+
+
+def test_miss_is_loaded_by_the_worker(deeds, prefetcher, monkeypatch):
+    threads = []
+    load = prefetcher.load
+    monkeypatch.setattr(prefetcher, "load", lambda req: threads.append(threading.get_ident()) or load(req))
+    req = request(deeds[1])
+    assert prefetcher.get(req) is None and not threads  # no decode on the caller's thread
+    prefetcher.schedule([req])
+    entry = wait(prefetcher, req)
+    assert threads and threading.get_ident() not in threads
+    assert entry["main"].size == (200, 150) and entry["size"] == (400, 300)
+    assert entry["table"].size == (60, 20) and entry["plot"] is None
+    assert entry["toml"] == ("# side file\n", True)
+
+
+def test_changed_file_drops_the_entry(deeds, prefetcher):
+    req = request(deeds[0])
+    prefetcher.schedule([req])
+    wait(prefetcher, req)
+    table = deeds[0].replace("_rv25j.jpg", "_table.jpg")
+    Image.new("RGB", (40, 120), "white").save(table)
+    st = os.stat(table)
+    os.utime(table, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert prefetcher.get(req) is None
+    prefetcher.schedule([req])
+    assert wait(prefetcher, req)["table"].size == (20, 60)
+
+
+def test_lru_is_bounded(deeds, prefetcher, monkeypatch):
+    monkeypatch.setattr(center.DeedPrefetcher, "MAX_BYTES", 2 * 200 * 150 * 3 + 2 * 60 * 20 * 3)
+    reqs = [request(p) for p in deeds]
+    for req in reqs:
+        prefetcher.schedule([req])
+        wait(prefetcher, req)
+    assert prefetcher.get(reqs[0]) is None
+    assert prefetcher.get(reqs[1]) is not None and prefetcher.get(reqs[2]) is not None
+    assert prefetcher._bytes <= center.DeedPrefetcher.MAX_BYTES
+
+
+def test_unreadable_scan_is_reported(tmp_path, prefetcher):
+    bad = tmp_path / "p09_rv25j.jpg"
+    bad.write_bytes(b"not a jpeg")
+    req = request(str(bad), scale=1.0)
+    prefetcher.schedule([req])
+    entry = wait(prefetcher, req)
+    assert entry["main"] is None and entry["error"] is not None
+
+
+def test_close_stops_the_worker(deeds, prefetcher):
+    req = request(deeds[0])
+    prefetcher.schedule([req])
+    wait(prefetcher, req)
+    prefetcher.close()
+    prefetcher._worker.join(timeout=10)
+    assert not prefetcher._worker.is_alive()
+    assert prefetcher.get(req) is None and prefetcher._bytes == 0
+
+
+def test_ui_shows_a_placeholder_then_the_deed(deeds, prefetcher):
+    callbacks, shown, loading = [], [], []
+    ui = SimpleNamespace(
+        prefetcher=prefetcher,
+        _pending_key=None,
+        master=SimpleNamespace(after=lambda ms, fn: callbacks.append(fn)),
+        prefetch_neighbours=lambda: prefetcher.schedule([req]),
+        show_loading=loading.append,
+    )
+    req = request(deeds[2])
+    center.ImageBrowserApp.with_entry(ui, req, shown.append)
+    assert loading == [deeds[2]] and not shown and len(callbacks) == 1
+    wait(prefetcher, req)
+    while callbacks:
+        callbacks.pop()()
+    assert len(shown) == 1 and shown[0]["main"] is not None and ui._pending_key is None
+
+    # cached: shown at once; paging on cancels a pending wait
+    center.ImageBrowserApp.with_entry(ui, req, shown.append)
+    assert len(shown) == 2 and not callbacks
+    other = request(deeds[0], scale=0.25)
+    center.ImageBrowserApp.with_entry(ui, other, shown.append)
+    ui._pending_key = "newer deed"
+    callbacks.pop()()
+    assert len(shown) == 2 and not callbacks
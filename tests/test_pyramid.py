@@ -0,0 +1,82 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import RV25j_Center as center
+
+
+def scan(path, size=(400, 300), seed=0):
+    rng = np.random.default_rng(seed)
+    Image.fromarray(rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)).save(path)
+    return str(path)
+
+
+def open_fds():
+    return len(os.listdir("/proc/self/fd"))
+
+
+def test_levels_are_built_once(tmp_path, monkeypatch):
+    src = scan(tmp_path / "p08_rv25j.jpg")
+    pyramid = center.ImagePyramid(str(tmp_path))
+    img, full = pyramid.get(src, 0.5)
+    assert full == (400, 300) and img.size == (200, 150)
+    h = pyramid._hash(src)
+    assert all(pyramid.level_path(h, s).is_file() for s in pyramid.LEVELS)
+
+    def no_build(*a):
+        raise AssertionError("level rebuilt")
+
+    monkeypatch.setattr(pyramid, "_build", no_build)
+    img, _ = pyramid.get(src, 0.25)
+    assert img.size == (100, 75)
+    # a copy of the scan has the same content hash: same levels
+    copy = tmp_path / "p09_rv25j.jpg"
+    copy.write_bytes(open(src, "rb").read())
+    assert pyramid.get(str(copy), 0.5)[0].size == (200, 150)
+
+
+def test_other_scales_and_no_leaked_handles(tmp_path):
+    src = scan(tmp_path / "p08_rv25j.jpg")
+    pyramid = center.ImagePyramid(str(tmp_path))
+    pyramid.get(src, 0.5)
+    before = open_fds()
+    kept = []  # images handed to the UI stay alive; their files must not
+    for scale in (1.0, 0.5, 0.25, 0.75) * 5:
+        img, full = pyramid.get(src, scale)
+        assert img.size == (int(400 * scale), int(300 * scale)) and full == (400, 300)
+        kept.append(img)
+    assert open_fds() == before
+    assert all(img.getpixel((0, 0)) is not None for img in kept)
+
+
+def test_read_only_folder_resizes_in_memory(tmp_path, monkeypatch):
+    src = scan(tmp_path / "p08_rv25j.jpg")
+    pyramid = center.ImagePyramid(str(tmp_path))
+    (tmp_path / pyramid.DIRNAME).write_text("not a directory")
+    img, _ = pyramid.get(src, 0.5)
+    assert img.size == (200, 150) and not pyramid._writable
+
+
+def test_prefetch_and_close(tmp_path):
+    srcs = [scan(tmp_path / f"p{i:02d}_rv25j.jpg", seed=i) for i in range(4)]
+    pyramid = center.ImagePyramid(str(tmp_path))
+    pyramid.prefetch(srcs)
+    worker = pyramid._worker
+    pyramid.close()
+    worker.join(timeout=10)
+    assert not worker.is_alive() and pyramid._worker is None
+
+    pyramid = center.ImagePyramid(str(tmp_path))
+    pyramid.prefetch(srcs)
+    for src in srcs:
+        h = pyramid._hash(src)
+        for _ in range(200):
+            if all(pyramid.level_path(h, s).is_file() for s in pyramid.LEVELS):
+                break
+            threading.Event().wait(0.05)
+        else:
+            pytest.fail(f"levels of {src} not built")
+    pyramid.close()
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import shapely
+
+import RV25j_Cadastre as cad
+
+
+def test_points_and_boxes(narativas, make_processor):
+    processor = make_processor()
+    df_ID75, df_LL, df_W84 = processor.load_markers()
+    parcels = cad.ParcelBuilder.parcels(df_W84, cad.CRS.from_epsg(32647))
+    inner = shapely.point_on_surface(parcels.geometry.values)
+    pts = pd.DataFrame(
+        {
+            "id": [f"q{i}" for i in range(len(parcels))] + ["far"],
+            "x": np.append(shapely.get_x(inner), 100000.0),
+            "y": np.append(shapely.get_y(inner), 100000.0),
+        }
+    )
+    pts.to_csv(narativas / "pts.csv", index=False)
+    out = narativas / "hits.csv"
+    hits = processor.query(narativas / "pts.csv", "points", 32647, out)
+
+    # brute force in LON/LAT
+    ll = cad.ParcelBuilder.parcels(df_LL, processor.crs_factory.crs_wgs84, x="LON", y="LAT")
+    lon, lat = processor.crs_factory.get_transformer_to_wgs84(32647).transform(pts["x"], pts["y"])
+    expected = {
+        (qid, f)
+        for qid, p in zip(pts["id"], shapely.points(lon, lat))
+        for f, g in zip(ll["File"], ll.geometry.values)
+        if shapely.intersects(g, p)
+    }
+    assert set(zip(hits["id"], hits["File"])) - {("far", "")} == expected
+    assert {(f"q{i}", f) for i, f in enumerate(parcels["File"])} <= expected
+    assert hits.loc[hits["id"] == "far", "File"].tolist() == [""]
+    written = pd.read_csv(out, dtype=str, keep_default_na=False)
+    assert written.values.tolist() == hits.values.tolist()
+
+    # boxes in the source CRS: each parcel's own bounds finds it
+    src = cad.ParcelBuilder.parcels(df_ID75, processor.crs_factory.get_src_crs(24047))
+    b = shapely.bounds(src.geometry.values)
+    boxes = pd.DataFrame({"id": src["File"].astype(str), "minx": b[:, 0], "miny": b[:, 1],
+                          "maxx": b[:, 2], "maxy": b[:, 3]})
+    boxes.to_csv(narativas / "boxes.csv", index=False)
+    hits = processor.query(narativas / "boxes.csv", "boxes", 24047, None)
+    assert set(zip(boxes["id"], boxes["id"])) <= set(zip(hits["id"], hits["File"]))
@@ -0,0 +1,66 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import shapely
+from PIL import Image
+
+import RV25j_Cadastre as cad
+
+
+def test_qa_status_keeps_the_worst_issue():
+    qa = pd.DataFrame(
+        {
+            "type": ["gap", "overlap", "gap", "invalid"],
+            "File_a": ["p08", "p09", "p10", "p11"],
+            "File_b": ["p09", "p10", "p11", "p11"],
+        }
+    )
+    status = cad.CadastreRenderer.qa_status(qa, ["p08", "p09", "p10", "p11", "p12"])
+    assert status.tolist() == ["gap", "overlap", "overlap", "invalid", "ok"]
+
+
+def test_pil_fills_parcels_by_source(narativas, make_processor):
+    for f in ("p08", "p09"):
+        (narativas / f / f"{f}_MAPL1x.toml").unlink()
+    out = narativas / "overview.png"
+    renderer = cad.CadastreRenderer(size=800, engine="pil", markers=False)
+    assert make_processor().render(out, renderer) == [out]
+
+    # p08 / p09 now only have a MAPL1 file
+    colors = {k: cad.CadastreRenderer._hex_rgb(c) for k, c in renderer.COLORS["source"].items()}
+    _, df_LL_W84, _ = make_processor().load_markers()
+    epsg = cad.CRSFactory.w84_utm_epsg(int(df_LL_W84["EPSG"].mode()[0]))
+    x, y = cad.Transformer.from_crs(4326, epsg, always_xy=True).transform(df_LL_W84["LON"], df_LL_W84["LAT"])
+    gdf = cad.ParcelBuilder.parcels(
+        cad.CoordinateTransformer._with_columns(df_LL_W84, X=x, Y=y), cad.CRS.from_epsg(epsg), x="X", y="Y"
+    )
+    minx, miny, maxx, maxy = shapely.total_bounds(gdf.geometry.values)
+    pad = 0.02 * max(maxx - minx, maxy - miny)
+    scale = 799 / (max(maxx - minx, maxy - miny) + 2 * pad)
+    with Image.open(out) as im:
+        arr = np.asarray(im.convert("RGB"))
+    checked = set()
+    for f, geom in zip(gdf["File"], gdf.geometry):
+        if geom.area < 500:
+            continue
+        checked.add(f)
+        p = geom.buffer(-5).point_on_surface()
+        px = arr[int(round((maxy + pad - p.y) * scale)), int(round((p.x - minx + pad) * scale))]
+        assert tuple(px) == colors["MAPL1" if f in ("p08", "p09") else "MAPL1x"], f
+
+
+def test_grid_tiles_and_qa_colours(narativas, make_processor):
+    out = narativas / "tiles.png"
+    renderer = cad.CadastreRenderer(size=400, color="qa", engine="mpl", labels=True, grid=(2, 2))
+    paths = make_processor().render(out, renderer)
+    assert paths and all(p.is_file() and p.name.startswith("tiles_r") for p in paths)
+    assert not out.exists()
+    with Image.open(paths[0]) as im:
+        assert im.format == "PNG" and max(im.size) >= 400
+
+
+def test_cli_default_output(narativas, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["RV25j_Cadastre.py", "render", str(narativas), "--size", "300"])
+    cad.main()
+    assert (narativas / "Cadastre_All.png").is_file()
@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+
+import RV25j_Cadastre as cad
+import RV25j_SafeIO as safe
+
+
+def test_atomic_write_replaces(tmp_path):
+    path = tmp_path / "p01_MAPL1.toml"
+    path.write_text("old", encoding="utf-8")
+    safe.atomic_write_text(path, "new")
+    assert path.read_text(encoding="utf-8") == "new"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["p01_MAPL1.toml"]
+
+
+def test_atomic_path_keeps_old_file_on_error(tmp_path):
+    path = tmp_path / "p01_plot.png"
+    path.write_bytes(b"old")
+    with pytest.raises(RuntimeError):
+        with safe.atomic_path(path) as tmp:
+            assert tmp.suffix == ".png" and not tmp.exists()
+            tmp.write_bytes(b"half")
+            raise RuntimeError("writer died")
+    assert path.read_bytes() == b"old"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["p01_plot.png"]
+
+
+def test_lock_files_live_in_lock_dir(tmp_path):
+    with safe.prefix_lock(tmp_path, "p01") as lock_path:
+        assert lock_path == tmp_path / safe.LOCK_DIRNAME / "p01.lock"
+    assert [p.name for p in tmp_path.iterdir()] == [safe.LOCK_DIRNAME]
+
+
+def test_exclusive_and_shared(tmp_path):
+    target = tmp_path / "cadastre_W84UTM.gpkg"
+    with safe.file_lock(target):
+        with pytest.raises(safe.LockTimeout):
+            with safe.file_lock(target, timeout=0.2):
+                pass
+    with safe.file_lock(target, shared=True):
+        with safe.file_lock(target, shared=True, timeout=0.2):
+            with pytest.raises(safe.LockTimeout):
+                with safe.file_lock(target, timeout=0.2):
+                    pass
+
+
+def test_lock_serialises_writers(tmp_path):
+    counter = tmp_path / "n.txt"
+    counter.write_text("0", encoding="utf-8")
+
+    def bump():
+        for _ in range(20):
+            with safe.file_lock(counter):
+                n = int(counter.read_text(encoding="utf-8"))
+                safe.atomic_write_text(counter, str(n + 1))
+
+    threads = [threading.Thread(target=bump) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert counter.read_text(encoding="utf-8") == "80"
+
+
+def test_bulk_gpkg_update_is_all_or_nothing(narativas, make_processor, monkeypatch):
+    make_processor().run_incremental()
+    src, w84 = cad.GPKGWriter(narativas, None, bulk=True).gpkg_paths("cadastre")
+    before = src.read_bytes()
+
+    def boom(*args, **kw):
+        raise RuntimeError("crash after the delete")
+
+    monkeypatch.setattr(cad.ParcelBuilder, "parcels", boom)
+    df_ID75 = make_processor().make_loader().load_df_id75()
+    p11 = df_ID75[df_ID75["File"] == "p11"]
+    with pytest.raises(RuntimeError):
+        cad.GPKGWriter(narativas, None, bulk=True).update_gpkg_bulk(p11, src, ["p11"])
+    assert src.read_bytes() == before
+    assert not [p for p in narativas.iterdir() if p.name.startswith(".cadastre_I75UTM")]
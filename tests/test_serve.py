@@ -0,0 +1,81 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+import shapely
+
+import RV25j_Cadastre as cad
+
+
+@pytest.fixture
+def server(make_processor):
+    processor = make_processor()
+    _, df_LL, _ = processor.load_markers()
+    index = cad.ParcelIndex.from_markers(df_LL, processor.crs_factory)
+    fs = cad.FeatureServer(index, df_LL, processor.crs_factory)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), fs.make_handler())
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}", index
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def get(url):
+    try:
+        with urllib.request.urlopen(url, timeout=10) as r:
+            return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_collections(server):
+    base, _ = server
+    status, body = get(f"{base}/collections")
+    assert status == 200
+    assert {c["id"]: c["itemCount"] for c in body["collections"]} == {"parcels": 8, "markers": 53}
+
+
+def test_bbox_items(server):
+    base, index = server
+    geom = index.gdf[index.gdf["File"] == "p10"].geometry.iloc[0]
+    minx, miny, maxx, maxy = shapely.point_on_surface(geom).buffer(1e-7).bounds
+    status, body = get(f"{base}/collections/parcels/items?bbox={minx},{miny},{maxx},{maxy}")
+    assert status == 200 and body["type"] == "FeatureCollection"
+    assert [f["properties"]["File"] for f in body["features"]] == ["p10"]
+
+    status, body = get(f"{base}/collections/markers/items?File=p15&crs=32647")
+    assert body["numberMatched"] == 5 and body["crs"]["properties"]["name"] == "EPSG:32647"
+    assert all(f["geometry"]["coordinates"][0] > 1000 for f in body["features"])
+
+
+def test_paging(server):
+    base, _ = server
+    url = f"{base}/collections/markers/items?limit=20"
+    seen = []
+    while url:
+        status, body = get(url)
+        assert status == 200 and body["numberMatched"] == 53
+        seen += [f["id"] for f in body["features"]]
+        url = next((l["href"] for l in body["links"] if l["rel"] == "next"), None)
+    assert seen == list(range(53))
+
+
+@pytest.mark.parametrize(
+    "query", ["limit=0", "offset=-1", "limit=x", "bbox=1,2,3", "colour=red", "crs=EPSG:abc"]
+)
+def test_bad_requests(server, query):
+    base, _ = server
+    status, body = get(f"{base}/collections/parcels/items?{query}")
+    assert status == 400 and body["error"]
+
+
+def test_unknown_paths(server):
+    base, _ = server
+    assert get(f"{base}/collections/roads/items")[0] == 404
+    assert get(f"{base}/nope")[0] == 404
@@ -0,0 +1,73 @@
+import sqlite3
+
+import pyogrio
+import pytest
+from pyproj import CRS
+
+import RV25j_Cadastre as cad
+
+
+def rows(path, kind):
+    con = sqlite3.connect(path)
+    try:
+        return con.execute(f'SELECT File, COUNT(*) FROM "{kind}" GROUP BY File').fetchall()
+    finally:
+        con.close()
+
+
+def test_upsert_spatialite(tmp_path, make_processor):
+    df_ID75, _, df_W84 = make_processor().load_markers()
+    crs = CRS.from_epsg(32647)
+    db = cad.SpatialDBWriter(str(tmp_path / "cadastre.sqlite"), batch_parcels=3)
+    assert not db.exists()
+
+    db.upsert(df_W84, crs)  # no tables yet → full load
+    assert db.exists()
+    assert dict(rows(db.target, "marker")) == df_W84["File"].astype(str).value_counts().to_dict()
+    assert len(rows(db.target, "parcel")) == 8
+
+    p11 = df_W84[df_W84["File"] == "p11"].copy()
+    p11["EASTING"] += 10.0
+    db.upsert(p11, crs, delete_files=["p15"])
+    markers = dict(rows(db.target, "marker"))
+    assert "p15" not in markers and markers["p11"] == 5 and sum(markers.values()) == 48
+    assert sorted(f for f, _ in rows(db.target, "parcel")) == [
+        "p08", "p09", "p10", "p11", "p12", "p13", "p14"
+    ]
+
+    got = pyogrio.read_dataframe(db.target, layer="marker", where="File = 'p11'")
+    assert sorted(got["EASTING"]) == sorted(p11["EASTING"])
+    # the R-tree follows the delete + append: a bbox query finds the moved markers
+    x, y = p11["EASTING"].iloc[0], p11["NORTHING"].iloc[0]
+    hit = pyogrio.read_dataframe(db.target, layer="marker", bbox=(x - 0.1, y - 0.1, x + 0.1, y + 0.1))
+    assert hit["File"].tolist() == ["p11"]
+
+
+def test_failed_upsert_leaves_the_database(tmp_path, make_processor, monkeypatch):
+    df_ID75, _, df_W84 = make_processor().load_markers()
+    crs = CRS.from_epsg(32647)
+    db = cad.SpatialDBWriter(str(tmp_path / "cadastre.sqlite"), batch_parcels=3)
+    db.write(df_W84, crs)
+    before = (tmp_path / "cadastre.sqlite").read_bytes()
+
+    def fail(self, path, kind, df, crs, append):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(cad.SpatialDBWriter, "_spatialite_layer", fail)
+    with pytest.raises(RuntimeError):
+        db.upsert(df_W84[df_W84["File"] == "p11"], crs, delete_files=["p15"])
+    assert (tmp_path / "cadastre.sqlite").read_bytes() == before
+    assert not any(p.name.startswith(".cadastre") for p in tmp_path.iterdir())  # no temp left
+
+
+def test_gdal_config_is_restored(tmp_path, make_processor):
+    df_ID75, _, df_W84 = make_processor().load_markers()
+    pyogrio.set_gdal_config_options({"OGR_SQLITE_CACHE": 64})
+    try:
+        db = cad.SpatialDBWriter(str(tmp_path / "cadastre.sqlite"))
+        db.write(df_W84, CRS.from_epsg(32647))
+        db.upsert(df_W84[df_W84["File"] == "p11"], CRS.from_epsg(32647))
+        assert pyogrio.get_gdal_config_option("OGR_SQLITE_CACHE") == 64
+        assert pyogrio.get_gdal_config_option("OGR_SQLITE_SYNCHRONOUS") is None
+    finally:
+        pyogrio.set_gdal_config_options({"OGR_SQLITE_CACHE": None})
@@ -0,0 +1,195 @@
+import gzip
+import struct
+
+import numpy as np
+import pytest
+
+import RV25j_Cadastre as cad
+
+
+# ---- minimal protobuf / MVT / PMTiles readers ----
+def varint(buf, i):
+    v = shift = 0
+    while True:
+        b = buf[i]
+        v |= (b & 0x7F) << shift
+        i += 1
+        if b < 0x80:
+            return v, i
+        shift += 7
+
+
+def fields(buf):
+    """(field number, value) pairs: int for varint, bytes otherwise."""
+    i = 0
+    while i < len(buf):
+        key, i = varint(buf, i)
+        num, wire = key >> 3, key & 7
+        if wire == 0:
+            v, i = varint(buf, i)
+        elif wire == 1:
+            v, i = buf[i : i + 8], i + 8
+        elif wire == 2:
+            n, i = varint(buf, i)
+            v, i = buf[i : i + n], i + n
+        else:
+            raise ValueError(f"wire type {wire}")
+        yield num, v
+
+
+def packed(buf):
+    out, i = [], 0
+    while i < len(buf):
+        v, i = varint(buf, i)
+        out.append(v)
+    return out
+
+
+def unzigzag(v):
+    return (v >> 1) ^ -(v & 1)
+
+
+def value(buf):
+    ((num, v),) = fields(buf)
+    return {1: lambda: v.decode(), 3: lambda: struct.unpack("<d", v)[0], 5: lambda: v,
+            6: lambda: unzigzag(v), 7: lambda: bool(v)}[num]()
+
+
+def decode_tile(data):
+    """{layer name: {"extent", "features": [(type, commands, props)]}}"""
+    layers = {}
+    for num, raw in fields(data):
+        assert num == 3
+        name, keys, values, feats, extent = None, [], [], [], None
+        for n, v in fields(raw):
+            if n == 1:
+                name = v.decode()
+            elif n == 2:
+                feats.append(dict((k, w) for k, w in fields(v)))
+            elif n == 3:
+                keys.append(v.decode())
+            elif n == 4:
+                values.append(value(v))
+            elif n == 5:
+                extent = v
+        decoded = []
+        for f in feats:
+            tags = packed(f.get(2, b""))
+            props = {keys[k]: values[v] for k, v in zip(tags[::2], tags[1::2])}
+            decoded.append((f[3], packed(f[4]), props))
+        layers[name] = {"extent": extent, "features": decoded}
+    return layers
+
+
+def geometry(cmds):
+    """Command stream → list of parts [(x, y), ...] in absolute tile pixels."""
+    parts, x, y, i = [], 0, 0, 0
+    while i < len(cmds):
+        cmd, count = cmds[i] & 7, cmds[i] >> 3
+        i += 1
+        if cmd == 7:
+            continue
+        if cmd == 1:
+            parts.append([])
+        for _ in range(count):
+            x += unzigzag(cmds[i])
+            y += unzigzag(cmds[i + 1])
+            i += 2
+            parts[-1].append((x, y))
+    return parts
+
+
+def read_pmtiles(path):
+    data = path.read_bytes()
+    h = struct.unpack_from("<7sBQQQQQQQQQQQBBBBBBiiiiBii", data)
+    assert h[:2] == (b"PMTiles", 3)
+    root_off, root_len, meta_off, meta_len, leaf_off, leaf_len, data_off = h[2:9]
+
+    def directory(raw):
+        buf = gzip.decompress(raw)
+        n, i = varint(buf, 0)
+        cols = []
+        for _ in range(4):
+            col = []
+            for _ in range(n):
+                v, i = varint(buf, i)
+                col.append(v)
+            cols.append(col)
+        ids, runs, lengths, offsets = cols
+        out, tid, prev = [], 0, None
+        for d, run, length, off in zip(ids, runs, lengths, offsets):
+            tid += d
+            off = prev[1] + prev[2] if off == 0 and prev else off - 1
+            prev = (tid, off, length, run)
+            out.append(prev)
+        return out
+
+    tiles = {}
+    for tid, off, length, run in directory(data[root_off : root_off + root_len]):
+        if run == 0:  # leaf directory
+            leaf = data[leaf_off + off : leaf_off + off + length]
+            entries = directory(leaf)
+        else:
+            entries = [(tid, off, length, run)]
+        for t, o, n, _ in entries:
+            tiles[t] = gzip.decompress(data[data_off + o : data_off + o + n])
+    meta = gzip.decompress(data[meta_off : meta_off + meta_len])
+    return h, tiles, meta
+
+
+# ---- tests ----
+def test_mvt_encoder_round_trip():
+    pts = cad.MVTEncoder.point_geometries(np.array([10, 4000]), np.array([20, 5]))
+    ring = np.array([[0, 0], [100, 0], [100, 100], [0, 100], [500, 500], [600, 500], [600, 600]])
+    polys = cad.MVTEncoder.polygon_geometries(ring, np.array([0, 0, 0, 0, 1, 1, 1]), np.array([0, 1]))
+    layer = cad.MVTEncoder.layer(
+        "test",
+        [
+            (cad.MVTEncoder.POINT, pts[0], {"File": "p08", "idx": 1}),
+            (cad.MVTEncoder.POINT, pts[1], {"File": "p09", "idx": -2, "ok": True}),
+            (cad.MVTEncoder.POLYGON, polys[0], {"File": "p08", "area": 1.5}),
+            (cad.MVTEncoder.POLYGON, polys[1], {"File": "p10"}),
+        ],
+    )
+    (name, tile), = decode_tile(layer).items()
+    assert name == "test" and tile["extent"] == cad.MVTEncoder.EXTENT
+    (t0, g0, p0), (t1, g1, p1), (t2, g2, p2), (t3, g3, p3) = tile["features"]
+    assert (t0, geometry(g0), p0) == (1, [[(10, 20)]], {"File": "p08", "idx": 1})
+    assert (t1, geometry(g1), p1) == (1, [[(4000, 5)]], {"File": "p09", "idx": -2, "ok": True})
+    assert (t2, p2) == (3, {"File": "p08", "area": 1.5})
+    assert geometry(g2) == [[tuple(v) for v in ring[:4]]]
+    assert (t3, geometry(g3), p3) == (3, [[tuple(v) for v in ring[4:]]], {"File": "p10"})
+
+
+@pytest.mark.parametrize("z,x,y,tid", [(0, 0, 0, 0), (1, 0, 0, 1), (1, 0, 1, 2), (1, 1, 1, 3), (1, 1, 0, 4)])
+def test_pmtiles_tile_id(z, x, y, tid):
+    assert cad._PMTilesSink.tile_id(z, x, y) == tid
+
+
+@pytest.mark.parametrize("root_max", [None, 64])  # 64: entries go to a leaf directory
+def test_pmtiles_round_trip(tmp_path, make_processor, monkeypatch, root_max):
+    if root_max:
+        monkeypatch.setattr(cad._PMTilesSink, "ROOT_MAX", root_max)
+    out = tmp_path / "cadastre.pmtiles"
+    make_processor().tiles(out, cad.VectorTiler(minzoom=12, maxzoom=16, marker_minzoom=16, workers=1))
+    h, tiles, meta = read_pmtiles(out)
+
+    n_entries, clustered, tile_type, minzoom, maxzoom = h[11], h[13], h[16], h[17], h[18]
+    assert len(tiles) == n_entries and (clustered, tile_type, minzoom, maxzoom) == (1, 1, 12, 16)
+    assert not out.with_name(out.name + ".tiles").exists()  # spool removed
+    assert b'"vector_layers"' in meta
+    assert (h[7] > 0) == bool(root_max)  # leaf directories length
+
+    by_zoom = {}
+    for tid, data in tiles.items():
+        z = next(z for z in range(32) if tid < ((1 << (2 * (z + 1))) - 1) // 3)  # tiles in 0..z
+        by_zoom.setdefault(z, []).append(decode_tile(data))
+    assert sorted(by_zoom) == list(range(12, 17))
+
+    files = {f"p{i:02d}" for i in range(8, 16)}
+    for z, decoded in by_zoom.items():
+        seen = {props["File"] for t in decoded for _, _, props in t["parcel"]["features"]}
+        assert seen == files, z
+        assert ("marker" in decoded[0]) == (z >= 16)
+    markers = {(p["File"], p["idx"]) for t in by_zoom[16] for _, _, p in t["marker"]["features"]}
+    assert len(markers) == 53
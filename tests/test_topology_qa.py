@@ -0,0 +1,56 @@
+import pandas as pd
+import pyogrio
+
+import RV25j_Cadastre as cad
+
+
+def parcels(*rings):
+    rows = [
+        (f"p{i}", k + 1, x, y)
+        for i, ring in enumerate(rings)
+        for k, (x, y) in enumerate(ring)
+    ]
+    df = pd.DataFrame(rows, columns=["File", "idx", "EASTING", "NORTHING"])
+    return df.assign(EPSG=32647, code="s", MARKER="A")
+
+
+def box(x0, y0, x1, y1):
+    return [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+
+
+def test_overlap_gap_invalid():
+    df = parcels(
+        box(0, 0, 10, 10),
+        box(9, 0, 19, 10),        # 1 m overlap strip with p0 → 10 m²
+        box(0, 10.2, 10, 20),     # 0.2 m sliver above p0 → 2 m²
+        [(30, 0), (40, 10), (40, 0), (30, 10)],  # bow-tie
+        box(100, 100, 110, 110),  # alone
+    )
+    qa = cad.TopologyQA(min_area=1.0, gap_width=0.5).check(df)
+    found = {(t, a, b): round(area, 6) for t, a, b, area in qa[["type", "File_a", "File_b", "area"]].values}
+    assert found.pop(("overlap", "p0", "p1")) == 10.0
+    assert found.pop(("gap", "p0", "p2")) == 2.0
+    assert ("invalid", "p3", "") in found
+    assert not [k for k in found if k[0] != "invalid"]
+    assert qa["area"].is_monotonic_decreasing
+
+
+def test_thresholds():
+    df = parcels(box(0, 0, 10, 10), box(9.95, 0, 20, 10), box(0, 10.8, 10, 20))
+    qa = cad.TopologyQA(min_area=1.0, gap_width=0.5).check(df)
+    assert qa.empty  # 0.5 m² overlap, 0.8 m gap: both below the limits
+    qa = cad.TopologyQA(min_area=0.1, gap_width=1.0).check(df)
+    assert sorted(qa["type"]) == ["gap", "overlap"]
+
+
+def test_run_writes_and_clears_reports(tmp_path):
+    bad = parcels(box(0, 0, 10, 10), box(9, 0, 19, 10))
+    cad.TopologyQA().run(bad, tmp_path, "cadastre")
+    layer = pyogrio.read_dataframe(tmp_path / "cadastre_QA.gpkg", layer="topology_qa")
+    assert layer["type"].tolist() == ["overlap"] and layer.crs.to_epsg() == 32647
+
+    good = parcels(box(0, 0, 10, 10), box(10, 0, 20, 10))
+    cad.TopologyQA().run(good, tmp_path, "cadastre")
+    assert not (tmp_path / "cadastre_QA.gpkg").exists()
+    csv = pd.read_csv(tmp_path / "cadastre_topology_qa.csv")
+    assert csv.empty and list(csv.columns) == cad.TopologyQA.COLUMNS
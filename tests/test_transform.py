@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from pyproj import CRS, Transformer
+
+import RV25j_Cadastre as cad
+
+TOWGS84 = [204.5, 837.9, 294.8]
+
+
+def markers():
+    """Narativas-like markers in three source CRSs, interleaved."""
+    return pd.DataFrame(
+        {
+            "File": ["p1", "p2", "p3", "p1", "p2", "p3"],
+            "idx": [1, 1, 1, 2, 2, 2],
+            "NORTHING": [711644.466, 711624.835, 711526.602, 711581.476, 711701.027, 711650.0],
+            "EASTING": [810031.568, 810051.076, 810148.263, 810204.956, 810081.178, 810100.0],
+            "EPSG": np.array([24047, 24048, 32647, 24047, 24048, 32647], dtype="int32"),
+        },
+        index=[10, 11, 12, 13, 14, 15],
+    )
+
+
+def reference(df):
+    """Point by point, straight from pyproj."""
+    lon, lat, x, y = [], [], [], []
+    for e, n, epsg in zip(df["EASTING"], df["NORTHING"], df["EPSG"]):
+        if epsg in (24047, 24048):
+            src = CRS.from_proj4(
+                f"+proj=utm +zone={epsg - 24000} +a=6377276.345 +rf=300.8017 "
+                f"+towgs84={','.join(map(str, TOWGS84))} +units=m +no_defs"
+            )
+        else:
+            src = CRS.from_epsg(int(epsg))
+        o, a = Transformer.from_crs(src, 4326, always_xy=True).transform(e, n)
+        dst = 32600 + (47 if epsg in (24047, 32647) else 48)
+        u, v = Transformer.from_crs(src, dst, always_xy=True).transform(e, n)
+        lon.append(o), lat.append(a), x.append(u), y.append(v)
+    return np.array(lon), np.array(lat), np.array(x), np.array(y)
+
+
+def test_fused_pass_matches_per_point():
+    df = markers()
+    before = df.copy()
+    tr = cad.CoordinateTransformer(cad.CRSFactory(TOWGS84, persist=False))
+    df_LL, df_W84 = tr.to_wgs84_and_w84_utm(df)
+
+    lon, lat, x, y = reference(df)
+    assert np.allclose(df_LL["LON"], lon, atol=1e-9) and np.allclose(df_LL["LAT"], lat, atol=1e-9)
+    assert np.allclose(df_W84["EASTING"], x, atol=1e-3) and np.allclose(df_W84["NORTHING"], y, atol=1e-3)
+    assert df_W84["EPSG"].tolist() == [32647, 32648, 32647, 32647, 32648, 32647]
+    assert df_LL.index.equals(df.index) and df_W84.index.equals(df.index)
+    pd.testing.assert_frame_equal(df, before)  # input untouched
+
+
+def test_fused_equals_separate_passes():
+    df = markers()
+    tr = cad.CoordinateTransformer(cad.CRSFactory(TOWGS84, persist=False))
+    df_LL, df_W84 = tr.to_wgs84_and_w84_utm(df)
+    pd.testing.assert_frame_equal(df_LL, tr.to_wgs84(df))
+    sep = tr.to_w84_utm(df)
+    assert np.allclose(df_W84["EASTING"], sep["EASTING"], atol=1e-6)
+    assert np.allclose(df_W84["NORTHING"], sep["NORTHING"], atol=1e-6)
+    assert (df_W84["EPSG"] == sep["EPSG"]).all()